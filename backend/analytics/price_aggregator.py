@@ -0,0 +1,417 @@
+"""
+Single-pass streaming aggregator for price analytics
+Consumes each product once and can be fed per platform as results arrive
+"""
+from typing import List, Dict, Optional
+import bisect
+import math
+
+from utils.product import Product
+
+
+class QuantileSketch:
+    """
+    Mergeable quantile sketch
+
+    Keeps exact sorted values up to `exact_limit` (so small result sets get the
+    exact median), then switches to log-spaced buckets with bounded relative error.
+    """
+
+    def __init__(self, exact_limit: int = 1024, relative_accuracy: float = 0.01):
+        self.exact_limit = exact_limit
+        self.gamma = (1 + relative_accuracy) / (1 - relative_accuracy)
+        self.log_gamma = math.log(self.gamma)
+        self.values = []  # exact mode
+        self.buckets = None  # sketch mode: bucket index -> count
+        self.count = 0
+
+    def add(self, value: float, weight: int = 1):
+        self.count += weight
+        if self.buckets is None:
+            for _ in range(weight):
+                bisect.insort(self.values, value)
+            if len(self.values) > self.exact_limit:
+                self._compress()
+        else:
+            index = self._bucket(value)
+            self.buckets[index] = self.buckets.get(index, 0) + weight
+
+    def add_many(self, values: List[float]):
+        """Add a batch of values"""
+        if self.buckets is None and len(self.values) + len(values) <= self.exact_limit:
+            self.values = sorted(self.values + list(values))
+            self.count += len(values)
+            return
+
+        for value in values:
+            self.add(value)
+
+    def _bucket(self, value: float) -> int:
+        return math.ceil(math.log(max(value, 1e-9)) / self.log_gamma)
+
+    def _compress(self):
+        """Switch from exact values to buckets"""
+        self.buckets = {}
+        for value in self.values:
+            index = self._bucket(value)
+            self.buckets[index] = self.buckets.get(index, 0) + 1
+        self.values = []
+
+    def merge(self, other: 'QuantileSketch'):
+        """Fold another sketch into this one"""
+        if other.buckets is None:
+            for value in other.values:
+                self.add(value)
+            return
+
+        if self.buckets is None:
+            self._compress()
+        for index, weight in other.buckets.items():
+            self.buckets[index] = self.buckets.get(index, 0) + weight
+        self.count += other.count
+
+    def quantile(self, q: float) -> Optional[float]:
+        """Approximate q-quantile (exact while under the exact limit)"""
+        if not self.count:
+            return None
+
+        if self.buckets is None:
+            position = q * (len(self.values) - 1)
+            lower = math.floor(position)
+            upper = math.ceil(position)
+            return self.values[lower] + (self.values[upper] - self.values[lower]) * (position - lower)
+
+        rank = q * (self.count - 1)
+        seen = 0
+        for index in sorted(self.buckets):
+            seen += self.buckets[index]
+            if seen > rank:
+                return 2 * self.gamma ** index / (self.gamma + 1)
+        return 2 * self.gamma ** max(self.buckets) / (self.gamma + 1)
+
+    def median(self) -> Optional[float]:
+        return self.quantile(0.5)
+
+
+_SPLITTER = 134217729.0  # 2**27 + 1
+
+
+def _split(value: float):
+    """Veltkamp split into two halves whose products are exact"""
+    scaled = _SPLITTER * value
+    high = scaled - (scaled - value)
+    return high, value - high
+
+
+def _two_product(a: float, b: float):
+    """a * b as the rounded product plus its exact rounding error (Dekker)"""
+    product = a * b
+    a_high, a_low = _split(a)
+    b_high, b_low = _split(b)
+    error = ((a_high * b_high - product) + a_high * b_low + a_low * b_high) + a_low * b_low
+    return product, error
+
+
+class RunningStats:
+    """Online count/mean/variance/min/max (Welford), mergeable (Chan et al.)"""
+
+    def __init__(self):
+        self.count = 0
+        self.sum = 0.0
+        self.compensation = 0.0  # Neumaier error term, keeps the sum exact to the last bit
+        self.mean = 0.0
+        self.m2 = 0.0
+        self.min = None
+        self.max = None
+
+    def add(self, value: float):
+        self.count += 1
+        self._add_to_sum(value)
+        delta = value - self.mean
+        self.mean += delta / self.count
+        self.m2 += delta * (value - self.mean)
+        self.min = value if self.min is None else min(self.min, value)
+        self.max = value if self.max is None else max(self.max, value)
+
+    def merge(self, other: 'RunningStats'):
+        if not other.count:
+            return
+        if not self.count:
+            self.count, self.sum, self.compensation = other.count, other.sum, other.compensation
+            self.mean, self.m2 = other.mean, other.m2
+            self.min, self.max = other.min, other.max
+            return
+
+        total = self.count + other.count
+        delta = other.mean - self.mean
+        self.mean += delta * other.count / total
+        self.m2 += other.m2 + delta * delta * self.count * other.count / total
+        self.count = total
+        self._add_to_sum(other.sum)
+        self._add_to_sum(other.compensation)
+        self.min = min(self.min, other.min)
+        self.max = max(self.max, other.max)
+
+    def _add_to_sum(self, value: float):
+        total = self.sum + value
+        if abs(self.sum) >= abs(value):
+            self.compensation += (self.sum - total) + value
+        else:
+            self.compensation += (value - total) + self.sum
+        self.sum = total
+
+    @property
+    def average(self) -> float:
+        """
+        Mean from the compensated sum (Welford's mean drifts in the last digit)
+        The quotient is corrected by its exact remainder, so it rounds like statistics.mean
+        and "4.025" formats the same way it did before
+        """
+        if not self.count:
+            return 0.0
+        quotient = self.sum / self.count
+        product, error = _two_product(quotient, float(self.count))
+        remainder = (self.sum - product) - error + self.compensation
+        return quotient + remainder / self.count
+
+    @property
+    def stdev(self) -> float:
+        """Sample standard deviation (0 for fewer than two values)"""
+        return math.sqrt(self.m2 / (self.count - 1)) if self.count > 1 else 0
+
+
+class PlatformAccumulator:
+    """Per-platform running state"""
+
+    def __init__(self):
+        self.count = 0
+        self.prices = RunningStats()
+        self.cheapest = None
+
+    def add(self, product: Product):
+        self.count += 1
+        price = product.price
+        if price:
+            self.prices.add(price)
+            if self.cheapest is None or price < self.cheapest.price:
+                self.cheapest = product
+
+    def merge(self, other: 'PlatformAccumulator'):
+        self.count += other.count
+        self.prices.merge(other.prices)
+        if other.cheapest and (self.cheapest is None or other.cheapest.price < self.cheapest.price):
+            self.cheapest = other.cheapest
+
+
+class PriceAggregator:
+    """One-pass, mergeable replacement for the multi-scan analytics"""
+
+    def __init__(self):
+        self.total = 0
+        self.prices = RunningStats()
+        self.sketch = QuantileSketch()
+        self.best_deal = None
+        self.worst_deal = None
+        self.platforms = {}  # platform -> PlatformAccumulator (first-seen order)
+        self.discounts = RunningStats()
+        self.ratings = RunningStats()
+
+    def add(self, product: Product):
+        """Consume a single product"""
+        self.total += 1
+        price = product.price
+
+        if price:
+            self.prices.add(price)
+            self.sketch.add(price)
+            # Strict comparisons keep the first product on ties
+            if self.best_deal is None or price < self.best_deal.price:
+                self.best_deal = product
+            if self.worst_deal is None or price > self.worst_deal.price:
+                self.worst_deal = product
+
+        platform = product.platform
+        if platform not in self.platforms:
+            self.platforms[platform] = PlatformAccumulator()
+        self.platforms[platform].add(product)
+
+        if product.discount:
+            self.discounts.add(product.discount)
+
+        if product.rating is not None:
+            self.ratings.add(product.rating)
+
+    def add_many(self, products: List[Product]):
+        """Consume a batch (e.g. one platform's results)"""
+        for product in products:
+            self.add(product)
+
+    def merge(self, other: 'PriceAggregator'):
+        """Fold another aggregator's state into this one (other counts as later)"""
+        self.total += other.total
+        self.prices.merge(other.prices)
+        self.sketch.merge(other.sketch)
+
+        if other.best_deal and (self.best_deal is None or other.best_deal.price < self.best_deal.price):
+            self.best_deal = other.best_deal
+        if other.worst_deal and (self.worst_deal is None or other.worst_deal.price > self.worst_deal.price):
+            self.worst_deal = other.worst_deal
+
+        for platform, accumulator in other.platforms.items():
+            if platform not in self.platforms:
+                self.platforms[platform] = PlatformAccumulator()
+            self.platforms[platform].merge(accumulator)
+
+        self.discounts.merge(other.discounts)
+        self.ratings.merge(other.ratings)
+
+    def summary(self) -> Dict:
+        """Analytics report (same shape as PriceAnalytics.analyze_products)"""
+        if not self.prices.count:
+            return {}
+
+        min_price = self.prices.min
+        max_price = self.prices.max
+        avg_price = self.prices.average
+        median_price = self.sketch.median()
+
+        # Price spread
+        price_spread = max_price - min_price
+        price_spread_percent = (price_spread / min_price * 100) if min_price > 0 else 0
+
+        # Standard deviation (price volatility)
+        std_dev = self.prices.stdev
+
+        best_deal = self.best_deal
+        worst_deal = self.worst_deal
+        platform_stats = self._platform_stats()
+
+        return {
+            'price_range': {
+                'min': f"₹{min_price:,.2f}",
+                'max': f"₹{max_price:,.2f}",
+                'avg': f"₹{avg_price:,.2f}",
+                'median': f"₹{median_price:,.2f}",
+                'spread': f"₹{price_spread:,.2f}",
+                'spread_percent': f"{price_spread_percent:.1f}%"
+            },
+            'volatility': {
+                'std_dev': f"₹{std_dev:,.2f}",
+                'coefficient_variation': f"{(std_dev/avg_price*100):.1f}%" if avg_price > 0 else "0%"
+            },
+            'best_deal': {
+                'title': best_deal.title,
+                'price': best_deal.price_label,
+                'platform': best_deal.platform,
+                'url': best_deal.url,
+                'rating': best_deal.rating_label,
+                'discount': best_deal.discount,
+                'savings': f"₹{max_price - best_deal.price:,.2f}",
+                'savings_percent': f"{((max_price - best_deal.price)/max_price*100):.1f}%"
+            },
+            'worst_deal': {
+                'title': worst_deal.title,
+                'price': worst_deal.price_label,
+                'platform': worst_deal.platform,
+                'extra_cost': f"₹{worst_deal.price - min_price:,.2f}",
+                'extra_cost_percent': f"{((worst_deal.price - min_price)/min_price*100):.1f}%"
+            },
+            'platforms': platform_stats,
+            'discounts': self._discount_stats(),
+            'ratings': self._rating_stats(),
+            'recommendation': self._recommendation()
+        }
+
+    def _platform_stats(self) -> List[Dict]:
+        """Per-platform cards sorted by cheapest price"""
+        priced = [(platform, acc) for platform, acc in self.platforms.items() if acc.prices.count]
+        priced.sort(key=lambda item: item[1].prices.min)
+
+        overall_min = self.prices.min
+        platform_stats = []
+        for platform, acc in priced:
+            cheapest = acc.cheapest
+            difference = acc.prices.min - overall_min
+
+            platform_stats.append({
+                'platform': platform,
+                'count': acc.count,
+                'cheapest': {
+                    'title': cheapest.title,
+                    'price': cheapest.price_label,
+                    'url': cheapest.url,
+                    'rating': cheapest.rating_label,
+                    'difference': f"₹{difference:,.2f}",
+                    'difference_percent': f"{(difference/overall_min*100):.1f}%" if overall_min > 0 else "0%",
+                    'is_best_overall': (difference == 0)
+                },
+                'avg_price': f"₹{acc.prices.average:,.2f}",
+                'price_range': {
+                    'min': f"₹{acc.prices.min:,.2f}",
+                    'max': f"₹{acc.prices.max:,.2f}"
+                }
+            })
+
+        return platform_stats
+
+    def _discount_stats(self) -> Dict:
+        if not self.discounts.count:
+            return {
+                'available': False,
+                'message': 'No discount information available'
+            }
+
+        return {
+            'available': True,
+            'count': self.discounts.count,
+            'avg_discount': f"{self.discounts.average:.1f}%",
+            'max_discount': f"{self.discounts.max}%",
+            'products_with_discounts': self.discounts.count,
+            'total_products': self.total,
+            'discount_ratio': f"{(self.discounts.count/self.total*100):.1f}%"
+        }
+
+    def _rating_stats(self) -> Dict:
+        if not self.ratings.count:
+            return {
+                'available': False,
+                'message': 'No rating information available'
+            }
+
+        return {
+            'available': True,
+            'avg_rating': f"{self.ratings.average:.2f}⭐",
+            'highest_rating': f"{self.ratings.max:.1f}⭐",
+            'lowest_rating': f"{self.ratings.min:.1f}⭐",
+            'products_with_ratings': self.ratings.count,
+            'total_products': self.total
+        }
+
+    def _recommendation(self) -> str:
+        """Generate smart recommendation"""
+        best_deal = self.best_deal
+
+        # Check if best deal has good rating
+        has_good_rating = best_deal.rating is not None and best_deal.rating >= 4.0
+
+        # Check discount
+        discount = best_deal.discount
+
+        recommendation = f"🎯 Best deal: {best_deal.price_label} on {best_deal.platform}"
+
+        if has_good_rating:
+            recommendation += f" with {best_deal.rating_label} rating"
+
+        if discount:
+            recommendation += f" ({discount}% off)"
+
+        # Price spread analysis
+        if self.prices.count > 1:
+            spread_percent = ((self.prices.max - self.prices.min) / self.prices.min * 100)
+
+            if spread_percent > 20:
+                recommendation += f". ⚠️ Large price variation ({spread_percent:.0f}%) - compare carefully!"
+            elif spread_percent < 5:
+                recommendation += ". ✅ Prices are consistent across platforms."
+
+        return recommendation
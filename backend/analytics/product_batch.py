@@ -0,0 +1,232 @@
+"""
+Columnar product batch backed by NumPy arrays
+Parses a result set once; filters, sorts and per-platform reductions are vectorized
+"""
+from typing import List, Dict
+import math
+import numpy as np
+
+from utils.product import Product, Availability
+
+from .price_aggregator import PriceAggregator, PlatformAccumulator, RunningStats
+
+
+def _running_stats(values: np.ndarray) -> RunningStats:
+    """RunningStats state computed from an array in one vectorized pass"""
+    stats = RunningStats()
+    if len(values):
+        stats.count = len(values)
+        stats.sum = math.fsum(values.tolist())
+        stats.mean = float(values.mean())
+        stats.m2 = float(((values - stats.mean) ** 2).sum())
+        stats.min = values.min().item()
+        stats.max = values.max().item()
+    return stats
+
+
+class ProductBatch:
+    """Columnar view over a list of Product records"""
+
+    SORT_KEYS = ('price_asc', 'price_desc', 'rating_desc', 'discount_desc')
+
+    def __init__(self, products: List[Product]):
+        self.products = products
+
+        # Missing/zero prices are NaN (the list code treats them as falsy)
+        self.price = np.array([p.price or np.nan for p in products], dtype=np.float64)
+        self.rating = np.array([np.nan if p.rating is None else p.rating for p in products], dtype=np.float64)
+        self.discount = np.array([p.discount or 0 for p in products], dtype=np.int32)
+        self.in_stock = np.array([p.availability is not Availability.OUT_OF_STOCK for p in products], dtype=bool)
+
+        # Platforms as small integer codes, in first-seen order
+        self.platform_names = []
+        codes = {}
+        platform = []
+        for p in products:
+            name = p.platform
+            if name not in codes:
+                codes[name] = len(self.platform_names)
+                self.platform_names.append(name)
+            platform.append(codes[name])
+        self.platform_codes = codes
+        self.platform = np.array(platform, dtype=np.int16)
+
+    def __len__(self) -> int:
+        return len(self.products)
+
+    def all_indices(self) -> np.ndarray:
+        return np.arange(len(self.products))
+
+    def filter_indices(self, filters: Dict, indices: np.ndarray = None) -> np.ndarray:
+        """Indices of products passing the filters (NaN never passes a threshold)"""
+        mask = np.ones(len(self.products), dtype=bool)
+
+        # Price range filter
+        if 'min_price' in filters:
+            mask &= self.price >= filters['min_price']
+
+        if 'max_price' in filters:
+            mask &= self.price <= filters['max_price']
+
+        # Rating filter
+        if 'min_rating' in filters:
+            mask &= self.rating >= filters['min_rating']
+
+        # Platform filter
+        if 'platforms' in filters:
+            allowed = [self.platform_codes[name] for name in filters['platforms'] if name in self.platform_codes]
+            mask &= np.isin(self.platform, allowed)
+
+        # Availability filter
+        if filters.get('in_stock_only'):
+            mask &= self.in_stock
+
+        if indices is None:
+            return np.flatnonzero(mask)
+        return indices[mask[indices]]
+
+    def sort_indices(self, sort_by: str, indices: np.ndarray = None) -> np.ndarray:
+        """Stable argsort permutation for a sort key (unknown keys keep the current order)"""
+        if indices is None:
+            indices = self.all_indices()
+
+        if sort_by == 'price_asc':
+            key = np.nan_to_num(self.price, nan=np.inf)
+        elif sort_by == 'price_desc':
+            key = -np.nan_to_num(self.price, nan=0)
+        elif sort_by == 'rating_desc':
+            key = -np.nan_to_num(self.rating, nan=0)
+        elif sort_by == 'discount_desc':
+            key = -self.discount.astype(np.int64)
+        else:
+            return indices
+
+        return indices[np.argsort(key[indices], kind='stable')]
+
+    def take(self, indices: np.ndarray) -> List[Product]:
+        """Materialize products in index order"""
+        products = self.products
+        return [products[i] for i in indices.tolist()]
+
+    def group_by_platform(self, indices: np.ndarray = None) -> List[Dict]:
+        """Platform buckets in first-seen order, preserving index order within each"""
+        if indices is None:
+            indices = self.all_indices()
+
+        codes = self.platform[indices]
+        present, first_seen = np.unique(codes, return_index=True)
+
+        return [
+            {'platform': self.platform_names[code], 'products': self.take(indices[codes == code])}
+            for code in present[np.argsort(first_seen)].tolist()
+        ]
+
+    def platform_positions(self, indices: np.ndarray = None) -> List[Dict]:
+        """
+        Platform buckets as positions into `indices` rather than products (first-seen order),
+        so a response can reference its product list instead of repeating it
+        """
+        if indices is None:
+            indices = self.all_indices()
+
+        codes = self.platform[indices]
+        present, first_seen = np.unique(codes, return_index=True)
+
+        return [
+            {'platform': self.platform_names[code], 'products': np.flatnonzero(codes == code).tolist()}
+            for code in present[np.argsort(first_seen)].tolist()
+        ]
+
+    def platform_reductions(self, indices: np.ndarray = None) -> Dict[str, np.ndarray]:
+        """
+        Grouped reductions over priced products, one row per platform code
+
+        Returns arrays: total (all products), count, sum, mean, m2, min, max and
+        cheapest (first index with the platform's minimum price, -1 if unpriced)
+        """
+        if indices is None:
+            indices = self.all_indices()
+
+        groups = len(self.platform_names)
+        codes = self.platform[indices]
+        total = np.bincount(codes, minlength=groups)
+
+        priced = indices[~np.isnan(self.price[indices])]
+        codes = self.platform[priced]
+        prices = self.price[priced]
+
+        count = np.bincount(codes, minlength=groups)
+        sums = np.bincount(codes, weights=prices, minlength=groups)
+        mean = np.divide(sums, count, out=np.zeros(groups), where=count > 0)
+        m2 = np.bincount(codes, weights=(prices - mean[codes]) ** 2, minlength=groups)
+
+        minimum = np.full(groups, np.inf)
+        maximum = np.full(groups, -np.inf)
+        np.minimum.at(minimum, codes, prices)
+        np.maximum.at(maximum, codes, prices)
+
+        # Stable lexsort: by platform, then price, then original position
+        order = np.lexsort((prices, codes))
+        first = np.flatnonzero(np.r_[True, codes[order][1:] != codes[order][:-1]]) if len(order) else order
+        cheapest = np.full(groups, -1)
+        cheapest[codes[order][first]] = priced[order][first]
+
+        return {
+            'total': total,
+            'count': count,
+            'sum': sums,
+            'mean': mean,
+            'm2': m2,
+            'min': minimum,
+            'max': maximum,
+            'cheapest': cheapest
+        }
+
+    def aggregate(self, indices: np.ndarray = None) -> PriceAggregator:
+        """PriceAggregator state for a slice, built from vectorized reductions"""
+        if indices is None:
+            indices = self.all_indices()
+
+        aggregator = PriceAggregator()
+        if not len(indices):
+            return aggregator
+
+        aggregator.total = len(indices)
+
+        prices = self.price[indices]
+        priced = prices[~np.isnan(prices)]
+        aggregator.prices = _running_stats(priced)
+        aggregator.sketch.add_many(priced.tolist())
+
+        if len(priced):
+            # argmin/argmax return the first occurrence, matching the list code's tie-breaking
+            aggregator.best_deal = self.products[indices[np.argmin(np.nan_to_num(prices, nan=np.inf))]]
+            aggregator.worst_deal = self.products[indices[np.argmax(np.nan_to_num(prices, nan=-np.inf))]]
+
+        reductions = self.platform_reductions(indices)
+        codes = self.platform[indices]
+        present, first_seen = np.unique(codes, return_index=True)
+        for code in present[np.argsort(first_seen)].tolist():
+            accumulator = PlatformAccumulator()
+            accumulator.count = int(reductions['total'][code])
+
+            count = int(reductions['count'][code])
+            if count:
+                stats = accumulator.prices
+                stats.count = count
+                stats.sum = float(reductions['sum'][code])
+                stats.mean = float(reductions['mean'][code])
+                stats.m2 = float(reductions['m2'][code])
+                stats.min = float(reductions['min'][code])
+                stats.max = float(reductions['max'][code])
+                accumulator.cheapest = self.products[reductions['cheapest'][code]]
+
+            aggregator.platforms[self.platform_names[code]] = accumulator
+
+        discounts = self.discount[indices]
+        aggregator.discounts = _running_stats(discounts[discounts != 0])
+
+        ratings = self.rating[indices]
+        aggregator.ratings = _running_stats(ratings[~np.isnan(ratings)])
+
+        return aggregator
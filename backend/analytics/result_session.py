@@ -0,0 +1,135 @@
+"""
+Result sessions - Reusable views over one cached search result
+Sort permutations, filter matches and analytics are computed once per result and reused
+by every request that re-sorts, re-filters or pages through it
+"""
+from typing import Dict, Optional, Tuple
+from collections import OrderedDict
+import json
+import threading
+
+import numpy as np
+
+from .product_batch import ProductBatch
+
+
+def filter_signature(filters: Optional[Dict]) -> str:
+    """Canonical key for a filters dict (key order doesn't matter)"""
+    return json.dumps(filters or {}, sort_keys=True, default=str)
+
+
+class ResultSession:
+    """Columnar batch plus memoized sort orders, filter matches and analytics for one result"""
+
+    MAX_VIEWS = 64  # Per memo keyed by client filters (views, matches, analytics)
+
+    def __init__(self, products, analytics_engine):
+        self.batch = ProductBatch(products)
+        self.analytics_engine = analytics_engine
+        self.orders = {}  # sort key -> permutation of all products
+        self.matches = {}  # filter signature -> matching indices (original order)
+        self.views = {}  # (filter signature, sort key) -> matching indices in sort order
+        self.analytics = {}  # filter signature -> analytics summary
+
+    def order(self, sort_by: str) -> np.ndarray:
+        """Full sort permutation (built on first use)"""
+        order = self.orders.get(sort_by)
+        if order is None:
+            order = self.orders[sort_by] = self.batch.sort_indices(sort_by)
+        return order
+
+    def _matching(self, filters: Optional[Dict], signature: str) -> np.ndarray:
+        matching = self.matches.get(signature)
+        if matching is None:
+            matching = self.batch.filter_indices(filters) if filters else self.batch.all_indices()
+            self._remember(self.matches, signature, matching)
+        return matching
+
+    def view(self, filters: Optional[Dict], sort_by: str) -> np.ndarray:
+        """Indices passing `filters`, in `sort_by` order"""
+        signature = filter_signature(filters)
+        key = (signature, sort_by)
+        indices = self.views.get(key)
+        if indices is not None:
+            return indices
+
+        order = self.order(sort_by)
+        if filters:
+            # Restricting the (stable) full order keeps ties in the same order as sorting the subset
+            mask = np.zeros(len(self.batch), dtype=bool)
+            mask[self._matching(filters, signature)] = True
+            indices = order[mask[order]]
+        else:
+            indices = order
+
+        self._remember(self.views, key, indices)
+        return indices
+
+    def summary(self, filters: Optional[Dict], precomputed: Dict = None) -> Dict:
+        """Analytics for the products passing `filters` (independent of sort order)"""
+        signature = filter_signature(filters)
+        analytics = self.analytics.get(signature)
+        if analytics is None:
+            if precomputed is not None:
+                analytics = precomputed
+            else:
+                analytics = self.analytics_engine.analyze_batch(self.batch, self._matching(filters, signature))
+            self._remember(self.analytics, signature, analytics)
+        return analytics
+
+    def _remember(self, memo: Dict, key, value):
+        """Memoize, starting over once a memo holds MAX_VIEWS entries"""
+        if len(memo) >= self.MAX_VIEWS:
+            memo.clear()
+        memo[key] = value
+
+
+class ResultSessionStore:
+    """LRU of sessions keyed by cached result (a refreshed result gets a fresh session)"""
+
+    def __init__(self, analytics_engine, max_sessions: int = 128):
+        self.analytics_engine = analytics_engine
+        self.max_sessions = max_sessions
+        self.sessions = OrderedDict()
+        self.lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    @staticmethod
+    def _key(result: Dict) -> Tuple:
+        """Results from one index version share a timestamp, so the listings themselves are part of the key"""
+        products = result.get('products') or ()
+        return (
+            result.get('query', '').lower(),
+            tuple(sorted(result.get('platform_stats') or ())),
+            result.get('timestamp'),
+            len(products),
+            hash(tuple(product.url for product in products))
+        )
+
+    def get(self, result: Dict) -> ResultSession:
+        """Session for a ScraperManager result, created on first use"""
+        key = self._key(result)
+        with self.lock:
+            session = self.sessions.get(key)
+            if session is not None:
+                self.sessions.move_to_end(key)
+                self.hits += 1
+                return session
+            self.misses += 1
+
+        session = ResultSession(result['products'], self.analytics_engine)
+        with self.lock:
+            self.sessions[key] = session
+            while len(self.sessions) > self.max_sessions:
+                self.sessions.popitem(last=False)
+        return session
+
+    def get_stats(self) -> Dict:
+        with self.lock:
+            return {
+                'sessions': len(self.sessions),
+                'max_sessions': self.max_sessions,
+                'hits': self.hits,
+                'misses': self.misses
+            }
@@ -15,6 +15,12 @@ import random
 from datetime import datetime, timedelta
 import threading
 
+from config import Config
+from utils.logger import configure_logging, get_logger
+
+configure_logging(Config.JARVIS_LOG_LEVEL, Config.JARVIS_LOG_FORMAT, Config.JARVIS_LOG_SAMPLE_EVERY)
+log = get_logger('app')
+
 app = Flask(__name__)
 CORS(app)  # Enable CORS for React frontend
 
@@ -62,7 +68,7 @@ class PriceScraper:
 
     def setup_driver(self):
         """Setup Edge driver with safety options (works better on Windows)"""
-        print("🔧 Setting up Microsoft Edge driver (better for Windows)...")
+        log.info("Setting up Microsoft Edge driver")
 
         edge_options = Options()
 
@@ -87,7 +93,7 @@ class PriceScraper:
         edge_options.add_argument("--log-level=3")  # Suppress logs
 
         try:
-            print("📥 Downloading/locating Edge driver...")
+            log.debug("Downloading/locating Edge driver")
             service = Service(EdgeChromiumDriverManager().install())
             self.driver = webdriver.Edge(service=service, options=edge_options)
 
@@ -98,12 +104,12 @@ class PriceScraper:
             self.driver.set_page_load_timeout(30)
             self.driver.implicitly_wait(10)
 
-            print("✅ Edge driver setup successful with safety measures")
+            log.info("Edge driver ready")
 
         except Exception as e:
-            print(f"❌ Edge driver setup failed: {e}")
-            print("💡 Make sure Microsoft Edge is installed (comes with Windows 10/11)")
-            print("🔧 Alternative: Install Chrome browser and we can switch to Chrome driver")
+            log.error("Edge driver setup failed: %s", e)
+            log.info("Make sure Microsoft Edge is installed (comes with Windows 10/11)")
+            log.info("Alternative: install Chrome and switch to the Chrome driver")
             self.driver = None
 
     def safe_wait(self, site_name, min_delay=2, max_delay=5):
@@ -114,7 +120,7 @@ class PriceScraper:
             time_since_last = current_time - self.last_request_time[site_name]
             if time_since_last < min_delay:
                 sleep_time = random.uniform(min_delay, max_delay)
-                print(f"⏳ Waiting {sleep_time:.1f}s before {site_name} request (respectful scraping)")
+                log.debug("Waiting %.1fs before request", sleep_time, extra={'platform': site_name})
                 time.sleep(sleep_time)
 
         self.last_request_time[site_name] = time.time()
@@ -131,12 +137,12 @@ class PriceScraper:
     def search_amazon(self, query):
         """Scrape Amazon search results using Selenium with safety measures"""
         if not self.driver:
-            print("❌ Driver not available for Amazon search")
+            log.error("Driver not available", extra={'platform': 'Amazon'})
             return []
 
         # Check rate limiting
         if not self.is_request_allowed('amazon'):
-            print("⚠️ Amazon rate limit exceeded. Skipping to protect IP.")
+            log.warning("Rate limit exceeded - skipping", extra={'platform': 'Amazon'})
             return []
 
         try:
@@ -144,7 +150,7 @@ class PriceScraper:
             self.safe_wait('amazon', 3, 6)
 
             search_url = f"https://www.amazon.in/s?k={query.replace(' ', '+')}"
-            print(f"🔍 Searching Amazon: {search_url}")
+            log.info("Searching", extra={'platform': 'Amazon', 'url': search_url})
 
             self.driver.get(search_url)
 
@@ -154,7 +160,7 @@ class PriceScraper:
                     EC.presence_of_element_located((By.CSS_SELECTOR, "[data-component-type='s-search-result']"))
                 )
             except TimeoutException:
-                print("⚠️ Amazon search results took too long to load")
+                log.warning("Search results took too long to load", extra={'platform': 'Amazon'})
                 return []
 
             products = []
@@ -215,22 +221,22 @@ class PriceScraper:
                 except Exception as e:
                     continue
 
-            print(f"✅ Amazon: Found {len(products)} products")
+            log.info("Found %d products", len(products), extra={'platform': 'Amazon'})
             return products
 
         except Exception as e:
-            print(f"❌ Error scraping Amazon: {e}")
+            log.error("Scrape failed: %s", e, extra={'platform': 'Amazon'})
             return []
 
     def search_flipkart(self, query):
         """Scrape Flipkart search results using Selenium with safety measures"""
         if not self.driver:
-            print("❌ Driver not available for Flipkart search")
+            log.error("Driver not available", extra={'platform': 'Flipkart'})
             return []
 
         # Check rate limiting
         if not self.is_request_allowed('flipkart'):
-            print("⚠️ Flipkart rate limit exceeded. Skipping to protect IP.")
+            log.warning("Rate limit exceeded - skipping", extra={'platform': 'Flipkart'})
             return []
 
         try:
@@ -238,7 +244,7 @@ class PriceScraper:
             self.safe_wait('flipkart', 4, 7)
 
             search_url = f"https://www.flipkart.com/search?q={query.replace(' ', '%20')}"
-            print(f"🔍 Searching Flipkart: {search_url}")
+            log.info("Searching", extra={'platform': 'Flipkart', 'url': search_url})
 
             self.driver.get(search_url)
 
@@ -265,7 +271,7 @@ class PriceScraper:
                     continue
 
             if not product_elements:
-                print("⚠️ No Flipkart products found with current selectors")
+                log.warning("No products found with current selectors", extra={'platform': 'Flipkart'})
                 return []
 
             for element in product_elements:
@@ -345,15 +351,25 @@ class PriceScraper:
                 except Exception as e:
                     continue
 
-            print(f"✅ Flipkart: Found {len(products)} products")
+            log.info("Found %d products", len(products), extra={'platform': 'Flipkart'})
             return products
 
         except Exception as e:
-            print(f"❌ Error scraping Flipkart: {e}")
+            log.error("Scrape failed: %s", e, extra={'platform': 'Flipkart'})
             return []
 
-# Global scraper instance
-scraper = PriceScraper()
+# Global scraper instance, created on the first search (it launches Edge)
+scraper = None
+scraper_lock = threading.Lock()
+
+
+def get_scraper():
+    """The shared PriceScraper, starting the browser on first use"""
+    global scraper
+    with scraper_lock:
+        if scraper is None:
+            scraper = PriceScraper()
+        return scraper
 
 @app.route('/api/search', methods=['POST'])
 def search_products():
@@ -372,27 +388,27 @@ def search_products():
         if len(query) > 100:
             return jsonify({'error': 'Query too long'}), 400
 
-        print(f"🔍 Safe search initiated for: {query}")
+        log.info("Search request", extra={'query': query})
 
         # Search across platforms with safety measures
         all_products = []
 
         try:
             # Amazon search with error handling
-            print("🛡️ Starting Amazon search with safety measures...")
-            amazon_products = scraper.search_amazon(query)
+            log.debug("Starting search", extra={'platform': 'Amazon'})
+            amazon_products = get_scraper().search_amazon(query)
             all_products.extend(amazon_products)
 
             # Delay between different sites
             time.sleep(random.uniform(2, 4))
 
             # Flipkart search with error handling
-            print("🛡️ Starting Flipkart search with safety measures...")
-            flipkart_products = scraper.search_flipkart(query)
+            log.debug("Starting search", extra={'platform': 'Flipkart'})
+            flipkart_products = get_scraper().search_flipkart(query)
             all_products.extend(flipkart_products)
 
         except Exception as scraping_error:
-            print(f"⚠️ Scraping error: {scraping_error}")
+            log.warning("Scraping error: %s", scraping_error)
             # Continue with whatever results we have
 
         # Sort by price (extract numeric value)
@@ -404,7 +420,7 @@ def search_products():
 
         all_products.sort(key=lambda x: extract_price(x['price']) if x['price'] != 'N/A' else float('inf'))
 
-        print(f"✅ Safe search completed. Found {len(all_products)} total products")
+        log.info("Search completed: %d products", len(all_products), extra={'query': query})
 
         return jsonify({
             'success': True,
@@ -415,7 +431,7 @@ def search_products():
         })
 
     except Exception as e:
-        print(f"❌ Search API error: {e}")
+        log.exception("Search API error")
         return jsonify({'error': 'Search temporarily unavailable. Please try again later.'}), 500
 
 @app.route('/api/health', methods=['GET'])
@@ -423,7 +439,7 @@ def health_check():
     """Health check endpoint with driver status"""
     return jsonify({
         'status': 'healthy',
-        'driver_status': 'active' if scraper.driver else 'inactive',
+        'driver_status': ('active' if scraper.driver else 'inactive') if scraper else 'not started',
         'safety_features': 'enabled',
         'rate_limiting': 'active'
     })
@@ -448,15 +464,17 @@ def home():
         'legal_note': 'Educational project - respects robots.txt and rate limits'
     })
 
-# Cleanup on exit
-import atexit
-def cleanup():
-    print("🧹 Cleaning up resources...")
+def create_app(workers: int = 1):
+    """WSGI app for serve.py (one Edge driver per worker process)"""
+    return app
+
+
+def shutdown(timeout: float = None):
+    """Close the browser (called by the server on worker exit)"""
+    log.info("Cleaning up resources")
     if scraper:
         scraper.close_driver()
 
-atexit.register(cleanup)
-
 if __name__ == '__main__':
     print("🚀 Starting Safe Price Comparison API...")
     print("🛡️ Safety Features:")
@@ -465,6 +483,9 @@ if __name__ == '__main__':
     print("   ✅ User agent rotation active")
     print("   ✅ Error handling in place")
     print("   ✅ Limited results per site")
-    print(f"🤖 Driver setup: {'✅ Success' if scraper.driver else '❌ Failed'}")
+    print("🤖 Driver setup: created on first search")
     print("📝 Legal Note: Educational project - respects robots.txt")
-    app.run(debug=True, host='0.0.0.0', port=5000)
+    try:
+        app.run(debug=True, host='0.0.0.0', port=5000)
+    finally:
+        shutdown()
@@ -11,46 +11,262 @@ Features:
 - Real-time performance monitoring
 """
 
-from flask import Flask, request, jsonify
+from flask import Flask, Response, g, request, jsonify, stream_with_context
 from flask_cors import CORS
-import atexit
+from concurrent.futures import ThreadPoolExecutor
+from functools import wraps
+import hmac
+import json
+import os
+import threading
 import time
 from datetime import datetime
 
-# Import scrapers
-from scrapers.amazon_scraper import AmazonScraper
-from scrapers.flipkart_scraper import FlipkartScraper
-from scrapers.ebay_scraper import EbayScraper
-from scrapers.snapdeal_scraper import SnapdealScraper
+# Scrapers are imported on first use (Selenium is the bulk of startup time)
+from scrapers.registry import scraper_factory, resolve_platforms
 
 # Import utilities
+from config import Config
 from utils.scraper_manager import ScraperManager
 from utils.product_matcher import ProductMatcher, PriceNormalizer
+from utils.product_catalog import ProductCatalog, IncrementalGrouper
+from utils.product import Product
+from utils.price_history import PriceHistoryStore
+from utils.price_alerts import PriceAlertEngine, LogAlertSink, JsonlAlertSink
+from utils.refresh_scheduler import RefreshScheduler
+from utils.profiler import SamplingProfiler, ProfileStore
+from utils.suggest import SuggestionIndex
+from utils.search_index import ProductIndex
+from utils.query_normalizer import canonical_query
+from utils import metrics, pagination, serialization, tracing
+from utils.timeouts import TIMEOUTS
+from utils.logger import configure_logging, get_logger, shutdown_logging
 from analytics.price_analytics import PriceAnalytics
 
+configure_logging(Config.JARVIS_LOG_LEVEL, Config.JARVIS_LOG_FORMAT, Config.JARVIS_LOG_SAMPLE_EVERY)
+log = get_logger('app_jarvis')
+
 app = Flask(__name__)
 CORS(app)
 
 # Initialize components
-scraper_manager = ScraperManager()
+TIMEOUTS.configure(Config.JARVIS_TIMEOUT_PERCENTILE, Config.JARVIS_TIMEOUT_MARGIN, Config.JARVIS_TIMEOUT_MAX)
+scraper_manager = ScraperManager(
+    pool_size=Config.JARVIS_BROWSERS_PER_PLATFORM,
+    breaker_failures=Config.JARVIS_BREAKER_FAILURES,
+    breaker_reset=Config.JARVIS_BREAKER_RESET_SECONDS,
+    hedging=Config.JARVIS_HEDGE_ENABLED,
+    hedge_percentile=Config.JARVIS_HEDGE_PERCENTILE,
+    hedge_budget=Config.JARVIS_HEDGE_BUDGET
+)
 product_matcher = ProductMatcher()
+product_catalog = ProductCatalog(product_matcher, path=Config.JARVIS_CATALOG_PATH,
+                                 legacy_log=os.path.join(Config.JARVIS_DATA_DIR, 'catalog.jsonl'))
 price_normalizer = PriceNormalizer()
 analytics_engine = PriceAnalytics()
+price_history = PriceHistoryStore(Config.JARVIS_HISTORY_PATH, catalog=product_catalog)
+alert_sinks = [LogAlertSink()]
+if Config.JARVIS_ALERT_SINK_PATH:
+    alert_sinks.append(JsonlAlertSink(Config.JARVIS_ALERT_SINK_PATH))
+price_alerts = PriceAlertEngine(product_catalog, sinks=alert_sinks, path=Config.JARVIS_ALERTS_PATH,
+                                legacy_log=os.path.join(Config.JARVIS_DATA_DIR, 'alerts.jsonl'))
+suggestions = SuggestionIndex(top_k=Config.JARVIS_SUGGEST_TOP_K, max_terms=Config.JARVIS_SUGGEST_MAX_TERMS)
+product_index = ProductIndex(product_catalog.listing_key, max_docs=Config.JARVIS_INDEX_MAX_DOCS,
+                             snapshot_ttl=Config.JARVIS_INDEX_SNAPSHOT_TTL)
+
+# Every fresh scrape is appended to the price history (queued, off the request path)
+# and checked against registered price alerts
+scraper_manager.add_listener(price_history.record)
+scraper_manager.add_listener(price_alerts.evaluate)
+scraper_manager.add_listener(suggestions.add_products)
+scraper_manager.add_listener(product_index.add)
+
+# Popular and alert-watched queries are re-scraped in the background before their cache expires
+refresh_scheduler = RefreshScheduler(
+    scraper_manager,
+    watch_source=price_alerts.watched_queries,
+    interval=Config.JARVIS_REFRESH_INTERVAL,
+    top_n=Config.JARVIS_REFRESH_TOP_N,
+    min_score=Config.JARVIS_REFRESH_MIN_SCORE,
+    browser_budget=Config.JARVIS_REFRESH_BROWSER_BUDGET,
+    platform_rpm=Config.JARVIS_REFRESH_PLATFORM_RPM,
+    off_peak_hours=Config.refresh_hours(),
+    max_active=Config.JARVIS_REFRESH_MAX_ACTIVE
+)
+
+def collect_metrics():
+    """Sample pool, queue and scrape gauges right before /metrics renders"""
+    for name, pool in scraper_manager.pools.items():
+        stats = pool.get_stats()
+        metrics.POOL_SIZE.set(stats['size'], platform=name)
+        metrics.POOL_INSTANCES.set(stats['instances'], platform=name)
+        metrics.POOL_IN_USE.set(stats['in_use'], platform=name)
+    circuit_levels = {'closed': 0, 'half_open': 1, 'open': 2}
+    for name, breaker in scraper_manager.breakers.items():
+        metrics.CIRCUIT_STATE.set(circuit_levels[breaker.get_stats()['state']], platform=name)
+    metrics.ACTIVE_SCRAPES.set(scraper_manager.active_scrapes)
+    metrics.QUEUE_DEPTH.set(refresh_scheduler.get_stats()['queue_length'], queue='refresh')
+    metrics.QUEUE_DEPTH.set(price_history.pending.qsize(), queue='history')
+
+
+metrics.REGISTRY.on_collect(collect_metrics)
+
+# Sort/filter/analytics views per cached result, created by the first search
+# (that's where NumPy gets imported, not at worker startup)
+result_sessions = None
+result_sessions_lock = threading.Lock()
+
+
+def get_result_sessions():
+    global result_sessions
+    with result_sessions_lock:
+        if result_sessions is None:
+            from analytics.result_session import ResultSessionStore
+            result_sessions = ResultSessionStore(analytics_engine, Config.JARVIS_RESULT_SESSIONS)
+        return result_sessions
+
+
+trace_exporter = tracing.TraceExporter(Config.JARVIS_TRACE_PATH) if Config.JARVIS_TRACE_EXPORT else None
+profile_store = ProfileStore(Config.JARVIS_PROFILE_DIR, Config.JARVIS_PROFILE_KEEP) if Config.JARVIS_PROFILE_ENABLED else None
+
+
+@app.before_request
+def start_request_trace():
+    g.request_start = time.perf_counter()
+    request_id = (request.headers.get('X-Request-ID') or '')[:64] or None
+    g.trace, g.trace_token = tracing.start_trace(request_id)
+
+
+@app.after_request
+def finish_request_trace(response):
+    if 'request_start' not in g:
+        return response
+
+    endpoint = request.url_rule.rule if request.url_rule else 'unmatched'
+    elapsed = time.perf_counter() - g.request_start
+    metrics.REQUEST_SECONDS.observe(elapsed, endpoint=endpoint, method=request.method, status=response.status_code)
+
+    g.trace.add(f"{request.method} {endpoint}", g.request_start, g.request_start + elapsed,
+                {'status': response.status_code})
+    if trace_exporter:
+        trace_exporter.export(g.trace)
+
+    response.headers['X-Request-ID'] = g.trace.request_id
+    return response
+
+
+@app.teardown_request
+def end_request_trace(error=None):
+    token = g.pop('trace_token', None)
+    if token is not None:
+        try:
+            tracing.end_trace(token)
+        except ValueError:
+            pass  # Streamed responses finish in a different context
+
+
+def json_response(payload, status: int = 200, etag: str = None) -> Response:
+    """JSON via the fast encoder, compressed (br/gzip) for clients that accept it"""
+    with tracing.span('encode'):
+        body = serialization.dumps(payload)
+    response = Response(body, status=status, mimetype='application/json')
+    response.headers['Vary'] = 'Accept-Encoding'
+
+    if len(body) >= serialization.MIN_COMPRESS_BYTES:
+        encoding = serialization.negotiate_encoding(request.headers.get('Accept-Encoding'))
+        if encoding:
+            with tracing.span('compress', encoding=encoding):
+                response.set_data(serialization.compress(body, encoding))
+            response.headers['Content-Encoding'] = encoding
+
+    if etag:
+        response.headers['ETag'] = etag
+    return response
+
+
+def trace_requested(data=None) -> bool:
+    """Whether the caller asked for spans in metadata.trace (?trace=1, X-Trace: 1 or "trace": true)"""
+    return (
+        request.args.get('trace') == '1'
+        or request.headers.get('X-Trace') == '1'
+        or bool(data and data.get('trace'))
+    )
+
+
+def profiled(view):
+    """
+    Run the view under the sampling profiler when the caller asks (?profile=1 or X-Profile: 1)
+    With profiling disabled in config the view is returned unwrapped
+    """
+    if profile_store is None:
+        return view
+
+    @wraps(view)
+    def wrapper(*args, **kwargs):
+        if request.args.get('profile') != '1' and request.headers.get('X-Profile') != '1':
+            return view(*args, **kwargs)
+
+        profiler = SamplingProfiler(Config.JARVIS_PROFILE_INTERVAL_MS / 1000.0).start()
+        try:
+            response = app.make_response(view(*args, **kwargs))
+        finally:
+            profiler.stop()
+            body = request.get_json(silent=True) or {}
+            profile_id = profile_store.save(
+                profiler, request_id=g.trace.request_id, path=request.path, query=body.get('query'))
+
+        response.headers['X-Profile-ID'] = profile_id
+        return response
+
+    return wrapper
+
+
+def admin_denied():
+    """403 response unless the request carries JARVIS_ADMIN_TOKEN (admin endpoints are off without one)"""
+    if not Config.JARVIS_ADMIN_TOKEN:
+        return jsonify({'success': False, 'error': 'Admin endpoints are disabled (set JARVIS_ADMIN_TOKEN)'}), 403
+    token = request.headers.get('X-Admin-Token', '').encode()
+    if not hmac.compare_digest(token, Config.JARVIS_ADMIN_TOKEN.encode()):
+        return jsonify({'success': False, 'error': 'Forbidden'}), 403
+    return None
+
+
+def create_app(workers: int = 1, start_scheduler: bool = None):
+    """
+    Per-process setup, returning the WSGI app (call in each server worker, after fork)
+
+    Args:
+        workers: Worker processes sharing the browser and background refresh budgets
+        start_scheduler: Run the refresh scheduler (default Config.JARVIS_REFRESH_ENABLED)
+    """
+    workers = max(1, workers)
+    log.info("JARVIS initializing - Price Intelligence Platform")
+
+    if not scraper_manager.scrapers:
+        scraper_manager.pool_size = Config.browsers_per_worker(workers)
+        lifecycle = {
+            'max_navigations': Config.JARVIS_DRIVER_MAX_NAVIGATIONS,
+            'max_rss_mb': Config.JARVIS_DRIVER_MAX_RSS_MB,
+            'memory_check_every': Config.JARVIS_DRIVER_CHECK_EVERY
+        }
+        for platform in resolve_platforms(Config.platforms()):
+            scraper_manager.register_scraper(platform, factory=scraper_factory(platform, lifecycle))
 
-# Register scrapers
-print("🚀 JARVIS INITIALIZING - Price Intelligence Platform")
-print("=" * 60)
+    log.info("Platform ready with %d scrapers (%d browsers per platform)",
+             len(scraper_manager.get_available_platforms()), scraper_manager.pool_size)
 
-try:
-    scraper_manager.register_scraper("Amazon", AmazonScraper())
-    scraper_manager.register_scraper("Flipkart", FlipkartScraper())
-    scraper_manager.register_scraper("eBay", EbayScraper())
-    scraper_manager.register_scraper("Snapdeal", SnapdealScraper())
-except Exception as e:
-    print(f"⚠️ Warning during scraper registration: {e}")
+    # Suggestions start from the catalog's product titles; searches add to them as they come in
+    if not suggestions.scores:
+        for product in list(product_catalog.products.values()):
+            suggestions.add_title(product['title'])
 
-print("=" * 60)
-print(f"✅ Platform ready with {len(scraper_manager.get_available_platforms())} scrapers")
+    # Every worker refreshes its own cache, so split the background budget between them
+    refresh_scheduler.browser_budget = max(1, Config.JARVIS_REFRESH_BROWSER_BUDGET // workers)
+    refresh_scheduler.platform_rpm = Config.JARVIS_REFRESH_PLATFORM_RPM / workers
+    if Config.JARVIS_REFRESH_ENABLED if start_scheduler is None else start_scheduler:
+        refresh_scheduler.start()
+
+    return app
 
 
 @app.route('/', methods=['GET'])
@@ -68,18 +284,30 @@ def home():
             'Intelligent caching (10min TTL)',
             'Real-time comparison across 4+ platforms',
             'Comprehensive filtering and sorting',
-            'Price history tracking (coming soon)',
-            'Price drop alerts (coming soon)'
+            'Price history tracking',
+            'Price drop alerts',
+            'Background refresh of popular queries',
+            'Query suggestions from past searches',
+            'Instant answers from a full-text index of past scrapes'
         ],
         'platforms': scraper_manager.get_available_platforms(),
         'endpoints': {
             '/': 'API documentation',
             '/api/search': 'Search products across platforms (POST)',
+            '/api/search/batch': 'Search many queries in one request, optionally streamed as NDJSON (POST)',
+            '/api/suggest': 'Query suggestions for a prefix, flagging ones already cached (GET)',
             '/api/health': 'System health check (GET)',
             '/api/platforms': 'List available platforms (GET)',
             '/api/stats': 'Platform statistics (GET)',
             '/api/cache/clear': 'Clear cache (POST)',
-            '/api/compare': 'Advanced product comparison (POST)'
+            '/metrics': 'Prometheus metrics (GET)',
+            '/api/compare': 'Advanced product comparison (POST)',
+            '/api/history': 'Downsampled price history for a product or listing (GET)',
+            '/api/alerts': 'Register (POST) or list (GET) price drop alerts',
+            '/api/alerts/<id>': 'Remove a price alert (DELETE)',
+            '/api/alerts/notifications': 'Recently triggered alerts (GET)',
+            '/api/admin/profiles': 'Stored request profiles (GET, admin)',
+            '/api/admin/profiles/<id>': 'One request profile, JSON or ?format=collapsed (GET, admin)'
         },
         'safety_features': [
             'Rate limiting per platform',
@@ -108,6 +336,9 @@ def health_check():
             'entries': stats['cache_entries'],
             'ttl_seconds': stats['cache_ttl_seconds']
         },
+        'catalog': product_catalog.get_stats(),
+        'history': price_history.get_stats(),
+        'alerts': price_alerts.get_stats(),
         'performance': {
             'max_concurrent_workers': stats['max_workers']
         }
@@ -131,10 +362,51 @@ def get_stats():
     """Get detailed statistics"""
     return jsonify({
         'success': True,
-        'stats': scraper_manager.get_stats()
+        'stats': scraper_manager.get_stats(),
+        'result_sessions': result_sessions.get_stats() if result_sessions else None,
+        'suggest': suggestions.get_stats(),
+        'index': product_index.get_stats(),
+        'timeouts': TIMEOUTS.get_stats(),
+        'scheduler': refresh_scheduler.get_stats()
     })
 
 
+@app.route('/metrics', methods=['GET'])
+def get_metrics():
+    """Prometheus text exposition"""
+    return Response(metrics.REGISTRY.render(), content_type=metrics.CONTENT_TYPE)
+
+
+@app.route('/api/admin/profiles', methods=['GET'])
+def list_profiles():
+    """Stored request profiles, newest first"""
+    denied = admin_denied()
+    if denied:
+        return denied
+    if profile_store is None:
+        return jsonify({'success': False, 'error': 'Profiling is disabled (JARVIS_PROFILE_ENABLED=1)'}), 404
+
+    return jsonify({'success': True, 'profiles': profile_store.list()})
+
+
+@app.route('/api/admin/profiles/<profile_id>', methods=['GET'])
+def get_profile(profile_id):
+    """One profile as JSON, or folded stacks for flamegraph tools with ?format=collapsed"""
+    denied = admin_denied()
+    if denied:
+        return denied
+
+    profile = profile_store.load(profile_id) if profile_store else None
+    if profile is None:
+        return jsonify({'success': False, 'error': 'Profile not found'}), 404
+
+    if request.args.get('format') == 'collapsed':
+        folded = '\n'.join(f"{stack} {count}" for stack, count in profile['stacks'].items())
+        return Response(folded + '\n', mimetype='text/plain')
+
+    return jsonify({'success': True, 'profile': profile})
+
+
 @app.route('/api/cache/clear', methods=['POST'])
 def clear_cache():
     """Clear all cached results"""
@@ -146,6 +418,7 @@ def clear_cache():
 
 
 @app.route('/api/search', methods=['POST'])
+@profiled
 def search_products():
     """
     Advanced product search across multiple platforms
@@ -162,11 +435,45 @@ def search_products():
             "min_rating": 4.0,
             "platforms": ["Amazon", "Flipkart"]
         },
-        "sort": "price_asc"  // Options: price_asc, price_desc, rating_desc, discount_desc
+        "sort": "price_asc",  // Options: price_asc, price_desc, rating_desc, discount_desc
+        "group": true,  // Optional, include cross-platform matchGroups
+        "group_budget_ms": 150,  // Optional, max time spent matching new listings
+        "trace": true,  // Optional, include per-phase spans in metadata.trace
+        "page_size": 20,  // Optional, return results a page at a time (max 100)
+        "fields": ["title", "price", "url"],  // Optional, product fields to include
+        "cursor": "...",  // Next page: send page.next_cursor from the previous response
+        "source": "live",  // Optional, "index" answers from previously scraped listings
+        "refresh": true,  // Optional with source=index, start a live scrape in the background
+        "compact": true  // Optional, smaller document (see below); implied by page_size
     }
+
+    With "source": "index" the response comes from the full-text index in relevance order
+    (unless `sort` is given) with metadata.staleness giving the age of the listings;
+    metadata.refresh says whether a live scrape was started to bring the cache up to date.
+
+    A cursor carries the original request and pins the cached result set it came from,
+    so later pages are served from that snapshot without re-scraping (410 once it has
+    been replaced by a refresh). Analytics and matchGroups come with the first page only.
+
+    By default each `platformBuckets` entry repeats its products and `comparison` repeats
+    `analytics`. Compact responses list products once, in `products`: bucket entries hold
+    positions in that array and `comparison` is left out. Responses carry an ETag (send it back as If-None-Match to get a 304 while
+    the cached result is unchanged) and are gzip/brotli compressed per Accept-Encoding.
+
+    With JARVIS_PROFILE_ENABLED, ?profile=1 (or X-Profile: 1) stores a sampling profile
+    retrievable at /api/admin/profiles/<X-Profile-ID>
     """
     try:
-        data = request.get_json()
+        data = request.get_json() or {}
+
+        # A cursor replays the request it was issued for
+        cursor = None
+        if data.get('cursor'):
+            try:
+                cursor = pagination.decode_cursor(data['cursor'])
+            except ValueError as e:
+                return jsonify({'success': False, 'error': str(e)}), 400
+            data = {**data, **cursor['request']}
 
         # Validate input
         query = data.get('query', '').strip()
@@ -184,66 +491,108 @@ def search_products():
         max_results = min(data.get('max_results', 10), 20)  # Cap at 20
         use_cache = data.get('use_cache', True)
         filters = data.get('filters', {})
-        sort_by = data.get('sort', 'price_asc')
+        source = data.get('source', 'live')
+        sort_by = data.get('sort', 'relevance' if source == 'index' else 'price_asc')
+        group = data.get('group', False)
+        group_budget_ms = min(float(data.get('group_budget_ms', Config.JARVIS_GROUP_BUDGET_MS)), 1000)
+        try:
+            page_size = pagination.parse_page_size(data.get('page_size'))
+            fields = pagination.parse_fields(data.get('fields'))
+        except ValueError as e:
+            return jsonify({'success': False, 'error': str(e)}), 400
+        compact = bool(data.get('compact')) or page_size is not None
 
-        print(f"🔍 Search request: '{query}' | Platforms: {platforms or 'all'} | Max: {max_results}")
+        if source not in ('live', 'index'):
+            return jsonify({'success': False, 'error': "source must be 'live' or 'index'"}), 400
 
-        # Execute search
-        search_start = time.time()
-        result = scraper_manager.search_all(
-            query=query,
-            platforms=platforms,
-            max_results=max_results,
-            use_cache=use_cache
-        )
+        if cursor:
+            return search_page(query, platforms, filters, sort_by, page_size, fields, cursor, max_results, source)
 
-        if not result['success']:
-            return jsonify(result), 500
+        log.info("Search request", extra={'query': query, 'platforms': platforms or 'all', 'max_results': max_results})
 
-        products = result['products']
+        refresh_scheduler.record(query, platforms)
 
-        # Apply filters
-        if filters:
-            products = apply_filters(products, filters)
+        # Match products across platforms while the slower platforms are still scraping
+        grouper = IncrementalGrouper(product_catalog, group_budget_ms) if group else None
 
-        # Apply sorting
-        products = apply_sorting(products, sort_by)
+        # Unfiltered analytics are accumulated as each platform's results arrive
+        aggregator = analytics_engine.new_aggregator() if not filters else None
 
-        # Generate analytics
-        analytics = analytics_engine.analyze_products(products)
+        def on_results(platform, platform_products):
+            if aggregator:
+                aggregator.add_many(platform_products)
+            if grouper:
+                grouper.add(platform_products)
 
-        # Group by platform for frontend
-        platform_buckets = group_by_platform(products)
+        # Execute search
+        search_start = time.time()
+        refresh = None
+        if source == 'index':
+            with tracing.span('index_search', query=query):
+                result = index_result(query, platforms, max_results)
+            if grouper:
+                grouper.add(result['products'])
+            if data.get('refresh'):
+                refresh = start_live_refresh(query, platforms, max_results)
+        else:
+            with tracing.span('search_all', query=query):
+                result = scraper_manager.search_all(
+                    query=query,
+                    platforms=platforms,
+                    max_results=max_results,
+                    use_cache=use_cache,
+                    on_results=on_results,
+                    deadline=Config.JARVIS_REQUEST_DEADLINE
+                )
 
-        # Prepare response
-        response = {
-            'success': True,
-            'query': query,
-            'products': products,
-            'total': len(products),
-            'filtered_total': len(products),
-            'analytics': analytics,
-            'platformBuckets': platform_buckets,
-            'comparison': analytics,  # For backward compatibility
-            'metadata': {
-                'platforms_searched': result['platforms_searched'],
-                'platforms_succeeded': result['platforms_succeeded'],
-                'platform_stats': result['platform_stats'],
-                'elapsed_time': result['elapsed_time'],
-                'from_cache': result['from_cache'],
-                'timestamp': result['timestamp']
-            }
-        }
+        if not result['success']:
+            return jsonify(result), 500
+
+        suggestions.add_query(query)
+
+        # The cached result's timestamp plus every input that shapes the document; a client
+        # revalidating an unchanged cache entry gets a 304 without the response being rebuilt
+        etag = None
+        if not trace_requested(data):
+            etag = serialization.make_etag(
+                result['timestamp'], query.lower(), sorted(platforms or []), max_results,
+                json.dumps(filters, sort_keys=True), sort_by, bool(group), page_size, fields, compact,
+                len(product_catalog.listings)
+            )
+            if serialization.etag_matches(request.headers.get('If-None-Match'), etag):
+                return Response(status=304, headers={'ETag': etag, 'Vary': 'Accept-Encoding'})
+
+        response, products = build_search_response(
+            query, result, filters, sort_by,
+            analytics=aggregator.summary() if aggregator and not result['from_cache'] else None,
+            page_size=page_size, fields=fields, compact=compact
+        )
+        if page_size is not None:
+            add_next_cursor(response, result, {
+                'query': query, 'platforms': platforms, 'max_results': max_results,
+                'filters': filters, 'sort': sort_by, 'page_size': page_size, 'fields': fields,
+                'source': source
+            })
+        if refresh:
+            response['metadata']['refresh'] = refresh
+
+        if grouper:
+            with tracing.span('match_groups'):
+                response['matchGroups'] = grouper.match_groups(products)
+            response['metadata']['grouping'] = grouper.get_stats()
+
+        response['metadata']['request_id'] = g.trace.request_id
+        if trace_requested(data):
+            response['metadata']['trace'] = g.trace.to_dict()
 
         search_elapsed = time.time() - search_start
-        print(f"✅ Search completed in {search_elapsed:.2f}s | {len(products)} products | Cache: {result['from_cache']}")
+        log.info("Search completed in %.2fs: %d products", search_elapsed, len(products),
+                 extra={'query': query, 'from_cache': result['from_cache']})
 
-        return jsonify(response)
+        return json_response(response, etag=etag)
 
     except Exception as e:
-        print(f"❌ Search error: {e}")
-        import traceback
-        traceback.print_exc()
+        log.exception("Search failed")
         return jsonify({
             'success': False,
             'error': 'An error occurred during search',
@@ -251,6 +600,263 @@ def search_products():
         }), 500
 
 
+def search_page(query, platforms, filters, sort_by, page_size, fields, cursor, max_results, source):
+    """Next page of a paged search, from the cached result (or index) snapshot the cursor points at"""
+    if source == 'index':
+        result = index_result(query, platforms, max_results, snapshot=cursor['snapshot'])
+    else:
+        result = scraper_manager.get_snapshot(query, platforms, cursor['snapshot'])
+    if result is None:
+        return jsonify({
+            'success': False,
+            'error': 'Cursor expired: the results were refreshed, start again without a cursor'
+        }), 410
+
+    etag = serialization.make_etag(cursor['snapshot'], cursor['offset'], json.dumps(cursor['request'], sort_keys=True))
+    if serialization.etag_matches(request.headers.get('If-None-Match'), etag):
+        return Response(status=304, headers={'ETag': etag, 'Vary': 'Accept-Encoding'})
+
+    response, _ = build_search_response(
+        query, result, filters, sort_by, page_size=page_size, offset=cursor['offset'],
+        fields=fields, include_analytics=False
+    )
+    add_next_cursor(response, result, cursor['request'])
+    response['metadata']['request_id'] = g.trace.request_id
+    return json_response(response, etag=etag)
+
+
+# Background scrapes started by source=index requests with "refresh": true
+refresh_executor = None
+refresh_running = set()
+refresh_lock = threading.Lock()
+
+
+def index_result(query, platforms, max_results, snapshot=None):
+    """
+    Full-text index answer for a query, shaped like a ScraperManager result
+    With a snapshot id, the hit list an earlier answer was paged from (None once expired)
+    """
+    if platforms is None:
+        platforms = scraper_manager.get_available_platforms()
+    platforms = [p for p in platforms if p in scraper_manager.scrapers]
+    if snapshot:
+        return product_index.snapshot_result(snapshot, query, platforms)
+    return product_index.search_result(query, platforms, max_results * max(1, len(platforms)))
+
+
+def start_live_refresh(query, platforms, max_results) -> str:
+    """
+    Scrape a query in the background so the next live search is a cache hit
+
+    Returns 'fresh' (already cached), 'running' (another request started it) or 'started'
+    """
+    age = scraper_manager.get_cache_age(query, platforms)
+    if age is not None and age < scraper_manager.cache_ttl:
+        return 'fresh'
+
+    global refresh_executor
+    key = (canonical_query(query), tuple(sorted(platforms or ())))
+    with refresh_lock:
+        if key in refresh_running:
+            return 'running'
+        refresh_running.add(key)
+        if refresh_executor is None:
+            refresh_executor = ThreadPoolExecutor(Config.JARVIS_INDEX_REFRESH_WORKERS, thread_name_prefix='index-refresh')
+
+    def run():
+        try:
+            scraper_manager.search_all(query=query, platforms=platforms, max_results=max_results)
+        except Exception as e:
+            log.warning("Background refresh failed: %s", e, extra={'query': query})
+        finally:
+            with refresh_lock:
+                refresh_running.discard(key)
+
+    refresh_executor.submit(run)
+    return 'started'
+
+
+def add_next_cursor(response, result, request_state):
+    """Set page.next_cursor (None on the last page)"""
+    page = response['page']
+    page['next_cursor'] = pagination.encode_cursor({
+        'snapshot': result['timestamp'],
+        'offset': page['offset'] + page['returned'],
+        'request': request_state
+    }) if page['has_more'] else None
+
+
+def build_search_response(query, result, filters, sort_by, analytics=None, page_size=None, offset=0,
+                          fields=None, include_analytics=True, compact=True):
+    """
+    Filter, sort and analyze a ScraperManager result into the /api/search document
+
+    Args:
+        page_size: Serialize only `page_size` products starting at `offset` (None = all)
+        fields: Product fields to include (None = all)
+        include_analytics: False for follow-up pages (analytics cover the whole result)
+        compact: Buckets as positions in `products` and no `comparison` copy of analytics
+            (False = the original document, buckets repeating their products)
+
+    Returns:
+        (response dict, filtered and sorted Product list)
+    """
+    # Sort orders, filter matches and analytics are reused across requests for the same cached result
+    session = get_result_sessions().get(result)
+    batch = session.batch
+    with tracing.span('filter_sort'):
+        indices = session.view(filters, sort_by)
+        products = batch.take(indices)
+
+    if include_analytics:
+        with tracing.span('analytics'):
+            analytics = session.summary(filters, precomputed=analytics)
+
+    # Only the requested page is serialized
+    page = indices if page_size is None else indices[offset:offset + page_size]
+
+    # Attach canonical product IDs for listings we've already matched (only those being sent)
+    page_products = products if page_size is None else batch.take(page)
+    with tracing.span('catalog_annotate'):
+        product_catalog.annotate(page_products)
+
+    # Group by platform for frontend (compact buckets hold positions in `products`, not copies)
+    with tracing.span('serialize'):
+        product_dicts = [pagination.project(p, fields) for p in page_products]
+        platform_buckets = batch.platform_positions(page)
+        if not compact:
+            for bucket in platform_buckets:
+                bucket['products'] = [product_dicts[position] for position in bucket['products']]
+
+    # Prepare response
+    response = {
+        'success': True,
+        'query': query,
+        'products': product_dicts,
+        'total': len(products),
+        'filtered_total': len(products),
+        'analytics': analytics,
+        'platformBuckets': platform_buckets,
+        'metadata': {
+            'platforms_searched': result['platforms_searched'],
+            'platforms_succeeded': result['platforms_succeeded'],
+            'platform_stats': result['platform_stats'],
+            'elapsed_time': result['elapsed_time'],
+            'from_cache': result['from_cache'],
+            'timestamp': result['timestamp'],
+            'source': result.get('source', 'live')
+        }
+    }
+    if 'staleness' in result:
+        response['metadata']['staleness'] = result['staleness']
+    if not compact and include_analytics:
+        response['comparison'] = analytics  # For backward compatibility
+
+    if page_size is not None:
+        response['page'] = {
+            'offset': offset,
+            'size': page_size,
+            'returned': len(page),
+            'has_more': offset + len(page) < len(indices)
+        }
+
+    return response, products
+
+
+@app.route('/api/search/batch', methods=['POST'])
+def search_batch():
+    """
+    Search many queries in one request through shared scraper workers
+
+    Request body:
+    {
+        "queries": ["iphone 15", "galaxy s23", "iPhone 15"],  // duplicates are scraped once
+        "platforms": ["Amazon", "Flipkart"],  // Optional, defaults to all
+        "max_results": 10,
+        "use_cache": true,
+        "filters": {...},  // Same as /api/search, applied to every query
+        "sort": "price_asc",
+        "compact": false,  // true = platformBuckets as positions in each result's products
+        "stream": false  // true = one NDJSON line per query as it completes
+    }
+
+    Each result carries `inputs`, the positions in `queries` it answers; queries
+    shorter than 2 characters are listed in `rejected`.
+    """
+    try:
+        data = request.get_json() or {}
+
+        raw_queries = data.get('queries')
+        if not isinstance(raw_queries, list) or not raw_queries:
+            return jsonify({'success': False, 'error': 'queries must be a non-empty list of search strings'}), 400
+
+        if len(raw_queries) > Config.JARVIS_BATCH_MAX_QUERIES:
+            return jsonify({
+                'success': False,
+                'error': f'Too many queries (max {Config.JARVIS_BATCH_MAX_QUERIES})'
+            }), 400
+
+        # Positions of each valid input, keyed the way the manager dedupes
+        queries = []
+        inputs = {}
+        rejected = []
+        for position, query in enumerate(raw_queries):
+            query = query.strip()[:200] if isinstance(query, str) else ''
+            if len(query) < 2:
+                rejected.append(position)
+                continue
+            queries.append(query)
+            inputs.setdefault(canonical_query(query), []).append(position)
+
+        if not queries:
+            return jsonify({'success': False, 'error': 'No valid queries (min 2 characters)'}), 400
+
+        platforms = data.get('platforms')
+        max_results = min(data.get('max_results', 10), 20)
+        use_cache = data.get('use_cache', True)
+        filters = data.get('filters', {})
+        sort_by = data.get('sort', 'price_asc')
+        compact = bool(data.get('compact'))
+
+        log.info("Batch request: %d queries (%d unique)", len(queries), len(inputs),
+                 extra={'platforms': platforms or 'all'})
+
+        for query in queries:
+            refresh_scheduler.record(query, platforms)
+
+        def results():
+            for query, result in scraper_manager.search_batch(queries, platforms, max_results, use_cache):
+                if result['success']:
+                    payload, _ = build_search_response(query, result, filters, sort_by, compact=compact)
+                    payload.pop('comparison', None)
+                else:
+                    payload = result
+                payload['inputs'] = inputs.get(canonical_query(query), [])
+                yield payload
+
+        if data.get('stream'):
+            return Response(
+                stream_with_context(serialization.dumps(payload) + b'\n' for payload in results()),
+                mimetype='application/x-ndjson'
+            )
+
+        batch_start = time.time()
+        payloads = sorted(results(), key=lambda payload: payload['inputs'][:1])
+
+        return json_response({
+            'success': True,
+            'total_queries': len(raw_queries),
+            'unique_queries': len(payloads),
+            'rejected': rejected,
+            'results': payloads,
+            'elapsed_time': round(time.time() - batch_start, 2)
+        })
+
+    except Exception as e:
+        log.exception("Batch search failed")
+        return jsonify({'success': False, 'error': str(e)}), 500
+
+
 @app.route('/api/compare', methods=['POST'])
 def compare_products():
     """
@@ -266,7 +872,7 @@ def compare_products():
     """
     try:
         data = request.get_json()
-        products = data.get('products', [])
+        products = [Product.from_dict(p) for p in data.get('products', [])]
 
         if len(products) < 2:
             return jsonify({'success': False, 'error': 'At least 2 products required'}), 400
@@ -274,111 +880,190 @@ def compare_products():
         # Generate comparison analytics
         analytics = analytics_engine.analyze_products(products)
 
-        # Find similar products
-        similar_groups = product_matcher.group_similar_products(products)
+        # Group via the catalog (already-seen listings skip fuzzy matching)
+        with tracing.span('group_products', products=len(products)):
+            similar_groups = product_catalog.group_products(products)
 
         return jsonify({
             'success': True,
             'analytics': analytics,
             'similar_groups': len(similar_groups),
+            'groups': [
+                {
+                    'product_id': group[0].product_id,
+                    'title': product_catalog.get_product(group[0].product_id)['title'],
+                    'platforms': sorted({p.platform for p in group}),
+                    'count': len(group)
+                }
+                for group in similar_groups
+            ],
             'recommendations': analytics.get('recommendation')
         })
 
     except Exception as e:
-        print(f"❌ Compare error: {e}")
+        log.exception("Compare failed")
         return jsonify({'success': False, 'error': str(e)}), 500
 
 
-def apply_filters(products: list, filters: dict) -> list:
-    """Apply filters to product list"""
-    filtered = products
+@app.route('/api/suggest', methods=['GET'])
+def suggest_queries():
+    """
+    Query suggestions, best first
 
-    # Price range filter
-    if 'min_price' in filters:
-        min_price = filters['min_price']
-        filtered = [p for p in filtered if p.get('price_numeric') and p['price_numeric'] >= min_price]
+    Query params:
+        q: What the user has typed so far
+        limit: Number of suggestions (default and max JARVIS_SUGGEST_TOP_K)
 
-    if 'max_price' in filters:
-        max_price = filters['max_price']
-        filtered = [p for p in filtered if p.get('price_numeric') and p['price_numeric'] <= max_price]
+    Suggestions flagged `cached` can be served without scraping.
+    """
+    limit = min(request.args.get('limit', Config.JARVIS_SUGGEST_TOP_K, type=int), Config.JARVIS_SUGGEST_TOP_K)
+    matches = suggestions.suggest(request.args.get('q', ''), limit)
 
-    # Rating filter
-    if 'min_rating' in filters:
-        min_rating = filters['min_rating']
-        def has_min_rating(product):
-            rating = product.get('rating', 'N/A')
-            if rating == 'N/A':
-                return False
-            try:
-                numeric = float(rating.replace('⭐', '').strip())
-                return numeric >= min_rating
-            except:
-                return False
-        filtered = [p for p in filtered if has_min_rating(p)]
+    ttl = scraper_manager.cache_ttl
+    results = []
+    for text, score in matches:
+        age = scraper_manager.get_cache_age(text)
+        results.append({'query': text, 'score': round(score, 2), 'cached': age is not None and age < ttl})
 
-    # Platform filter
-    if 'platforms' in filters:
-        allowed_platforms = filters['platforms']
-        filtered = [p for p in filtered if p['platform'] in allowed_platforms]
+    return jsonify({'success': True, 'suggestions': results})
 
-    # Availability filter
-    if 'in_stock_only' in filters and filters['in_stock_only']:
-        filtered = [p for p in filtered if p.get('availability') != 'Out of Stock']
 
-    return filtered
+@app.route('/api/history', methods=['GET'])
+def get_price_history():
+    """
+    Downsampled price history
+
+    Query params:
+        product_id: Canonical product id (from search results), or
+        listing: Listing key (e.g. "Amazon:B0CHX1W1XY")
+        platform: Optional platform filter
+        days: Window size in days (default 30), or start/end unix timestamps
+        buckets: Number of points (default 60, max 500)
+    """
+    try:
+        product_id = request.args.get('product_id')
+        listing = request.args.get('listing')
+        if not product_id and not listing:
+            return jsonify({'success': False, 'error': 'product_id or listing is required'}), 400
+
+        end = request.args.get('end', type=int) or int(time.time())
+        start = request.args.get('start', type=int) or end - request.args.get('days', 30, type=int) * 86400
+        buckets = min(request.args.get('buckets', 60, type=int), 500)
+
+        series = price_history.query_series(
+            listing=listing,
+            product_id=product_id,
+            platform=request.args.get('platform'),
+            start=start,
+            end=end,
+            buckets=buckets
+        )
+
+        return jsonify({
+            'success': True,
+            'product_id': product_id,
+            'listing': listing,
+            'product': product_catalog.get_product(product_id) if product_id else None,
+            **series
+        })
 
+    except Exception as e:
+        log.exception("History query failed")
+        return jsonify({'success': False, 'error': str(e)}), 500
 
-def apply_sorting(products: list, sort_by: str) -> list:
-    """Apply sorting to product list"""
-    if sort_by == 'price_asc':
-        return sorted(products, key=lambda x: x.get('price_numeric') or float('inf'))
 
-    elif sort_by == 'price_desc':
-        return sorted(products, key=lambda x: x.get('price_numeric') or 0, reverse=True)
+@app.route('/api/alerts', methods=['POST'])
+def create_alert():
+    """
+    Register a price drop alert
 
-    elif sort_by == 'rating_desc':
-        def get_rating(product):
-            rating = product.get('rating', 'N/A')
-            if rating == 'N/A':
-                return 0
-            try:
-                return float(rating.replace('⭐', '').strip())
-            except:
-                return 0
-        return sorted(products, key=get_rating, reverse=True)
+    Request body:
+    {
+        "target_price": 60000,
+        "query": "iphone 15 128gb",     // or
+        "product_id": "0ef0993894f2",   // canonical id from search results
+        "platforms": ["Amazon", "Flipkart"]  // optional
+    }
+    """
+    try:
+        data = request.get_json() or {}
+
+        if data.get('target_price') is None:
+            return jsonify({'success': False, 'error': 'target_price is required'}), 400
 
-    elif sort_by == 'discount_desc':
-        return sorted(products, key=lambda x: x.get('discount') or 0, reverse=True)
+        try:
+            alert = price_alerts.add_alert(
+                target_price=float(data['target_price']),
+                query=(data.get('query') or '').strip() or None,
+                product_id=data.get('product_id'),
+                platforms=data.get('platforms')
+            )
+        except ValueError as e:
+            return jsonify({'success': False, 'error': str(e)}), 400
 
-    return products
+        return jsonify({'success': True, 'alert': alert.to_dict()}), 201
 
+    except Exception as e:
+        log.exception("Alert registration failed")
+        return jsonify({'success': False, 'error': str(e)}), 500
 
-def group_by_platform(products: list) -> list:
-    """Group products by platform"""
-    platforms = {}
 
-    for product in products:
-        platform = product['platform']
-        if platform not in platforms:
-            platforms[platform] = []
-        platforms[platform].append(product)
+@app.route('/api/alerts', methods=['GET'])
+def list_alerts():
+    """List registered alerts (optionally ?product_id=...)"""
+    alerts = price_alerts.list_alerts(
+        product_id=request.args.get('product_id'),
+        limit=min(request.args.get('limit', 100, type=int), 1000)
+    )
+    return jsonify({'success': True, 'alerts': alerts, 'count': len(alerts)})
 
-    return [
-        {'platform': platform, 'products': prods}
-        for platform, prods in platforms.items()
-    ]
 
+@app.route('/api/alerts/<alert_id>', methods=['DELETE'])
+def delete_alert(alert_id):
+    """Remove a price alert"""
+    if not price_alerts.remove_alert(alert_id):
+        return jsonify({'success': False, 'error': 'Alert not found'}), 404
+    return jsonify({'success': True, 'message': 'Alert removed'})
 
-# Cleanup on exit
-def cleanup():
-    print("\n🧹 JARVIS shutting down...")
-    scraper_manager.cleanup()
-    print("✅ Cleanup complete. JARVIS offline.")
 
-atexit.register(cleanup)
+@app.route('/api/alerts/notifications', methods=['GET'])
+def alert_notifications():
+    """Recently triggered alerts, newest first"""
+    notifications = price_alerts.get_recent(min(request.args.get('limit', 50, type=int), 100))
+    return jsonify({'success': True, 'notifications': notifications, 'count': len(notifications)})
+
+
+_shutdown_done = False
+
+
+def shutdown(timeout: float = None):
+    """
+    Graceful stop: refuse new scrapes, wait for in-flight ones, then close browsers
+    and flush background writers (idempotent; called by the server on worker exit)
+    """
+    global _shutdown_done
+    if _shutdown_done:
+        return
+    _shutdown_done = True
+
+    log.info("JARVIS shutting down")
+    refresh_scheduler.stop()
+    if refresh_executor:
+        refresh_executor.shutdown(wait=False)
+    if not scraper_manager.drain(Config.JARVIS_GRACEFUL_TIMEOUT if timeout is None else timeout):
+        log.warning("Drain timed out with %d scrapes in flight", scraper_manager.active_scrapes)
+    scraper_manager.cleanup()
+    price_history.close()
+    if trace_exporter:
+        trace_exporter.close()
+    log.info("Cleanup complete. JARVIS offline.")
+    shutdown_logging()
 
 
 if __name__ == '__main__':
+    # With the debug reloader, only the serving child process refreshes
+    create_app(start_scheduler=Config.JARVIS_REFRESH_ENABLED and os.environ.get('WERKZEUG_RUN_MAIN') == 'true')
+
     print("=" * 60)
     print("⚡ JARVIS TURBO MODE - PRICE INTELLIGENCE PLATFORM")
     print("=" * 60)
@@ -389,8 +1074,11 @@ if __name__ == '__main__':
     print(f"⚡ SPEED: Images disabled, 15s page load, 20s platform timeout")
     print(f"⚡ MODE: 5 products/platform for speed + reliability")
     print("=" * 60)
-    print("🌐 Server starting on http://localhost:5000")
+    print("🌐 Server starting on http://localhost:5000 (development; use serve.py in production)")
     print("💡 API Docs: http://localhost:5000")
     print("=" * 60)
 
-    app.run(debug=True, host='0.0.0.0', port=5000)
+    try:
+        app.run(debug=True, host='0.0.0.0', port=5000)
+    finally:
+        shutdown()
@@ -2,7 +2,7 @@
 🔥 PROFESSIONAL PRICE COMPARISON API - GOD MODE 🔥
 Real scraping with Playwright - No BS, No demos!
 """
-from flask import Flask, request, jsonify
+from flask import Flask, g, request, jsonify
 from flask_cors import CORS
 from playwright.sync_api import sync_playwright, TimeoutError as PlaywrightTimeout
 import time
@@ -11,51 +11,34 @@ import re
 import random
 from datetime import datetime, timedelta
 import threading
-app = Flask(__name__)
-CORS(app)
-
-
-def parse_price(raw_price: str) -> float:
-    """Convert price strings like '₹54,999.00' to a numeric value."""
-    if not raw_price:
-        return float('inf')
-
-    cleaned = re.sub(r'[^0-9.]', '', raw_price)
-    if not cleaned:
-        return float('inf')
-
-    try:
-        return float(cleaned)
-    except ValueError:
-        return float('inf')
 
+from config import Config
+from utils.product import Product, parse_price, parse_rating, format_price
+from utils.logger import configure_logging, get_logger
+from utils import tracing
 
-def format_price(value: float) -> str:
-    """Format numeric price back to a Rupee string."""
-    if value == float('inf'):
-        return 'N/A'
+configure_logging(Config.JARVIS_LOG_LEVEL, Config.JARVIS_LOG_FORMAT, Config.JARVIS_LOG_SAMPLE_EVERY)
+log = get_logger('app_pro')
 
-    if value >= 100:
-        return f"₹{value:,.0f}"
-
-    return f"₹{value:,.2f}"
+app = Flask(__name__)
+CORS(app)
 
 
-def normalize_rating(raw_rating: str) -> str:
-    """Standardise rating strings to '4.5/5' format."""
-    if not raw_rating or raw_rating in {'N/A', '—'}:
-        return '—'
+@app.before_request
+def start_request_trace():
+    # Request ID for log records (also set on worker-side records via the context)
+    g.trace, g.trace_token = tracing.start_trace((request.headers.get('X-Request-ID') or '')[:64] or None)
 
-    match = re.search(r'(\d+(?:\.\d+)?)', raw_rating)
-    if not match:
-        return raw_rating.strip()
 
-    value = match.group(1)
-    return f"{value}/5"
+@app.teardown_request
+def end_request_trace(error=None):
+    token = g.pop('trace_token', None)
+    if token is not None:
+        tracing.end_trace(token)
 
 
 def build_summary(products):
-    """Create comparison metadata and grouped platform buckets."""
+    """Create comparison metadata and grouped platform buckets (serialized for the API)."""
     if not products:
         return {
             'bestDeal': None,
@@ -65,24 +48,23 @@ def build_summary(products):
 
     by_platform = {}
     for product in products:
-        platform = product.get('platform', 'Marketplace')
-        by_platform.setdefault(platform, []).append(product)
+        by_platform.setdefault(product.platform, []).append(product)
 
     # Ensure each platform list is sorted by price
     for platform_products in by_platform.values():
-        platform_products.sort(key=lambda item: item['priceValue'])
+        platform_products.sort(key=lambda item: item.price)
 
-    best_deal = min(products, key=lambda item: item['priceValue'])
-    all_prices = [item['priceValue'] for item in products]
+    best_deal = min(products, key=lambda item: item.price)
+    all_prices = [item.price for item in products]
 
     platform_cards = []
     for platform, platform_products in by_platform.items():
-        price_values = [item['priceValue'] for item in platform_products]
+        price_values = [item.price for item in platform_products]
         cheapest_product = platform_products[0]
         average_price = sum(price_values) / len(price_values)
         price_min = min(price_values)
         price_max = max(price_values)
-        difference_value = max(0.0, round(cheapest_product['priceValue'] - best_deal['priceValue'], 2))
+        difference_value = max(0.0, round(cheapest_product.price - best_deal.price, 2))
 
         platform_cards.append({
             'platform': platform,
@@ -97,7 +79,9 @@ def build_summary(products):
             'differenceLabel': 'Best price' if difference_value < 1 else format_price(difference_value)
         })
 
-    platform_cards.sort(key=lambda card: card['cheapest']['priceValue'])
+    platform_cards.sort(key=lambda card: card['cheapest'].price)
+    for card in platform_cards:
+        card['cheapest'] = card['cheapest'].to_pro_dict()
 
     platform_buckets = [
         {
@@ -106,10 +90,12 @@ def build_summary(products):
         }
         for platform, items in by_platform.items()
     ]
-    platform_buckets.sort(key=lambda bucket: bucket['products'][0]['priceValue'])
+    platform_buckets.sort(key=lambda bucket: bucket['products'][0].price)
+    for bucket in platform_buckets:
+        bucket['products'] = [item.to_pro_dict() for item in bucket['products']]
 
     comparison = {
-        'bestDeal': best_deal,
+        'bestDeal': best_deal.to_pro_dict(),
         'platforms': platform_cards,
         'priceRange': {
             'min': format_price(min(all_prices)),
@@ -155,7 +141,7 @@ class ProScraper:
             "Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36",
             "Mozilla/5.0 (Windows NT 10.0; Win64; x64; rv:109.0) Gecko/20100101 Firefox/121.0"
         ]
-        print("✅ Professional Scraper initialized with Playwright")
+        log.info("Professional scraper initialized with Playwright")
 
     def safe_wait(self, site_name, min_delay=3, max_delay=6):
         """Respectful delays between requests"""
@@ -165,7 +151,7 @@ class ProScraper:
             elapsed = current_time - self.last_request[site_name]
             if elapsed < min_delay:
                 sleep_time = random.uniform(min_delay, max_delay)
-                print(f"⏳ Waiting {sleep_time:.1f}s before {site_name} request")
+                log.debug("Waiting %.1fs before request", sleep_time, extra={'platform': site_name})
                 time.sleep(sleep_time)
 
         self.last_request[site_name] = time.time()
@@ -173,13 +159,13 @@ class ProScraper:
     def scrape_amazon(self, query):
         """Scrape Amazon with Playwright - REAL DATA"""
         if not self.rate_limiter.is_allowed('amazon'):
-            print("⚠️ Rate limit for Amazon - skipping")
+            log.warning("Rate limit reached - skipping", extra={'platform': 'Amazon'})
             return []
 
         self.safe_wait('amazon', 3, 6)
 
         try:
-            print(f"🔍 Scraping Amazon for: {query}")
+            log.info("Scraping", extra={'platform': 'Amazon', 'query': query})
 
             with sync_playwright() as p:
                 browser = p.chromium.launch(
@@ -210,7 +196,7 @@ class ProScraper:
                     page.goto(url, wait_until='domcontentloaded')
                     page.wait_for_load_state('networkidle', timeout=15000)
                 except PlaywrightTimeout:
-                    print("  ⚠️ Amazon navigation hit timeout, trying lighter wait")
+                    log.warning("Navigation timed out, trying lighter wait", extra={'platform': 'Amazon'})
                     page.wait_for_load_state('domcontentloaded', timeout=10000)
 
                 time.sleep(1.5)
@@ -222,7 +208,7 @@ class ProScraper:
                 page.wait_for_selector('div[data-component-type="s-search-result"], div.s-result-item[data-asin]', timeout=10000)
                 items = page.query_selector_all('div.s-result-item[data-asin]:not([data-asin=""])')
 
-                print(f"📦 Found {len(items)} items on page")
+                log.debug("Found %d items on page", len(items), extra={'platform': 'Amazon'})
 
                 for item in items[:8]:  # Top 8 results
                     try:
@@ -246,16 +232,15 @@ class ProScraper:
                                     break
 
                         price_value = parse_price(price)
-                        if price_value == float('inf'):
+                        if price_value is None:
                             continue
-                        formatted_price = format_price(price_value)
 
                         # Rating
-                        rating = "—"
+                        rating = None
                         rating_elem = item.query_selector('.a-icon-star-small span, .a-icon-alt')
                         if rating_elem:
                             rating_text = rating_elem.get_attribute('textContent') or rating_elem.inner_text()
-                            rating = normalize_rating(rating_text)
+                            rating = parse_rating(rating_text)
 
                         # URL
                         product_url = "#"
@@ -272,38 +257,37 @@ class ProScraper:
                             image = img_elem.get_attribute('src') or ""
 
                         if title and len(title) > 5:
-                            products.append({
-                                'title': title[:100],  # Limit title length
-                                'price': formatted_price,
-                                'priceValue': price_value,
-                                'rating': rating,
-                                'url': product_url,
-                                'platform': 'Amazon',
-                                'image': image
-                            })
-                            print(f"  ✓ Added: {title[:50]}...")
+                            products.append(Product(
+                                title=title[:100],  # Limit title length
+                                platform='Amazon',
+                                price=price_value,
+                                rating=rating,
+                                url=product_url,
+                                image=image
+                            ))
+                            log.debug("Added: %s", title[:50], extra={'platform': 'Amazon', 'sample': 'amazon.item'})
                     except Exception as e:
-                        print(f"  ⚠️ Item parse error: {e}")
+                        log.debug("Item parse error: %s", e, extra={'platform': 'Amazon', 'sample': 'amazon.parse_error'})
                         continue
 
                 browser.close()
-                print(f"✅ Amazon: Successfully extracted {len(products)} products")
+                log.info("Extracted %d products", len(products), extra={'platform': 'Amazon'})
                 return products
 
         except Exception as e:
-            print(f"❌ Amazon error: {e}")
+            log.error("Scrape failed: %s", e, extra={'platform': 'Amazon'})
             return []
 
     def scrape_flipkart(self, query):
         """Scrape Flipkart with Playwright - REAL DATA"""
         if not self.rate_limiter.is_allowed('flipkart'):
-            print("⚠️ Rate limit for Flipkart - skipping")
+            log.warning("Rate limit reached - skipping", extra={'platform': 'Flipkart'})
             return []
 
         self.safe_wait('flipkart', 4, 7)
 
         try:
-            print(f"🔍 Scraping Flipkart for: {query}")
+            log.info("Scraping", extra={'platform': 'Flipkart', 'query': query})
 
             with sync_playwright() as p:
                 browser = p.chromium.launch(
@@ -328,7 +312,7 @@ class ProScraper:
                     page.goto(url, wait_until='domcontentloaded')
                     page.wait_for_load_state('networkidle', timeout=15000)
                 except PlaywrightTimeout:
-                    print("  ⚠️ Flipkart navigation hit timeout, falling back to domcontentloaded")
+                    log.warning("Navigation timed out, falling back to domcontentloaded", extra={'platform': 'Flipkart'})
                     page.wait_for_load_state('domcontentloaded', timeout=10000)
 
                 time.sleep(2)
@@ -340,10 +324,10 @@ class ProScraper:
                     page.wait_for_selector('div[data-id]', timeout=10000)
                     items = page.query_selector_all('div[data-id]')
                 except PlaywrightTimeout:
-                    print("  ⚠️ Could not find data-id containers, trying legacy classes")
+                    log.warning("No data-id containers, trying legacy classes", extra={'platform': 'Flipkart'})
                     items = page.query_selector_all('div[class*="_1AtVbE"], div[class*="_13oc-S"], div[class*="_2kHMtA"]')
 
-                print(f"📦 Found {len(items)} potential items on page")
+                log.debug("Found %d potential items on page", len(items), extra={'platform': 'Flipkart'})
 
                 for item in items[:8]:
                     try:
@@ -366,17 +350,16 @@ class ProScraper:
                                     break
 
                         price_value = parse_price(price)
-                        if price_value == float('inf'):
+                        if price_value is None:
                             continue
-                        formatted_price = format_price(price_value)
 
                         # Rating
-                        rating = "—"
+                        rating = None
                         for selector in ['._3LWZlK', 'div[class*="_3LWZlK"]', '.XQDdHH']:
                             rating_elem = item.query_selector(selector)
                             if rating_elem:
-                                rating = normalize_rating(rating_elem.inner_text())
-                                if rating:
+                                rating = parse_rating(rating_elem.inner_text())
+                                if rating is not None:
                                     break
 
                         # URL
@@ -394,26 +377,25 @@ class ProScraper:
                             image = img_elem.get_attribute('src') or ""
 
                         if title and len(title) > 5:
-                            products.append({
-                                'title': title[:100],
-                                'price': formatted_price,
-                                'priceValue': price_value,
-                                'rating': rating,
-                                'url': product_url,
-                                'platform': 'Flipkart',
-                                'image': image
-                            })
-                            print(f"  ✓ Added: {title[:50]}...")
+                            products.append(Product(
+                                title=title[:100],
+                                platform='Flipkart',
+                                price=price_value,
+                                rating=rating,
+                                url=product_url,
+                                image=image
+                            ))
+                            log.debug("Added: %s", title[:50], extra={'platform': 'Flipkart', 'sample': 'flipkart.item'})
                     except Exception as e:
-                        print(f"  ⚠️ Item parse error: {e}")
+                        log.debug("Item parse error: %s", e, extra={'platform': 'Flipkart', 'sample': 'flipkart.parse_error'})
                         continue
 
                 browser.close()
-                print(f"✅ Flipkart: Successfully extracted {len(products)} products")
+                log.info("Extracted %d products", len(products), extra={'platform': 'Flipkart'})
                 return products
 
         except Exception as e:
-            print(f"❌ Flipkart error: {e}")
+            log.error("Scrape failed: %s", e, extra={'platform': 'Flipkart'})
             return []
 
 # Global scraper
@@ -432,9 +414,7 @@ def search_products():
         if len(query) < 2 or len(query) > 100:
             return jsonify({'error': 'Query must be 2-100 characters'}), 400
 
-        print(f"\n{'='*60}")
-        print(f"🔥 PROFESSIONAL SEARCH: {query}")
-        print(f"{'='*60}\n")
+        log.info("Search request", extra={'query': query})
 
         all_products = []
 
@@ -443,7 +423,7 @@ def search_products():
             amazon_products = scraper.scrape_amazon(query)
             all_products.extend(amazon_products)
         except Exception as e:
-            print(f"Amazon failed: {e}")
+            log.error("Search failed: %s", e, extra={'platform': 'Amazon'})
 
         # Small delay between sites
         time.sleep(random.uniform(2, 4))
@@ -453,18 +433,18 @@ def search_products():
             flipkart_products = scraper.scrape_flipkart(query)
             all_products.extend(flipkart_products)
         except Exception as e:
-            print(f"Flipkart failed: {e}")
+            log.error("Search failed: %s", e, extra={'platform': 'Flipkart'})
 
-        all_products = [product for product in all_products if product.get('priceValue') is not None]
-        all_products.sort(key=lambda x: x['priceValue'])
+        all_products = [product for product in all_products if product.price is not None]
+        all_products.sort(key=lambda x: x.price)
 
         comparison, platform_buckets = build_summary(all_products)
 
-        print(f"\n✅ TOTAL: {len(all_products)} products found\n")
+        log.info("Search completed: %d products", len(all_products), extra={'query': query})
 
         return jsonify({
             'success': True,
-            'products': all_products,
+            'products': [product.to_pro_dict() for product in all_products],
             'total': len(all_products),
             'query': query,
             'comparison': comparison,
@@ -474,7 +454,7 @@ def search_products():
         })
 
     except Exception as e:
-        print(f"❌ Error: {e}")
+        log.exception("Search failed")
         return jsonify({'error': 'Search failed. Please try again.'}), 500
 
 @app.route('/api/health', methods=['GET'])
@@ -503,6 +483,16 @@ def home():
         }
     })
 
+def create_app(workers: int = 1):
+    """WSGI app for serve.py (workers is accepted for a uniform factory signature)"""
+    return app
+
+
+def shutdown(timeout: float = None):
+    """Playwright browsers are opened and closed per search, so there is nothing to drain"""
+    log.info("Shutting down")
+
+
 if __name__ == '__main__':
     print("\n" + "="*70)
     print("🔥" * 35)
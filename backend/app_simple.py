@@ -9,6 +9,12 @@ import json
 import re
 import time
 
+from config import Config
+from utils.logger import configure_logging, get_logger
+
+configure_logging(Config.JARVIS_LOG_LEVEL, Config.JARVIS_LOG_FORMAT, Config.JARVIS_LOG_SAMPLE_EVERY)
+log = get_logger('app_simple')
+
 app = Flask(__name__)
 CORS(app)
 
@@ -17,7 +23,7 @@ class SimpleScraper:
 
     def search_amazon(self, query):
         """Mock Amazon results for testing"""
-        print(f"🔍 Searching Amazon for: {query}")
+        log.info("Searching", extra={'platform': 'Amazon', 'query': query})
         return [
             {
                 'title': f'{query} - Sample Product 1',
@@ -39,7 +45,7 @@ class SimpleScraper:
 
     def search_flipkart(self, query):
         """Mock Flipkart results for testing"""
-        print(f"🔍 Searching Flipkart for: {query}")
+        log.info("Searching", extra={'platform': 'Flipkart', 'query': query})
         return [
             {
                 'title': f'{query} - Flipkart Special',
@@ -63,7 +69,7 @@ def search_products():
         if not query:
             return jsonify({'error': 'Query is required'}), 400
 
-        print(f"🔍 Search request for: {query}")
+        log.info("Search request", extra={'query': query})
 
         # Get results from both platforms
         all_products = []
@@ -99,6 +105,16 @@ def home():
         }
     })
 
+def create_app(workers: int = 1):
+    """WSGI app for serve.py (workers is accepted for a uniform factory signature)"""
+    return app
+
+
+def shutdown(timeout: float = None):
+    """Demo mode holds no browsers"""
+    log.info("Shutting down")
+
+
 if __name__ == '__main__':
     print("🚀 Starting Price Comparison API (Demo Mode)...")
     print("⚠️  Showing sample data until driver is fixed")
@@ -0,0 +1,93 @@
+#!/usr/bin/env python3
+"""
+Startup benchmark: time for a fresh interpreter to import an app module and run create_app()
+(what every new server worker pays before it can take requests)
+
+Usage:
+    python bench_startup.py                 # app_jarvis, 10 runs
+    python bench_startup.py --runs 20 --app app_jarvis --imports 15
+"""
+import argparse
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+
+BACKEND_DIR = os.path.dirname(os.path.abspath(__file__))
+
+PROBE = """
+import time
+start = time.perf_counter()
+import {app}
+imported = time.perf_counter()
+{app}.create_app(workers=1, **({kwargs}))
+ready = time.perf_counter()
+print(f"{{imported - start:.6f}} {{ready - start:.6f}}")
+import os
+os._exit(0)
+"""
+
+
+def run_once(app: str, env: dict) -> tuple:
+    kwargs = "{'start_scheduler': False}" if app == 'app_jarvis' else '{}'
+    output = subprocess.run(
+        [sys.executable, '-c', PROBE.format(app=app, kwargs=kwargs)],
+        cwd=BACKEND_DIR, env=env, capture_output=True, text=True, check=True
+    ).stdout.split()
+    return float(output[-2]), float(output[-1])
+
+
+def slowest_imports(app: str, env: dict, top: int) -> list:
+    """(cumulative seconds, module) for the app module's slowest direct imports, from python -X importtime"""
+    result = subprocess.run(
+        [sys.executable, '-X', 'importtime', '-c', f'import {app}'],
+        cwd=BACKEND_DIR, env=env, capture_output=True, text=True
+    )
+
+    # Children are printed before their parent, indented two more spaces
+    rows = []
+    for line in result.stderr.splitlines():
+        if not line.startswith('import time:') or 'cumulative' in line:
+            continue
+        _, cumulative, module = line[len('import time:'):].split('|')
+        depth = (len(module) - len(module.lstrip())) // 2
+        if depth == 0:
+            if module.strip() == app:
+                break
+            rows = []
+        elif depth == 1:
+            rows.append((int(cumulative) / 1e6, module.strip()))
+
+    return sorted(rows, reverse=True)[:top]
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Measure cold import + create_app() time')
+    parser.add_argument('--app', default='app_jarvis')
+    parser.add_argument('--runs', type=int, default=10)
+    parser.add_argument('--imports', type=int, default=10, help='Show the N slowest imports made by the app module')
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as data_dir:
+        # Scratch data dir so the benchmark doesn't touch the real catalog and history
+        env = dict(os.environ, JARVIS_DATA_DIR=data_dir, JARVIS_LOG_LEVEL='WARNING', JARVIS_REFRESH_ENABLED='0')
+        run_once(args.app, env)  # Warm the OS file cache and bytecode
+        timings = [run_once(args.app, env) for _ in range(args.runs)]
+        imports = slowest_imports(args.app, env, args.imports) if args.imports else []
+
+    imported = [t[0] * 1000 for t in timings]
+    ready = [t[1] * 1000 for t in timings]
+
+    print(f"{args.app}: {args.runs} cold starts")
+    print(f"  import        median {statistics.median(imported):7.1f} ms   min {min(imported):7.1f} ms   max {max(imported):7.1f} ms")
+    print(f"  create_app()  median {statistics.median(ready):7.1f} ms   min {min(ready):7.1f} ms   max {max(ready):7.1f} ms")
+
+    if imports:
+        print(f"\nSlowest imports made by {args.app} (cumulative):")
+        for seconds, module in imports:
+            print(f"  {seconds * 1000:7.1f} ms  {module}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,136 @@
+"""
+Runtime configuration for the JARVIS backend
+Every setting can be overridden with an environment variable of the same name
+"""
+import os
+
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+
+
+class Config:
+    """Default settings (override via environment variables)"""
+
+    # Storage
+    JARVIS_DATA_DIR = os.environ.get('JARVIS_DATA_DIR', os.path.join(BASE_DIR, 'data'))
+    JARVIS_HISTORY_PATH = os.environ.get('JARVIS_HISTORY_PATH', os.path.join(JARVIS_DATA_DIR, 'history.db'))
+    # SQLite databases shared by the server's worker processes (default: the history database)
+    JARVIS_CATALOG_PATH = os.environ.get('JARVIS_CATALOG_PATH', JARVIS_HISTORY_PATH)
+    JARVIS_ALERTS_PATH = os.environ.get('JARVIS_ALERTS_PATH', JARVIS_HISTORY_PATH)
+
+    # Local file that triggered price alerts are appended to (empty = console only)
+    JARVIS_ALERT_SINK_PATH = os.environ.get('JARVIS_ALERT_SINK_PATH', os.path.join(JARVIS_DATA_DIR, 'notifications.jsonl'))
+
+    # Logging: level, 'text' or 'json' output, and 1-in-N sampling of per-item messages
+    JARVIS_LOG_LEVEL = os.environ.get('JARVIS_LOG_LEVEL', 'INFO')
+    JARVIS_LOG_FORMAT = os.environ.get('JARVIS_LOG_FORMAT', 'text')
+    JARVIS_LOG_SAMPLE_EVERY = int(os.environ.get('JARVIS_LOG_SAMPLE_EVERY', 100))
+
+    # Platforms to register (scrapers/registry.py names); each is imported on its first search
+    JARVIS_PLATFORMS = os.environ.get('JARVIS_PLATFORMS', 'Amazon,Flipkart,eBay,Snapdeal')
+
+    # Browsers per platform (concurrent searches borrow one instead of sharing a driver)
+    JARVIS_BROWSERS_PER_PLATFORM = int(os.environ.get('JARVIS_BROWSERS_PER_PLATFORM', 2))
+
+    # Production server (serve.py): gunicorn workers x threads on POSIX, waitress threads on Windows
+    JARVIS_BIND = os.environ.get('JARVIS_BIND', '0.0.0.0:5000')
+    JARVIS_WORKERS = int(os.environ.get('JARVIS_WORKERS', 0))  # 0 = one per core, max 4
+    JARVIS_THREADS = int(os.environ.get('JARVIS_THREADS', 8))
+    JARVIS_WORKER_TIMEOUT = int(os.environ.get('JARVIS_WORKER_TIMEOUT', 120))
+    # Seconds to wait for in-flight scrapes on shutdown before closing browsers
+    JARVIS_GRACEFUL_TIMEOUT = int(os.environ.get('JARVIS_GRACEFUL_TIMEOUT', 30))
+    # Browsers per platform shared by all workers (0 = JARVIS_BROWSERS_PER_PLATFORM in every worker)
+    JARVIS_BROWSER_BUDGET = int(os.environ.get('JARVIS_BROWSER_BUDGET', 0))
+
+    # Max queries accepted by /api/search/batch
+    JARVIS_BATCH_MAX_QUERIES = int(os.environ.get('JARVIS_BATCH_MAX_QUERIES', 50))
+
+    # Request tracing: export every finished trace as Chrome trace events to a local collector file
+    JARVIS_TRACE_EXPORT = os.environ.get('JARVIS_TRACE_EXPORT', '0') == '1'
+    JARVIS_TRACE_PATH = os.environ.get('JARVIS_TRACE_PATH', os.path.join(JARVIS_DATA_DIR, 'traces.json'))
+
+    # Per-request sampling profiler for /api/search (?profile=1 or X-Profile: 1); off = no overhead
+    JARVIS_PROFILE_ENABLED = os.environ.get('JARVIS_PROFILE_ENABLED', '0') == '1'
+    JARVIS_PROFILE_INTERVAL_MS = float(os.environ.get('JARVIS_PROFILE_INTERVAL_MS', 5))
+    JARVIS_PROFILE_DIR = os.environ.get('JARVIS_PROFILE_DIR', os.path.join(JARVIS_DATA_DIR, 'profiles'))
+    JARVIS_PROFILE_KEEP = int(os.environ.get('JARVIS_PROFILE_KEEP', 50))
+
+    # Token for /api/admin/* endpoints (X-Admin-Token); empty = admin endpoints disabled
+    JARVIS_ADMIN_TOKEN = os.environ.get('JARVIS_ADMIN_TOKEN', '')
+
+    # Per-platform circuit breaker: skip a platform after this many consecutive failed or empty
+    # scrapes, then probe it again after the reset interval
+    JARVIS_BREAKER_FAILURES = int(os.environ.get('JARVIS_BREAKER_FAILURES', 5))
+    JARVIS_BREAKER_RESET_SECONDS = float(os.environ.get('JARVIS_BREAKER_RESET_SECONDS', 60))
+
+    # Page-load and result waits adapt to each platform's recent latency (percentile * margin),
+    # capped at JARVIS_TIMEOUT_MAX and by what is left of the request deadline
+    JARVIS_REQUEST_DEADLINE = float(os.environ.get('JARVIS_REQUEST_DEADLINE', 25))
+    JARVIS_TIMEOUT_PERCENTILE = float(os.environ.get('JARVIS_TIMEOUT_PERCENTILE', 95))
+    JARVIS_TIMEOUT_MARGIN = float(os.environ.get('JARVIS_TIMEOUT_MARGIN', 1.5))
+    JARVIS_TIMEOUT_MAX = float(os.environ.get('JARVIS_TIMEOUT_MAX', 30))
+
+    # Hedged scrapes: if a platform hasn't answered by its p90 latency, race a second pooled
+    # browser (needs JARVIS_BROWSERS_PER_PLATFORM >= 2); at most this fraction of scrapes is hedged
+    JARVIS_HEDGE_ENABLED = os.environ.get('JARVIS_HEDGE_ENABLED', '0') == '1'
+    JARVIS_HEDGE_PERCENTILE = float(os.environ.get('JARVIS_HEDGE_PERCENTILE', 90))
+    JARVIS_HEDGE_BUDGET = float(os.environ.get('JARVIS_HEDGE_BUDGET', 0.1))
+
+    # Browser recycling: a fresh driver after this many page loads, or once chromedriver and its
+    # browser use more than JARVIS_DRIVER_MAX_RSS_MB (needs psutil; checked every few loads); 0 disables
+    JARVIS_DRIVER_MAX_NAVIGATIONS = int(os.environ.get('JARVIS_DRIVER_MAX_NAVIGATIONS', 200))
+    JARVIS_DRIVER_MAX_RSS_MB = float(os.environ.get('JARVIS_DRIVER_MAX_RSS_MB', 1024))
+    JARVIS_DRIVER_CHECK_EVERY = int(os.environ.get('JARVIS_DRIVER_CHECK_EVERY', 10))
+
+    # Cached results that keep pre-built sort orders and per-filter analytics for re-sort/re-filter requests
+    JARVIS_RESULT_SESSIONS = int(os.environ.get('JARVIS_RESULT_SESSIONS', 128))
+
+    # /api/suggest prefix index over past searches and scraped titles
+    JARVIS_SUGGEST_TOP_K = int(os.environ.get('JARVIS_SUGGEST_TOP_K', 10))
+    JARVIS_SUGGEST_MAX_TERMS = int(os.environ.get('JARVIS_SUGGEST_MAX_TERMS', 20000))
+
+    # Full-text index of scraped listings behind /api/search "source": "index"
+    JARVIS_INDEX_MAX_DOCS = int(os.environ.get('JARVIS_INDEX_MAX_DOCS', 50000))
+    JARVIS_INDEX_REFRESH_WORKERS = int(os.environ.get('JARVIS_INDEX_REFRESH_WORKERS', 2))
+    # Seconds a cursor can keep paging through an index answer's hit list
+    JARVIS_INDEX_SNAPSHOT_TTL = int(os.environ.get('JARVIS_INDEX_SNAPSHOT_TTL', 300))
+
+    # Cross-platform grouping in /api/search
+    JARVIS_GROUP_BUDGET_MS = float(os.environ.get('JARVIS_GROUP_BUDGET_MS', 150))
+
+    # Background refresh of popular and alert-watched queries
+    JARVIS_REFRESH_ENABLED = os.environ.get('JARVIS_REFRESH_ENABLED', '1') == '1'
+    JARVIS_REFRESH_INTERVAL = float(os.environ.get('JARVIS_REFRESH_INTERVAL', 5))
+    JARVIS_REFRESH_TOP_N = int(os.environ.get('JARVIS_REFRESH_TOP_N', 50))
+    JARVIS_REFRESH_MIN_SCORE = float(os.environ.get('JARVIS_REFRESH_MIN_SCORE', 2))
+    JARVIS_REFRESH_BROWSER_BUDGET = int(os.environ.get('JARVIS_REFRESH_BROWSER_BUDGET', 2))
+    JARVIS_REFRESH_PLATFORM_RPM = float(os.environ.get('JARVIS_REFRESH_PLATFORM_RPM', 6))
+    JARVIS_REFRESH_MAX_ACTIVE = int(os.environ.get('JARVIS_REFRESH_MAX_ACTIVE', 0))
+    # Optional off-peak window in local hours, e.g. "1-7" (empty = whenever traffic is idle)
+    JARVIS_REFRESH_HOURS = os.environ.get('JARVIS_REFRESH_HOURS', '')
+
+    @classmethod
+    def refresh_hours(cls):
+        """Parse JARVIS_REFRESH_HOURS into a (start, end) tuple (None if unset)"""
+        if not cls.JARVIS_REFRESH_HOURS:
+            return None
+        start, end = cls.JARVIS_REFRESH_HOURS.split('-')
+        return int(start), int(end)
+
+    @classmethod
+    def workers(cls) -> int:
+        """Server worker processes (JARVIS_WORKERS, or one per core up to 4)"""
+        if cls.JARVIS_WORKERS > 0:
+            return cls.JARVIS_WORKERS
+        return max(1, min(4, os.cpu_count() or 1))
+
+    @classmethod
+    def browsers_per_worker(cls, workers: int) -> int:
+        """Each worker's share of JARVIS_BROWSER_BUDGET (at least one browser per platform)"""
+        if cls.JARVIS_BROWSER_BUDGET <= 0:
+            return cls.JARVIS_BROWSERS_PER_PLATFORM
+        return max(1, cls.JARVIS_BROWSER_BUDGET // max(1, workers))
+
+    @classmethod
+    def platforms(cls) -> list:
+        """JARVIS_PLATFORMS as a list"""
+        return [name for name in cls.JARVIS_PLATFORMS.split(',') if name.strip()]
@@ -1,7 +1,8 @@
 """
 Amazon India scraper with advanced product extraction
 """
-from .base_scraper import BaseScraper
+from .base_scraper import BaseScraper, ScrapeCancelled
+from utils.product import Product, Availability
 from selenium.webdriver.common.by import By
 from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.support import expected_conditions as EC
@@ -28,36 +29,39 @@ class AmazonScraper(BaseScraper):
             self.safe_wait(0.5, 1)  # ⚡ Reduced delay
 
             search_url = f"{self.base_url}/s?k={query.replace(' ', '+')}"
-            print(f"⚡ {self.platform_name}: TURBO searching...")
+            self.log.debug("Searching", extra={'query': query})
 
-            self.driver.get(search_url)
+            self.navigate(search_url)
 
-            # Wait for results with balanced timeout
+            # Wait for results (10s until the platform's own latency is known)
             try:
-                WebDriverWait(self.driver, 10).until(
-                    EC.presence_of_element_located((By.CSS_SELECTOR, "[data-component-type='s-search-result']"))
-                )
-            except TimeoutException:
-                print(f"⚠️ {self.platform_name}: Timeout waiting for results")
+                self.wait_for("[data-component-type='s-search-result']", 10)
+            except TimeoutException as e:
+                self.record_error(e)
+                self.log.warning("Timeout waiting for results")
                 return []
 
             products = []
-            product_elements = self.driver.find_elements(By.CSS_SELECTOR, "[data-component-type='s-search-result']")
-
-            # ⚡ Only process first 5 for speed
-            for element in product_elements[:min(max_results, 5)]:
-                try:
-                    product = self._extract_product(element)
-                    if product:
-                        products.append(product)
-                except Exception as e:
-                    continue
-
-            print(f"⚡ {self.platform_name}: {len(products)} products in TURBO mode")
+            with self.phase('extract'):
+                product_elements = self.driver.find_elements(By.CSS_SELECTOR, "[data-component-type='s-search-result']")
+
+                # ⚡ Only process first 5 for speed
+                for element in product_elements[:min(max_results, 5)]:
+                    try:
+                        product = self._extract_product(element)
+                        if product:
+                            products.append(product)
+                    except Exception as e:
+                        continue
+
+            self.log.info("Extracted %d products", len(products))
             return products
 
+        except ScrapeCancelled:
+            raise
         except Exception as e:
-            print(f"❌ {self.platform_name}: Error - {e}")
+            self.record_error(e)
+            self.log.error("Search failed: %s", e)
             return []
 
     def _extract_product(self, element):
@@ -97,13 +101,13 @@ class AmazonScraper(BaseScraper):
                 pass
 
         # Rating
-        rating = "N/A"
+        rating = None
         try:
             rating_elem = element.find_element(By.CSS_SELECTOR, ".a-icon-alt")
             rating_text = rating_elem.get_attribute("textContent")
             if "out of" in rating_text:
-                rating = rating_text.split()[0] + "⭐"
-        except NoSuchElementException:
+                rating = float(rating_text.split()[0])
+        except (NoSuchElementException, ValueError):
             pass
 
         # Image
@@ -115,11 +119,11 @@ class AmazonScraper(BaseScraper):
             pass
 
         # Availability
-        availability = "In Stock"
+        availability = Availability.IN_STOCK
         try:
             availability_elem = element.find_element(By.CSS_SELECTOR, ".a-color-price")
             if "unavailable" in availability_elem.text.lower():
-                availability = "Out of Stock"
+                availability = Availability.OUT_OF_STOCK
         except NoSuchElementException:
             pass
 
@@ -137,14 +141,18 @@ class AmazonScraper(BaseScraper):
         if title == "N/A" or price == "N/A":
             return None
 
-        return {
-            'title': title,
-            'price': price,
-            'price_numeric': price_numeric,
-            'rating': rating,
-            'url': url,
-            'platform': self.platform_name,
-            'image': image_url,
-            'availability': availability,
-            'discount': discount
-        }
+        # ASIN (stable listing id)
+        listing_id = element.get_attribute("data-asin") or None
+
+        return Product(
+            title=title,
+            platform=self.platform_name,
+            price=price_numeric,
+            price_text=price,
+            rating=rating,
+            discount=discount,
+            url=url,
+            image=image_url,
+            availability=availability,
+            listing_id=listing_id
+        )
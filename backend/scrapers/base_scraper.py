@@ -3,6 +3,7 @@ Base scraper class for all e-commerce platforms
 Provides common functionality and interface for platform-specific scrapers
 """
 from abc import ABC, abstractmethod
+from contextlib import contextmanager
 from selenium import webdriver
 from selenium.webdriver.chrome.options import Options
 from selenium.webdriver.chrome.service import Service
@@ -10,21 +11,55 @@ from selenium.webdriver.common.by import By
 from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.support import expected_conditions as EC
 from selenium.common.exceptions import TimeoutException, NoSuchElementException
-from webdriver_manager.chrome import ChromeDriverManager
 import time
 import random
 from datetime import datetime, timedelta
 import threading
 
+from utils.product import parse_price
+from utils.metrics import SCRAPE_PHASE_SECONDS, SCRAPE_ERRORS, THROTTLES, DRIVER_RECYCLES
+from utils.tracing import span
+from utils.timeouts import TIMEOUTS
+from utils.logger import get_logger
+from .driver_lifecycle import (
+    psutil, is_dead_session, call_with_timeout, owned_env, service_pid, browser_processes, rss_mb,
+    kill_processes, reap_orphans
+)
+
+
+class ScrapeCancelled(Exception):
+    """The manager no longer needs this scrape (a hedged twin finished first)"""
+
 
 class BaseScraper(ABC):
     """Abstract base class for all platform scrapers"""
 
+    # Driver recycling (see configure_lifecycle)
+    MAX_NAVIGATIONS = 200  # Fresh browser after this many page loads (0 = never)
+    MAX_RSS_MB = 1024  # ... or once chromedriver + browser use more memory than this (0 = never)
+    MEMORY_CHECK_EVERY = 10  # Navigations between memory checks
+    PROBE_TIMEOUT = 2.0  # Seconds a live browser takes to answer a trivial script
+    QUIT_TIMEOUT = 5.0
+
+    def configure_lifecycle(self, max_navigations=None, max_rss_mb=None, memory_check_every=None):
+        """Override the recycling limits for this instance"""
+        if max_navigations is not None:
+            self.MAX_NAVIGATIONS = max_navigations
+        if max_rss_mb is not None:
+            self.MAX_RSS_MB = max_rss_mb
+        if memory_check_every is not None:
+            self.MEMORY_CHECK_EVERY = max(1, memory_check_every)
+
     def __init__(self, platform_name, base_url):
         self.platform_name = platform_name
         self.base_url = base_url
+        self.log = get_logger(f"scrapers.{platform_name.lower()}", platform=platform_name)
         self.driver = None
+        self.driver_pid = None  # chromedriver process, killed if quit() doesn't clean up
+        self.navigations = 0  # Page loads by the current driver
+        self.recycles = 0
         self.last_request_time = None
+        self.cancel_event = None  # Set by the manager while a hedged twin may win the race
         self.user_agents = [
             "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36",
             "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/119.0.0.0 Safari/537.36",
@@ -38,6 +73,8 @@ class BaseScraper(ABC):
         if self.driver:
             return
 
+        reap_orphans()
+
         chrome_options = Options()
 
         # SPEED OPTIMIZATIONS - JARVIS TURBO MODE
@@ -83,8 +120,13 @@ class BaseScraper(ABC):
         chrome_options.add_experimental_option("prefs", prefs)
 
         try:
-            service = Service(ChromeDriverManager().install())
-            self.driver = webdriver.Chrome(service=service, options=chrome_options)
+            with self.phase('driver_setup'):
+                # Imported on first browser launch (it pulls in requests and friends)
+                from webdriver_manager.chrome import ChromeDriverManager
+                service = Service(ChromeDriverManager().install(), env=owned_env())
+                self.driver = webdriver.Chrome(service=service, options=chrome_options)
+            self.driver_pid = service_pid(self.driver)
+            self.navigations = 0
 
             # Hide webdriver property
             self.driver.execute_script("Object.defineProperty(navigator, 'webdriver', {get: () => undefined})")
@@ -93,11 +135,15 @@ class BaseScraper(ABC):
             self.driver.set_page_load_timeout(15)  # ⚡ 15s max (balanced)
             self.driver.implicitly_wait(5)  # ⚡ 5s max (balanced)
 
-            print(f"⚡ {self.platform_name}: TURBO driver initialized")
+            self.log.info("Driver initialized")
 
+        except ScrapeCancelled:
+            raise
         except Exception as e:
-            print(f"❌ {self.platform_name}: Driver setup failed - {e}")
-            self.driver = None
+            self.record_error(e)
+            self.log.error("Driver setup failed: %s", e)
+            if self.driver:
+                self._teardown_driver()
 
     def safe_wait(self, min_delay=0.5, max_delay=1.5):
         """TURBO MODE: Minimal delays for speed"""
@@ -106,32 +152,147 @@ class BaseScraper(ABC):
         if self.last_request_time:
             time_since_last = current_time - self.last_request_time
             if time_since_last < min_delay:
+                THROTTLES.inc(platform=self.platform_name, source='scraper')
                 sleep_time = random.uniform(min_delay, max_delay)
                 time.sleep(sleep_time)
 
         self.last_request_time = time.time()
 
+    @contextmanager
+    def phase(self, name):
+        """Time a scrape phase (navigate, wait, extract...) into the phase histogram, the request trace
+        and the adaptive timeouts"""
+        self.check_cancelled()
+        start = time.perf_counter()
+        timed_out = False
+        cancelled = False
+        try:
+            with span(f"{self.platform_name}.{name}"):
+                yield
+        except TimeoutException:
+            timed_out = True
+            raise
+        except ScrapeCancelled:
+            cancelled = True
+            raise
+        finally:
+            elapsed = time.perf_counter() - start
+            SCRAPE_PHASE_SECONDS.observe(elapsed, platform=self.platform_name, phase=name)
+            if not cancelled:
+                TIMEOUTS.observe(self.platform_name, name, elapsed, timed_out)
+
+    def check_cancelled(self):
+        """Stop between phases (and between result polls) once the manager has cancelled this scrape"""
+        if self.cancel_event is not None and self.cancel_event.is_set():
+            raise ScrapeCancelled()
+
+    def navigate(self, url, default_timeout=15):
+        """
+        Load a page with a page-load timeout learned from this platform's recent loads
+
+        Recycles the driver when it is due, and replaces a crashed browser and retries once.
+        A load that times out in a browser that no longer answers recycles it before re-raising.
+        """
+        self._maybe_recycle()
+        try:
+            self._load(url, default_timeout)
+        except TimeoutException:
+            if not self._responsive():
+                self.recycle_driver('unresponsive')
+            raise
+        except Exception as e:
+            if not is_dead_session(e):
+                raise
+            self.record_error(e)
+            self.recycle_driver('crashed')
+            self._load(url, default_timeout)
+
+    def _load(self, url, default_timeout):
+        if not self.driver:
+            raise RuntimeError(f"{self.platform_name} browser is not available")
+
+        with self.phase('navigate'):
+            self.driver.set_page_load_timeout(TIMEOUTS.timeout(self.platform_name, 'navigate', default_timeout))
+            self.driver.get(url)
+        self.navigations += 1
+
+    def _responsive(self):
+        """Whether the browser still answers a trivial script (a hung one never returns)"""
+        if not self.driver:
+            return False
+        driver = self.driver
+        finished, error = call_with_timeout(lambda: driver.execute_script("return 1"), self.PROBE_TIMEOUT)
+        return finished and (error is None or not is_dead_session(error))
+
+    def _maybe_recycle(self):
+        """Replace a driver that has served enough pages or grown too large; start one if there is none"""
+        if not self.driver:
+            self.setup_driver()
+            return
+
+        if self.MAX_NAVIGATIONS and self.navigations >= self.MAX_NAVIGATIONS:
+            self.recycle_driver('navigations')
+        elif (self.MAX_RSS_MB and psutil is not None and self.navigations
+              and self.navigations % self.MEMORY_CHECK_EVERY == 0):
+            memory = rss_mb(browser_processes(self.driver_pid))
+            if memory > self.MAX_RSS_MB:
+                self.log.info("Browser using %.0f MB (limit %d MB)", memory, self.MAX_RSS_MB)
+                self.recycle_driver('memory')
+
+    def recycle_driver(self, reason):
+        """Throw the browser away (killing anything it leaves behind) and start a fresh one"""
+        DRIVER_RECYCLES.inc(platform=self.platform_name, reason=reason)
+        self.recycles += 1
+        self.log.warning("Recycling driver (%s) after %d navigations", reason, self.navigations)
+        self._teardown_driver()
+        self.setup_driver()
+
+    def wait_for(self, selectors, default_timeout, min_count=1):
+        """
+        Wait until one of the CSS selectors matches at least `min_count` elements
+        (timeout learned per platform; raises TimeoutException)
+        """
+        if isinstance(selectors, str):
+            selectors = [selectors]
+
+        # Counted in the page so the driver's implicit wait doesn't stall each poll
+        def loaded(driver):
+            self.check_cancelled()
+            return any(
+                driver.execute_script("return document.querySelectorAll(arguments[0]).length", selector) >= min_count
+                for selector in selectors
+            )
+
+        with self.phase('wait'):
+            WebDriverWait(self.driver, TIMEOUTS.timeout(self.platform_name, 'wait', default_timeout),
+                          poll_frequency=0.2).until(loaded)
+
+    def record_error(self, error):
+        """Count a scrape error by exception type"""
+        SCRAPE_ERRORS.inc(platform=self.platform_name, type=type(error).__name__)
+
     def close_driver(self):
         """Close the browser driver"""
         if self.driver:
-            try:
-                self.driver.quit()
-                self.driver = None
-            except:
-                pass
+            self._teardown_driver()
+
+    def _teardown_driver(self):
+        """Quit the driver (bounded, a wedged browser may never answer) and kill leftover processes"""
+        driver, pid = self.driver, self.driver_pid
+        processes = browser_processes(pid)
+        self.driver = None
+        self.driver_pid = None
+        self.navigations = 0
+
+        finished, _ = call_with_timeout(driver.quit, self.QUIT_TIMEOUT)
+        # Without psutil only a chromedriver whose quit() hung is killed
+        killed = kill_processes(processes, None if finished else pid)
+        if killed:
+            self.log.warning("Killed %d browser processes left after quit", killed)
 
     def extract_numeric_price(self, price_str):
         """Extract numeric price from string"""
-        import re
-        if not price_str or price_str == "N/A":
-            return None
-
-        # Remove currency symbols and commas
-        cleaned = re.sub(r'[^\d.]', '', price_str)
-        try:
-            return float(cleaned)
-        except:
-            return None
+        return parse_price(price_str)
 
     def normalize_price(self, price_str, currency='₹'):
         """Normalize price string to standard format"""
@@ -147,16 +308,16 @@ class BaseScraper(ABC):
         Must be implemented by each platform scraper
 
         Returns:
-            list: List of product dictionaries with keys:
+            list: List of Product records (see utils.product) with:
                 - title: Product name
-                - price: Price string
-                - price_numeric: Float price for sorting
-                - rating: Rating string
+                - price: Float price for sorting (price_text keeps the scraped string)
+                - rating: Float rating out of 5, None if unrated
                 - url: Product URL
                 - platform: Platform name
                 - image: Image URL
-                - availability: In stock status
+                - availability: Availability enum
                 - discount: Discount percentage if available
+                - listing_id: Platform listing id (ASIN, data-id) if available
         """
         pass
 
@@ -165,5 +326,7 @@ class BaseScraper(ABC):
         return {
             'platform': self.platform_name,
             'base_url': self.base_url,
-            'status': 'active' if self.driver else 'inactive'
+            'status': 'active' if self.driver else 'inactive',
+            'navigations': self.navigations,
+            'recycles': self.recycles
         }
@@ -0,0 +1,164 @@
+"""
+Browser process lifecycle - Dead-session detection, memory checks and process cleanup
+Process inspection uses psutil when installed; without it only the chromedriver process
+itself can be killed and memory-based recycling is off
+"""
+from typing import Callable, Dict, List, Optional, Tuple
+import os
+import signal
+import threading
+
+from selenium.common.exceptions import InvalidSessionIdException, NoSuchWindowException, WebDriverException
+from urllib3.exceptions import HTTPError as TransportError
+
+from utils.logger import get_logger
+
+try:
+    import psutil
+except ImportError:  # Optional: pip install psutil
+    psutil = None
+
+log = get_logger('scrapers.lifecycle')
+
+# WebDriver error text meaning the browser or its session is gone
+DEAD_SESSION_MARKERS = (
+    'disconnected', 'not reachable', 'session deleted', 'invalid session id',
+    'no such session', 'target window already closed', 'tab crashed', 'chrome failed to start'
+)
+
+# Set in the environment of every chromedriver we launch (and inherited by its browsers) to the
+# launching process's pid, so cleanup only ever touches our own processes
+OWNER_ENV = 'JARVIS_BROWSER_OWNER'
+
+_reaped = False
+_reap_lock = threading.Lock()
+
+
+def is_dead_session(error: Exception) -> bool:
+    """True if `error` means the browser crashed or the session is gone (not a page problem)"""
+    if isinstance(error, (InvalidSessionIdException, NoSuchWindowException, ConnectionError, TransportError)):
+        return True
+    if isinstance(error, WebDriverException):
+        message = str(error).lower()
+        return any(marker in message for marker in DEAD_SESSION_MARKERS)
+    return False
+
+
+def call_with_timeout(fn: Callable, timeout: float) -> Tuple[bool, Optional[Exception]]:
+    """
+    Run a WebDriver call that may hang (a wedged browser never answers)
+
+    Returns:
+        (finished in time, exception raised or None)
+    """
+    outcome = {}
+
+    def run():
+        try:
+            fn()
+        except Exception as e:
+            outcome['error'] = e
+
+    thread = threading.Thread(target=run, name='driver-probe', daemon=True)
+    thread.start()
+    thread.join(timeout)
+    return not thread.is_alive(), outcome.get('error')
+
+
+def owned_env() -> Dict[str, str]:
+    """Environment for a chromedriver Service that marks it (and its browsers) as ours"""
+    return dict(os.environ, **{OWNER_ENV: str(os.getpid())})
+
+
+def service_pid(driver) -> Optional[int]:
+    """PID of the chromedriver process behind a driver"""
+    process = getattr(getattr(driver, 'service', None), 'process', None)
+    return getattr(process, 'pid', None)
+
+
+def browser_processes(pid: Optional[int]) -> List:
+    """chromedriver and every browser process it started (empty without psutil)"""
+    if psutil is None or pid is None:
+        return []
+    try:
+        root = psutil.Process(pid)
+        return [root] + root.children(recursive=True)
+    except psutil.Error:
+        return []
+
+
+def rss_mb(processes: List) -> float:
+    """Combined resident memory of a process tree"""
+    total = 0
+    for process in processes:
+        try:
+            total += process.memory_info().rss
+        except psutil.Error:
+            continue
+    return total / (1024 * 1024)
+
+
+def kill_processes(processes: List, pid: Optional[int] = None) -> int:
+    """Kill whatever is still running of a browser's process tree (returns how many were killed)"""
+    killed = 0
+    if psutil is not None:
+        for process in processes:
+            try:
+                if process.is_running():
+                    process.kill()
+                    killed += 1
+            except psutil.Error:
+                continue
+    elif pid is not None:
+        try:
+            os.kill(pid, getattr(signal, 'SIGKILL', signal.SIGTERM))
+            killed += 1
+        except OSError:
+            pass
+    return killed
+
+
+def _is_orphan(process) -> bool:
+    """
+    A chromedriver or browser launched by a process that has since exited
+
+    Orphans are re-parented to init, or in containers to a subreaper that isn't pid 1,
+    so it's the owner pid's liveness that decides, not the parent.
+    """
+    try:
+        if 'chrome' not in process.name().lower():
+            return False
+        owner = process.environ().get(OWNER_ENV)
+        if owner is None or owner == str(os.getpid()):
+            return False
+        return not psutil.pid_exists(int(owner))
+    except (psutil.Error, ValueError):  # Includes AccessDenied for other users' processes
+        return False
+
+
+def reap_orphans() -> int:
+    """
+    Kill chromedrivers and headless browsers left behind by crashed workers (once per process)
+
+    Only processes carrying OWNER_ENV from another process that has exited are touched.
+    """
+    global _reaped
+    with _reap_lock:
+        if _reaped or psutil is None:
+            return 0
+        _reaped = True
+
+    killed = 0
+    for process in psutil.process_iter():
+        if _is_orphan(process):
+            killed += kill_processes([process] + _children(process))
+    if killed:
+        log.warning("Killed %d orphaned browser processes", killed)
+    return killed
+
+
+def _children(process) -> List:
+    try:
+        return process.children(recursive=True)
+    except psutil.Error:
+        return []
@@ -1,7 +1,8 @@
 """
 eBay India scraper
 """
-from .base_scraper import BaseScraper
+from .base_scraper import BaseScraper, ScrapeCancelled
+from utils.product import Product, Availability
 from selenium.webdriver.common.by import By
 from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.support import expected_conditions as EC
@@ -27,36 +28,39 @@ class EbayScraper(BaseScraper):
             self.safe_wait(0.5, 1)  # ⚡ Reduced delay
 
             search_url = f"{self.base_url}/sch/i.html?_nkw={query.replace(' ', '+')}"
-            print(f"⚡ {self.platform_name}: TURBO searching...")
+            self.log.debug("Searching", extra={'query': query})
 
-            self.driver.get(search_url)
+            self.navigate(search_url)
 
-            # FASTER wait
+            # FASTER wait (5s until the platform's own latency is known)
             try:
-                WebDriverWait(self.driver, 5).until(
-                    EC.presence_of_element_located((By.CSS_SELECTOR, ".s-item"))
-                )
-            except TimeoutException:
-                print(f"⚠️ {self.platform_name}: Timeout")
+                self.wait_for(".s-item", 5)
+            except TimeoutException as e:
+                self.record_error(e)
+                self.log.warning("Timeout waiting for results")
                 return []
 
             products = []
-            product_elements = self.driver.find_elements(By.CSS_SELECTOR, ".s-item")
-
-            # ⚡ Max 5 for speed
-            for element in product_elements[1:min(max_results, 5)+1]:
-                try:
-                    product = self._extract_product(element)
-                    if product:
-                        products.append(product)
-                except:
-                    continue
-
-            print(f"⚡ {self.platform_name}: {len(products)} products in TURBO mode")
+            with self.phase('extract'):
+                product_elements = self.driver.find_elements(By.CSS_SELECTOR, ".s-item")
+
+                # ⚡ Max 5 for speed
+                for element in product_elements[1:min(max_results, 5)+1]:
+                    try:
+                        product = self._extract_product(element)
+                        if product:
+                            products.append(product)
+                    except:
+                        continue
+
+            self.log.info("Extracted %d products", len(products))
             return products
 
+        except ScrapeCancelled:
+            raise
         except Exception as e:
-            print(f"❌ {self.platform_name}: Error - {e}")
+            self.record_error(e)
+            self.log.error("Search failed: %s", e)
             return []
 
     def _extract_product(self, element):
@@ -96,20 +100,15 @@ class EbayScraper(BaseScraper):
         except:
             pass
 
-        # Rating
-        rating = "N/A"
-
         if price == "N/A":
             return None
 
-        return {
-            'title': title,
-            'price': price,
-            'price_numeric': price_numeric,
-            'rating': rating,
-            'url': url,
-            'platform': self.platform_name,
-            'image': image_url,
-            'availability': 'Available',
-            'discount': None
-        }
+        return Product(
+            title=title,
+            platform=self.platform_name,
+            price=price_numeric,
+            price_text=price,
+            url=url,
+            image=image_url,
+            availability=Availability.AVAILABLE
+        )
@@ -1,7 +1,8 @@
 """
 Flipkart scraper with advanced product extraction
 """
-from .base_scraper import BaseScraper
+from .base_scraper import BaseScraper, ScrapeCancelled
+from utils.product import Product, Availability, parse_rating
 from selenium.webdriver.common.by import By
 from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.support import expected_conditions as EC
@@ -28,14 +29,9 @@ class FlipkartScraper(BaseScraper):
             self.safe_wait(0.5, 1)  # ⚡ Reduced delay
 
             search_url = f"{self.base_url}/search?q={query.replace(' ', '%20')}"
-            print(f"⚡ {self.platform_name}: TURBO searching...")
+            self.log.debug("Searching", extra={'query': query})
 
-            self.driver.get(search_url)
-
-            # FASTER wait
-            time.sleep(2)  # ⚡ Reduced from 3-5s
-
-            products = []
+            self.navigate(search_url)
 
             # Try multiple selectors for Flipkart products
             product_selectors = [
@@ -46,33 +42,47 @@ class FlipkartScraper(BaseScraper):
                 ".cPHDOP"
             ]
 
-            product_elements = []
-            for selector in product_selectors:
-                try:
-                    elements = self.driver.find_elements(By.CSS_SELECTOR, selector)
-                    if elements and len(elements) > 3:
-                        product_elements = elements[:min(max_results, 5)]  # ⚡ Max 5
-                        break
-                except:
-                    continue
-
-            if not product_elements:
-                print(f"⚠️ {self.platform_name}: No products")
+            # Wait until one selector has a full result list (replaces a fixed 2s sleep)
+            try:
+                self.wait_for(product_selectors, 5, min_count=4)
+            except TimeoutException as e:
+                self.record_error(e)
+                self.log.warning("Timeout waiting for results")
                 return []
 
-            for element in product_elements:
-                try:
-                    product = self._extract_product(element)
-                    if product:
-                        products.append(product)
-                except Exception as e:
-                    continue
+            products = []
 
-            print(f"⚡ {self.platform_name}: {len(products)} products in TURBO mode")
+            with self.phase('extract'):
+                product_elements = []
+                for selector in product_selectors:
+                    try:
+                        elements = self.driver.find_elements(By.CSS_SELECTOR, selector)
+                        if elements and len(elements) > 3:
+                            product_elements = elements[:min(max_results, 5)]  # ⚡ Max 5
+                            break
+                    except:
+                        continue
+
+                if not product_elements:
+                    self.log.warning("No product containers found")
+                    return []
+
+                for element in product_elements:
+                    try:
+                        product = self._extract_product(element)
+                        if product:
+                            products.append(product)
+                    except Exception as e:
+                        continue
+
+            self.log.info("Extracted %d products", len(products))
             return products
 
+        except ScrapeCancelled:
+            raise
         except Exception as e:
-            print(f"❌ {self.platform_name}: Error - {e}")
+            self.record_error(e)
+            self.log.error("Search failed: %s", e)
             return []
 
     def _extract_product(self, element):
@@ -121,7 +131,7 @@ class FlipkartScraper(BaseScraper):
                 continue
 
         # Rating
-        rating = "N/A"
+        rating = None
         rating_selectors = [
             ".XQDdHH",
             "._3LWZlK",
@@ -133,7 +143,7 @@ class FlipkartScraper(BaseScraper):
                 rating_elem = element.find_element(By.CSS_SELECTOR, selector)
                 rating_text = rating_elem.text.strip()
                 if rating_text:
-                    rating = rating_text + "⭐"
+                    rating = parse_rating(rating_text)
                     break
             except:
                 continue
@@ -157,7 +167,7 @@ class FlipkartScraper(BaseScraper):
             pass
 
         # Availability (Flipkart usually shows only in-stock items)
-        availability = "In Stock"
+        availability = Availability.IN_STOCK
 
         # Discount
         discount = None
@@ -173,14 +183,18 @@ class FlipkartScraper(BaseScraper):
         if price == "N/A":
             return None
 
-        return {
-            'title': title,
-            'price': price,
-            'price_numeric': price_numeric,
-            'rating': rating,
-            'url': url,
-            'platform': self.platform_name,
-            'image': image_url,
-            'availability': availability,
-            'discount': discount
-        }
+        # Flipkart product id (stable listing id)
+        listing_id = element.get_attribute("data-id") or None
+
+        return Product(
+            title=title,
+            platform=self.platform_name,
+            price=price_numeric,
+            price_text=price,
+            rating=rating,
+            discount=discount,
+            url=url,
+            image=image_url,
+            availability=availability,
+            listing_id=listing_id
+        )
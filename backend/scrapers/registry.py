@@ -0,0 +1,60 @@
+"""
+Scraper registry - Platform name -> scraper class, resolved on first use
+Keeps Selenium and the scraper modules out of application startup
+"""
+from typing import Callable, Dict, List, Optional
+import importlib
+import threading
+
+from utils.logger import get_logger
+
+log = get_logger('scrapers.registry')
+
+# Platform -> "module:Class"
+SCRAPERS: Dict[str, str] = {
+    'Amazon': 'scrapers.amazon_scraper:AmazonScraper',
+    'Flipkart': 'scrapers.flipkart_scraper:FlipkartScraper',
+    'eBay': 'scrapers.ebay_scraper:EbayScraper',
+    'Snapdeal': 'scrapers.snapdeal_scraper:SnapdealScraper',
+}
+
+_classes = {}
+_lock = threading.Lock()
+
+
+def load_scraper_class(platform: str):
+    """Import the platform's scraper module (once) and return its class"""
+    with _lock:
+        if platform not in _classes:
+            module_name, class_name = SCRAPERS[platform].split(':')
+            _classes[platform] = getattr(importlib.import_module(module_name), class_name)
+        return _classes[platform]
+
+
+def scraper_factory(platform: str, lifecycle: Optional[Dict] = None) -> Callable:
+    """
+    Factory for ScraperManager.register_scraper that defers the import to the first call
+
+    Args:
+        lifecycle: Driver recycling limits (BaseScraper.configure_lifecycle keyword arguments)
+    """
+    def create():
+        scraper = load_scraper_class(platform)()
+        if lifecycle:
+            scraper.configure_lifecycle(**lifecycle)
+        return scraper
+
+    return create
+
+
+def resolve_platforms(names: List[str]) -> List[str]:
+    """Known platform names in the registry's spelling (unknown names are logged and dropped)"""
+    known = {name.lower(): name for name in SCRAPERS}
+    platforms = []
+    for name in names:
+        platform = known.get(name.strip().lower())
+        if platform is None:
+            log.warning("Unknown platform in configuration: %s", name)
+        elif platform not in platforms:
+            platforms.append(platform)
+    return platforms
@@ -1,12 +1,14 @@
 """
 Snapdeal scraper
 """
-from .base_scraper import BaseScraper
+from .base_scraper import BaseScraper, ScrapeCancelled
+from utils.product import Product, Availability
 from selenium.webdriver.common.by import By
 from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.support import expected_conditions as EC
 from selenium.common.exceptions import TimeoutException, NoSuchElementException
 import time
+import re
 
 
 class SnapdealScraper(BaseScraper):
@@ -27,28 +29,39 @@ class SnapdealScraper(BaseScraper):
             self.safe_wait(0.5, 1)  # ⚡ Reduced delay
 
             search_url = f"{self.base_url}/search?keyword={query.replace(' ', '%20')}"
-            print(f"⚡ {self.platform_name}: TURBO searching...")
+            self.log.debug("Searching", extra={'query': query})
 
-            self.driver.get(search_url)
-            time.sleep(2)  # ⚡ Reduced from 3s
+            self.navigate(search_url)
+
+            # Wait for results (replaces a fixed 2s sleep)
+            try:
+                self.wait_for(".product-tuple-listing", 5)
+            except TimeoutException as e:
+                self.record_error(e)
+                self.log.warning("Timeout waiting for results")
+                return []
 
             products = []
-            product_elements = self.driver.find_elements(By.CSS_SELECTOR, ".product-tuple-listing")
-
-            # ⚡ Max 5 for speed
-            for element in product_elements[:min(max_results, 5)]:
-                try:
-                    product = self._extract_product(element)
-                    if product:
-                        products.append(product)
-                except:
-                    continue
-
-            print(f"⚡ {self.platform_name}: {len(products)} products in TURBO mode")
+            with self.phase('extract'):
+                product_elements = self.driver.find_elements(By.CSS_SELECTOR, ".product-tuple-listing")
+
+                # ⚡ Max 5 for speed
+                for element in product_elements[:min(max_results, 5)]:
+                    try:
+                        product = self._extract_product(element)
+                        if product:
+                            products.append(product)
+                    except:
+                        continue
+
+            self.log.info("Extracted %d products", len(products))
             return products
 
+        except ScrapeCancelled:
+            raise
         except Exception as e:
-            print(f"❌ {self.platform_name}: Error - {e}")
+            self.record_error(e)
+            self.log.error("Search failed: %s", e)
             return []
 
     def _extract_product(self, element):
@@ -90,25 +103,27 @@ class SnapdealScraper(BaseScraper):
             pass
 
         # Rating
-        rating = "N/A"
+        rating = None
         try:
             rating_elem = element.find_element(By.CSS_SELECTOR, ".filled-stars")
-            rating = rating_elem.get_attribute("style")
-            # Extract percentage and convert to rating
+            style = rating_elem.get_attribute("style")
+            # Extract percentage ("width: 80%") and convert to a 5-star rating
+            percent_match = re.search(r'(\d+(?:\.\d+)?)%', style or "")
+            if percent_match:
+                rating = round(float(percent_match.group(1)) / 20, 1)
         except:
             pass
 
         if price == "N/A":
             return None
 
-        return {
-            'title': title,
-            'price': price,
-            'price_numeric': price_numeric,
-            'rating': rating,
-            'url': url,
-            'platform': self.platform_name,
-            'image': image_url,
-            'availability': 'Available',
-            'discount': None
-        }
+        return Product(
+            title=title,
+            platform=self.platform_name,
+            price=price_numeric,
+            price_text=price,
+            rating=rating,
+            url=url,
+            image=image_url,
+            availability=Availability.AVAILABLE
+        )
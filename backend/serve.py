@@ -0,0 +1,101 @@
+"""
+Production launcher for the backend APIs
+Serves an app module's create_app() with gunicorn (POSIX: worker processes x threads)
+or waitress (Windows: threads), and drains in-flight scrapes on shutdown
+
+Usage:
+    python serve.py                       # app_jarvis on JARVIS_BIND
+    python serve.py --workers 4 --threads 8 --bind 0.0.0.0:8000
+    python serve.py --app app_pro
+"""
+import argparse
+import importlib
+import os
+import signal
+import sys
+
+from config import Config
+from utils.logger import configure_logging, get_logger, shutdown_logging
+
+log = get_logger('serve')
+
+
+def run_gunicorn(module: str, bind: str, workers: int, threads: int):
+    """Pre-fork server: each worker imports the app after fork, so browsers are never shared"""
+    from gunicorn.app.base import BaseApplication
+
+    def worker_exit(server, worker):
+        # Gunicorn has already stopped accepting and finished in-flight requests (up to graceful_timeout)
+        importlib.import_module(module).shutdown()
+        shutdown_logging()
+
+    class JarvisApplication(BaseApplication):
+        def load_config(self):
+            self.cfg.set('bind', bind)
+            self.cfg.set('workers', workers)
+            self.cfg.set('threads', threads)
+            self.cfg.set('worker_class', 'gthread')
+            self.cfg.set('timeout', Config.JARVIS_WORKER_TIMEOUT)
+            self.cfg.set('graceful_timeout', Config.JARVIS_GRACEFUL_TIMEOUT)
+            self.cfg.set('preload_app', False)
+            self.cfg.set('worker_exit', worker_exit)
+
+        def load(self):
+            return importlib.import_module(module).create_app(workers=workers)
+
+    JarvisApplication().run()
+
+
+def run_single_process(module: str, bind: str, threads: int):
+    """Threaded server in this process (waitress if installed, otherwise Werkzeug)"""
+    app_module = importlib.import_module(module)
+    app = app_module.create_app(workers=1)
+    host, _, port = bind.rpartition(':')
+
+    # SIGTERM (service managers, containers) unwinds like Ctrl+C so the drain below runs
+    signal.signal(signal.SIGTERM, lambda signum, frame: sys.exit(0))
+
+    try:
+        try:
+            from waitress import serve
+        except ImportError:
+            log.warning("waitress is not installed; falling back to the threaded Werkzeug server")
+            from werkzeug.serving import run_simple
+            run_simple(host or '0.0.0.0', int(port), app, threaded=True)
+        else:
+            serve(app, listen=bind, threads=threads)
+    except KeyboardInterrupt:
+        pass
+    finally:
+        app_module.shutdown()
+        shutdown_logging()
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Serve a backend API with multiple workers')
+    parser.add_argument('--app', default='app_jarvis', help='Module exposing create_app() and shutdown()')
+    parser.add_argument('--bind', default=Config.JARVIS_BIND, help='host:port')
+    parser.add_argument('--workers', type=int, default=Config.workers(), help='Worker processes (gunicorn)')
+    parser.add_argument('--threads', type=int, default=Config.JARVIS_THREADS, help='Threads per worker')
+    args = parser.parse_args()
+
+    configure_logging(Config.JARVIS_LOG_LEVEL, Config.JARVIS_LOG_FORMAT, Config.JARVIS_LOG_SAMPLE_EVERY)
+
+    if os.name == 'posix':
+        try:
+            import gunicorn  # noqa: F401
+        except ImportError:
+            log.warning("gunicorn is not installed; serving from a single process")
+        else:
+            log.info("Starting gunicorn", extra={'app': args.app, 'bind': args.bind,
+                                                 'workers': args.workers, 'threads': args.threads})
+            run_gunicorn(args.app, args.bind, args.workers, args.threads)
+            return
+
+    if args.workers > 1:
+        log.info("Multiple worker processes need gunicorn (POSIX); using %d threads in one process", args.threads)
+    run_single_process(args.app, args.bind, args.threads)
+
+
+if __name__ == '__main__':
+    main()
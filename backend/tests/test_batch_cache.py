@@ -0,0 +1,32 @@
+"""Batch results assembled from per-platform cache slices"""
+from datetime import datetime, timedelta
+
+from utils.product import Product
+from utils.scraper_manager import ScraperManager
+
+
+class StaticScraper:
+    def __init__(self, platform):
+        self.platform = platform
+
+    def search(self, query, max_results=10):
+        return [Product(title=f'{query} on {self.platform}', price=999, platform=self.platform,
+                        url=f'https://example.com/{self.platform}')]
+
+    def close(self):
+        pass
+
+
+def test_assembled_entry_expires_with_its_oldest_slice():
+    manager = ScraperManager()
+    for platform in ('Amazon', 'Flipkart'):
+        manager.register_scraper(platform, StaticScraper(platform))
+    for platform, age in (('Amazon', 250), ('Flipkart', 10)):
+        manager.search_all('iphone 15', platforms=[platform])
+        manager.cache[manager._get_cache_key('iphone 15', [platform])]['timestamp'] -= timedelta(seconds=age)
+
+    [(_, result)] = manager.search_batch(['iphone 15'], platforms=['Amazon', 'Flipkart'])
+
+    assert result['from_cache'] and result['total'] == 2
+    entry = manager.cache[manager._get_cache_key('iphone 15', ['Amazon', 'Flipkart'])]
+    assert (datetime.now() - entry['timestamp']).total_seconds() >= 250
@@ -0,0 +1,45 @@
+"""Cancelled (hedged) scrapes"""
+import threading
+
+from scrapers.amazon_scraper import AmazonScraper
+from utils.circuit_breaker import CLOSED
+from utils.metrics import SCRAPE_ERRORS
+from utils.scraper_manager import ScraperManager
+
+
+class SlowPageDriver:
+    """Loads pages instantly but never shows any results"""
+
+    def set_page_load_timeout(self, seconds):
+        pass
+
+    def get(self, url):
+        pass
+
+    def execute_script(self, script, *args):
+        return 0
+
+    def quit(self):
+        pass
+
+
+def test_cancelled_hedge_records_no_error():
+    scraper = AmazonScraper()
+    scraper.driver = SlowPageDriver()
+    scraper.safe_wait = lambda *args: None
+
+    manager = ScraperManager()
+    manager.register_scraper('Amazon', scraper)
+
+    cancel = threading.Event()
+    threading.Timer(0.3, cancel.set).start()
+    errors = SCRAPE_ERRORS.get(platform='Amazon', type='ScrapeCancelled')
+    all_errors = sum(SCRAPE_ERRORS.values.values())
+
+    products = manager.search_platform('Amazon', 'iphone 15', cancel=cancel)
+
+    assert products == []
+    assert SCRAPE_ERRORS.get(platform='Amazon', type='ScrapeCancelled') == errors
+    assert sum(SCRAPE_ERRORS.values.values()) == all_errors
+    assert manager.breakers['Amazon'].get_stats()['consecutive_failures'] == 0
+    assert manager.breakers['Amazon'].state == CLOSED
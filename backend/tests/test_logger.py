@@ -0,0 +1,32 @@
+"""Log sampling under concurrent logging threads"""
+import logging
+import sys
+import threading
+
+from utils.logger import SamplingFilter
+
+
+def test_sampling_keeps_exactly_one_in_every_across_threads():
+    sampler = SamplingFilter(every=10)
+    kept = []
+    interval = sys.getswitchinterval()
+    sys.setswitchinterval(1e-6)  # Switch threads as often as possible
+
+    def log_many():
+        for _ in range(5000):
+            record = logging.LogRecord('jarvis', logging.INFO, __file__, 0, 'item', None, None)
+            record.sample = 'item'
+            if sampler.filter(record):
+                kept.append(record)
+
+    try:
+        threads = [threading.Thread(target=log_many) for _ in range(8)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+    finally:
+        sys.setswitchinterval(interval)
+
+    assert sampler.counts['item'] == 40000
+    assert len(kept) == 4000
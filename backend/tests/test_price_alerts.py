@@ -0,0 +1,43 @@
+"""Price alert matching"""
+import pytest
+
+from utils.price_alerts import PriceAlertEngine
+from utils.product import Product
+
+
+def listing(title, price):
+    return Product(title=title, price=price, platform='Amazon', url='https://www.amazon.in/dp/B0TEST0001')
+
+
+def engine():
+    return PriceAlertEngine(sinks=[])
+
+
+def test_spaced_unit_query_matches_joined_unit_title():
+    alerts = engine()
+    alerts.add_alert(70000, query='iphone 15 128 gb')
+
+    fired = alerts.evaluate('iphone 15', [listing('Apple iPhone 15 (128GB) - Black', 69999)])
+
+    assert len(fired) == 1
+
+
+def test_joined_unit_query_matches_spaced_unit_title():
+    alerts = engine()
+    alerts.add_alert(70000, query='iphone 15 128gb')
+
+    fired = alerts.evaluate('iphone 15', [listing('Apple iPhone 15 (Black, 128 GB)', 68999)])
+
+    assert len(fired) == 1
+
+
+def test_different_capacity_does_not_match():
+    alerts = engine()
+    alerts.add_alert(70000, query='iphone 15 128 gb')
+
+    assert alerts.evaluate('iphone 15', [listing('Apple iPhone 15 (256 GB) - Black', 69999)]) == []
+
+
+def test_platforms_must_be_a_list():
+    with pytest.raises(ValueError):
+        engine().add_alert(70000, query='iphone 15', platforms='Amazon')
@@ -0,0 +1,184 @@
+"""Streaming analytics match the original multi-pass PriceAnalytics.analyze_products"""
+import random
+import statistics
+
+from analytics.price_aggregator import RunningStats
+from analytics.price_analytics import PriceAnalytics
+from analytics.product_batch import ProductBatch
+from utils.product import Product
+
+# Scraped results in arrival order: Flipkart answered first, and ties Amazon's cheapest price
+RESULTS = [
+    {
+        'title': 'Apple iPhone 15 (128 GB) - Black',
+        'price': '₹69,999',
+        'price_numeric': 69999.0,
+        'platform': 'Flipkart',
+        'url': 'https://www.flipkart.com/p/1',
+        'rating': '4.6⭐',
+        'discount': 12,
+    },
+    {
+        'title': 'Apple iPhone 15 (Black, 128 GB)',
+        'price': '₹72,999',
+        'price_numeric': 72999.0,
+        'platform': 'Flipkart',
+        'url': 'https://www.flipkart.com/p/2',
+        'rating': 'N/A',
+        'discount': None,
+    },
+    {
+        'title': 'Apple iPhone 15 128GB Black',
+        'price': '₹69,999',
+        'price_numeric': 69999.0,
+        'platform': 'Amazon',
+        'url': 'https://www.amazon.in/dp/B0TEST0001',
+        'rating': '4.5⭐',
+        'discount': 8,
+    },
+    {
+        'title': 'iPhone 15 Case',
+        'price': 'N/A',
+        'price_numeric': None,
+        'platform': 'Amazon',
+        'url': 'https://www.amazon.in/dp/B0TEST0002',
+        'rating': '4.0⭐',
+        'discount': None,
+    },
+    {
+        'title': 'Apple iPhone 15 128GB Unlocked',
+        'price': '₹74,500.50',
+        'price_numeric': 74500.5,
+        'platform': 'eBay',
+        'url': 'https://www.ebay.com/itm/3',
+        'rating': 'N/A',
+        'discount': 25,
+    },
+]
+
+# Output of the original (pre-aggregator) PriceAnalytics.analyze_products for RESULTS
+EXPECTED = {
+    'price_range': {
+        'min': '₹69,999.00',
+        'max': '₹74,500.50',
+        'avg': '₹71,874.38',
+        'median': '₹71,499.00',
+        'spread': '₹4,501.50',
+        'spread_percent': '6.4%',
+    },
+    'volatility': {'std_dev': '₹2,250.58', 'coefficient_variation': '3.1%'},
+    'best_deal': {
+        'title': 'Apple iPhone 15 (128 GB) - Black',
+        'price': '₹69,999',
+        'platform': 'Flipkart',
+        'url': 'https://www.flipkart.com/p/1',
+        'rating': '4.6⭐',
+        'discount': 12,
+        'savings': '₹4,501.50',
+        'savings_percent': '6.0%',
+    },
+    'worst_deal': {
+        'title': 'Apple iPhone 15 128GB Unlocked',
+        'price': '₹74,500.50',
+        'platform': 'eBay',
+        'extra_cost': '₹4,501.50',
+        'extra_cost_percent': '6.4%',
+    },
+    'platforms': [
+        {
+            'platform': 'Flipkart',
+            'count': 2,
+            'cheapest': {
+                'title': 'Apple iPhone 15 (128 GB) - Black',
+                'price': '₹69,999',
+                'url': 'https://www.flipkart.com/p/1',
+                'rating': '4.6⭐',
+                'difference': '₹0.00',
+                'difference_percent': '0.0%',
+                'is_best_overall': True,
+            },
+            'avg_price': '₹71,499.00',
+            'price_range': {'min': '₹69,999.00', 'max': '₹72,999.00'},
+        },
+        {
+            'platform': 'Amazon',
+            'count': 2,
+            'cheapest': {
+                'title': 'Apple iPhone 15 128GB Black',
+                'price': '₹69,999',
+                'url': 'https://www.amazon.in/dp/B0TEST0001',
+                'rating': '4.5⭐',
+                'difference': '₹0.00',
+                'difference_percent': '0.0%',
+                'is_best_overall': True,
+            },
+            'avg_price': '₹69,999.00',
+            'price_range': {'min': '₹69,999.00', 'max': '₹69,999.00'},
+        },
+        {
+            'platform': 'eBay',
+            'count': 1,
+            'cheapest': {
+                'title': 'Apple iPhone 15 128GB Unlocked',
+                'price': '₹74,500.50',
+                'url': 'https://www.ebay.com/itm/3',
+                'rating': 'N/A',
+                'difference': '₹4,501.50',
+                'difference_percent': '6.4%',
+                'is_best_overall': False,
+            },
+            'avg_price': '₹74,500.50',
+            'price_range': {'min': '₹74,500.50', 'max': '₹74,500.50'},
+        },
+    ],
+    'discounts': {
+        'available': True,
+        'count': 3,
+        'avg_discount': '15.0%',
+        'max_discount': '25%',
+        'products_with_discounts': 3,
+        'total_products': 5,
+        'discount_ratio': '60.0%',
+    },
+    'ratings': {
+        'available': True,
+        'avg_rating': '4.37⭐',
+        'highest_rating': '4.6⭐',
+        'lowest_rating': '4.0⭐',
+        'products_with_ratings': 3,
+        'total_products': 5,
+    },
+    'recommendation': '🎯 Best deal: ₹69,999 on Flipkart with 4.6⭐ rating (12% off)',
+}
+
+
+def products():
+    return [Product.from_dict(record) for record in RESULTS]
+
+
+def test_matches_original_analysis():
+    assert PriceAnalytics().analyze_products(products()) == EXPECTED
+
+
+def test_matches_original_when_fed_per_platform_as_results_arrive():
+    aggregator = PriceAnalytics().new_aggregator()
+    for platform in ('Flipkart', 'Amazon', 'eBay'):
+        aggregator.add_many([product for product in products() if product.platform == platform])
+
+    assert aggregator.summary() == EXPECTED
+
+
+def test_matches_original_from_a_columnar_batch():
+    assert PriceAnalytics().analyze_batch(ProductBatch(products())) == EXPECTED
+
+
+def test_average_rounds_like_statistics_mean():
+    # Ratings whose exact mean sits on a display rounding boundary ("4.025")
+    rng = random.Random(7)
+    for _ in range(2000):
+        values = [rng.choice((3.2, 4.0, 4.1, 4.5, 4.9)) for _ in range(rng.randint(1, 30))]
+        stats = RunningStats()
+        for value in values:
+            stats.add(value)
+
+        assert stats.average == statistics.mean(values)
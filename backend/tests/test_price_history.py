@@ -0,0 +1,34 @@
+"""Price history writes"""
+from utils.price_history import PriceHistoryStore
+from utils.product import Product
+from utils.product_catalog import ProductCatalog
+
+
+def listing(price=69999):
+    return Product(title='Apple iPhone 15 (128 GB) - Black', price=price, platform='Amazon',
+                   url='https://www.amazon.in/dp/B0TEST0001')
+
+
+def test_listing_assigned_after_recording_gets_its_product_id(tmp_path):
+    catalog = ProductCatalog()
+    history = PriceHistoryStore(str(tmp_path / 'history.db'), catalog=catalog, flush_interval=0.2)
+
+    history.record('iphone 15', [listing()])
+    product_id = catalog.assign(listing())
+    history.close()
+
+    series = history.query_series(product_id=product_id)
+    assert [point['count'] for point in series['points']] == [1]
+
+
+def test_failed_batch_forgets_rolled_back_listings(tmp_path):
+    history = PriceHistoryStore(str(tmp_path / 'history.db'))
+    history.close()
+
+    history._write([(listing(), None)])  # NULL timestamp: the whole batch rolls back
+    history._write([(listing(), 1700000000)])
+
+    series = history.query_series(listing='Amazon:https://www.amazon.in/dp/B0TEST0001',
+                                  start=1699990000, end=1700010000)
+    assert history.written == 1
+    assert [point['count'] for point in series['points']] == [1]
@@ -0,0 +1,95 @@
+"""ProductBatch filters, sorts and groups exactly like the list code it replaced"""
+import itertools
+
+import pytest
+
+from analytics.product_batch import ProductBatch
+from utils.product import Product
+
+# Missing and zero prices, unrated listings, and price/rating/discount ties in several platforms
+RESULTS = [
+    {'title': 'a', 'price_numeric': 999.0, 'platform': 'Amazon', 'rating': '4.1⭐', 'discount': 10},
+    {'title': 'b', 'price_numeric': None, 'platform': 'Flipkart', 'rating': '4.5⭐', 'discount': None},
+    {'title': 'c', 'price_numeric': 999.0, 'platform': 'Flipkart', 'rating': 'N/A', 'discount': 10},
+    {'title': 'd', 'price_numeric': 0, 'platform': 'eBay', 'rating': '4.1⭐', 'discount': 25},
+    {'title': 'e', 'price_numeric': 250.0, 'platform': 'Amazon', 'rating': '3.2⭐', 'discount': None,
+     'availability': 'Out of Stock'},
+    {'title': 'f', 'price_numeric': 4999.0, 'platform': 'Snapdeal', 'rating': '4.5⭐', 'discount': 25},
+    {'title': 'g', 'price_numeric': 250.0, 'platform': 'eBay', 'rating': 'N/A', 'discount': 0},
+    {'title': 'h', 'price_numeric': None, 'platform': 'Amazon', 'rating': 'N/A', 'discount': None,
+     'availability': 'Out of Stock'},
+]
+
+FILTERS = [
+    {},
+    {'min_price': 250},
+    {'max_price': 999},
+    {'min_price': 100, 'max_price': 1000, 'min_rating': 4.0},
+    {'min_rating': 4.1},
+    {'platforms': ['Amazon', 'eBay', 'Unknown']},
+    {'platforms': []},
+    {'in_stock_only': True},
+    {'in_stock_only': False, 'platforms': ['Flipkart']},
+]
+
+SORTS = ['price_asc', 'price_desc', 'rating_desc', 'discount_desc', 'relevance']
+
+
+# The original list implementations (app_jarvis.apply_filters / apply_sorting / group_by_platform)
+
+def rating_of(product, missing):
+    rating = product.get('rating', 'N/A')
+    if rating == 'N/A':
+        return missing
+    return float(rating.replace('⭐', '').strip())
+
+
+def apply_filters(products, filters):
+    filtered = products
+    if 'min_price' in filters:
+        filtered = [p for p in filtered if p.get('price_numeric') and p['price_numeric'] >= filters['min_price']]
+    if 'max_price' in filters:
+        filtered = [p for p in filtered if p.get('price_numeric') and p['price_numeric'] <= filters['max_price']]
+    if 'min_rating' in filters:
+        filtered = [p for p in filtered if rating_of(p, float('-inf')) >= filters['min_rating']]
+    if 'platforms' in filters:
+        filtered = [p for p in filtered if p['platform'] in filters['platforms']]
+    if filters.get('in_stock_only'):
+        filtered = [p for p in filtered if p.get('availability') != 'Out of Stock']
+    return filtered
+
+
+def apply_sorting(products, sort_by):
+    if sort_by == 'price_asc':
+        return sorted(products, key=lambda x: x.get('price_numeric') or float('inf'))
+    if sort_by == 'price_desc':
+        return sorted(products, key=lambda x: x.get('price_numeric') or 0, reverse=True)
+    if sort_by == 'rating_desc':
+        return sorted(products, key=lambda x: rating_of(x, 0), reverse=True)
+    if sort_by == 'discount_desc':
+        return sorted(products, key=lambda x: x.get('discount') or 0, reverse=True)
+    return products
+
+
+def group_by_platform(products):
+    platforms = {}
+    for product in products:
+        platforms.setdefault(product['platform'], []).append(product)
+    return [(platform, [p['title'] for p in group]) for platform, group in platforms.items()]
+
+
+def records():
+    return [dict({'price': 'x', 'url': f"https://example.com/{r['title']}", 'availability': 'In Stock'}, **r)
+            for r in RESULTS]
+
+
+@pytest.mark.parametrize('filters, sort_by', list(itertools.product(FILTERS, SORTS)))
+def test_matches_list_implementation(filters, sort_by):
+    expected = apply_sorting(apply_filters(records(), filters) if filters else records(), sort_by)
+
+    batch = ProductBatch([Product.from_dict(record) for record in records()])
+    indices = batch.sort_indices(sort_by, batch.filter_indices(filters) if filters else None)
+
+    assert [product.title for product in batch.take(indices)] == [p['title'] for p in expected]
+    assert [(group['platform'], [product.title for product in group['products']])
+            for group in batch.group_by_platform(indices)] == group_by_platform(expected)
@@ -0,0 +1,36 @@
+"""Which query spellings share a canonical form"""
+import pytest
+
+from utils.query_normalizer import canonical_query
+
+
+@pytest.mark.parametrize('first, second', [
+    ('iPhone 15 128GB', 'iphone 15 128 gb'),
+    ('  iphone   15 128gb ', 'iphone 15 128gb'),
+    ('iphone 15 128 gigabytes', 'iphone 15 128gb'),
+    ('case for iphone 15', 'case iphone 15'),
+    ('the usb c cable', 'usb c cable'),
+    ('black running shoes', 'running shoes black'),
+    ('samsung 8 gb ram', 'samsung 8gb ram'),
+    ('charger with 20 watts', 'charger 20w'),
+])
+def test_variants_merge(first, second):
+    assert canonical_query(first) == canonical_query(second)
+
+
+@pytest.mark.parametrize('first, second', [
+    ('usb c to usb a', 'usb c to usb'),
+    ('usb c to usb a', 'usb a to usb c'),
+    ('usb c cable', 'usb cable'),
+    ('samsung a 54', 'samsung 54'),
+    ('iphone 15 pro', 'iphone pro 15'),
+    ('iphone 15 128gb', 'iphone 15 256gb'),
+    ('type c charger', 'type charger'),
+])
+def test_different_products_stay_apart(first, second):
+    assert canonical_query(first) != canonical_query(second)
+
+
+def test_canonical_form_is_idempotent():
+    for query in ('usb c to usb a', 'Case for iPhone 15 (Black, 128 GB)', 'the'):
+        assert canonical_query(canonical_query(query)) == canonical_query(query)
@@ -0,0 +1,20 @@
+"""Memoized views over one result stay bounded"""
+from analytics.price_analytics import PriceAnalytics
+from analytics.result_session import ResultSession
+from utils.product import Product
+
+
+def test_memos_keyed_by_client_filters_are_capped():
+    products = [Product(title=f'Phone {n}', price=1000 + n, platform='Amazon', url=f'https://example.com/{n}')
+                for n in range(10)]
+    session = ResultSession(products, PriceAnalytics())
+
+    for n in range(ResultSession.MAX_VIEWS * 3):
+        filters = {'min_price': n}
+        session.view(filters, 'price_asc')
+        session.summary(filters)
+
+    assert len(session.views) <= ResultSession.MAX_VIEWS
+    assert len(session.matches) <= ResultSession.MAX_VIEWS
+    assert len(session.analytics) <= ResultSession.MAX_VIEWS
+    assert session.batch.take(session.view({'min_price': 1007}, 'price_desc')) == products[:6:-1]
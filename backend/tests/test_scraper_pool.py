@@ -0,0 +1,44 @@
+"""Scraper pool lending while new browsers start"""
+import threading
+
+from utils.scraper_pool import ScraperPool
+
+
+class Scraper:
+    platform_name = 'Amazon'
+
+
+def test_slow_factory_does_not_block_other_borrowers():
+    started, finish = threading.Event(), threading.Event()
+
+    def factory():
+        started.set()
+        finish.wait(5)
+        return Scraper()
+
+    first = Scraper()
+    pool = ScraperPool(first, size=2, factory=factory)
+    assert pool.acquire() is first
+
+    building = threading.Thread(target=pool.acquire)
+    building.start()
+    assert started.wait(5)
+
+    # The pool is full (one lent, one being built), so this waits for a release, not the factory
+    releaser = threading.Timer(0.1, pool.release, [first])
+    releaser.start()
+    assert pool.acquire(timeout=2) is first
+
+    finish.set()
+    building.join(5)
+    assert pool.get_stats()['instances'] == 2
+
+
+def test_failing_factory_gives_the_slot_up():
+    def factory():
+        raise RuntimeError('no browser')
+
+    pool = ScraperPool(size=2, factory=factory, platform_name='Amazon')
+
+    assert pool.acquire(timeout=1) is None
+    assert pool.get_stats()['size'] == 0
@@ -0,0 +1,42 @@
+"""Index answers stay pageable while the index keeps changing"""
+from utils.product import Product
+from utils.search_index import ProductIndex
+
+
+def listing(title, asin, platform='Amazon'):
+    return Product(title=title, price=999, platform=platform, url=f'https://www.amazon.in/dp/{asin}')
+
+
+def index(**options):
+    return ProductIndex(lambda product: product.url, **options)
+
+
+def test_pages_survive_unrelated_updates():
+    products = index()
+    products.add('case', [listing(f'iPhone 15 case model {n}', f'B0CASE{n:04d}') for n in range(6)])
+    first = products.search_result('iphone case', ['Amazon'], 10)
+
+    products.add('charger', [listing('USB C charger 20W', 'B0CHARGER1')])
+    products.add('case', [listing('iPhone 15 case model 9', 'B0CASE0009')])
+
+    page = products.snapshot_result(first['timestamp'], 'iphone case', ['Amazon'])
+    assert [p.url for p in page['products']] == [p.url for p in first['products']]
+
+
+def test_unchanged_hits_keep_their_snapshot_id():
+    products = index()
+    products.add('case', [listing('iPhone 15 case', 'B0CASE0001')])
+    first = products.search_result('iphone case', ['Amazon'], 10)
+
+    products.add('charger', [listing('USB C charger 20W', 'B0CHARGER1')])
+
+    assert products.search_result('iphone case', ['Amazon'], 10)['timestamp'] == first['timestamp']
+
+
+def test_snapshots_expire():
+    products = index(snapshot_ttl=-1)
+    products.add('case', [listing('iPhone 15 case', 'B0CASE0001')])
+    first = products.search_result('iphone case', ['Amazon'], 10)
+
+    assert products.snapshot_result(first['timestamp'], 'iphone case', ['Amazon']) is None
+    assert products.snapshot_result('index:7', 'iphone case', ['Amazon']) is None
@@ -0,0 +1,47 @@
+"""Catalog and alerts shared by worker processes through one SQLite file"""
+from utils.price_alerts import PriceAlertEngine
+from utils.product import Product
+from utils.product_catalog import ProductCatalog
+
+
+def listing(title, price, url='https://www.amazon.in/dp/B0TEST0001'):
+    return Product(title=title, price=price, platform='Amazon', url=url)
+
+
+def test_workers_assign_one_product_id(tmp_path):
+    path = str(tmp_path / 'shared.db')
+    first, second = ProductCatalog(path=path), ProductCatalog(path=path)
+
+    product_id = first.assign(listing('Apple iPhone 15 (128 GB) - Black', 69999))
+
+    assert second.assign(listing('Apple iPhone 15 (128 GB) - Black', 69999)) == product_id
+    assert second.lookup(listing('Apple iPhone 15 (128 GB) - Black', 69999)) == product_id
+    assert second.get_product(product_id)['title'] == 'Apple iPhone 15 (128 GB) - Black'
+
+
+def test_alert_added_in_one_worker_fires_once(tmp_path):
+    path = str(tmp_path / 'shared.db')
+    first, second = PriceAlertEngine(sinks=[], path=path), PriceAlertEngine(sinks=[], path=path)
+
+    alert = first.add_alert(70000, query='iphone 15 128gb')
+    assert [record['alert_id'] for record in second.list_alerts()] == [alert.alert_id]
+
+    products = [listing('Apple iPhone 15 (128 GB) - Black', 69999)]
+    second.sync()
+    assert len(second.evaluate('iphone 15', products)) == 1
+
+    first.sync()
+    assert first.evaluate('iphone 15', products) == []
+    assert first.list_alerts() == []
+    assert [record['alert_id'] for record in first.get_recent()] == [alert.alert_id]
+
+
+def test_removal_is_seen_by_other_workers(tmp_path):
+    path = str(tmp_path / 'shared.db')
+    first, second = PriceAlertEngine(sinks=[], path=path), PriceAlertEngine(sinks=[], path=path)
+
+    alert = first.add_alert(70000, query='iphone 15')
+    assert second.remove_alert(alert.alert_id)
+
+    assert first.get_alert(alert.alert_id) is None
+    assert not first.remove_alert(alert.alert_id)
@@ -0,0 +1,34 @@
+"""Query suggestions match what users type, and show how they spell it"""
+import pytest
+
+from utils.suggest import SuggestionIndex
+
+
+def index(*queries):
+    suggestions = SuggestionIndex()
+    for query in queries:
+        suggestions.add_query(query)
+    return suggestions
+
+
+@pytest.mark.parametrize('searched, typed, shown', [
+    ('black running shoes', 'black', 'black running shoes'),
+    ('black running shoes', 'black run', 'black running shoes'),
+    ('case for iphone 15', 'case f', 'case for iphone 15'),
+    ('iphone 15 128gb', 'iphone 15 128 g', 'iphone 15 128gb'),
+    ('iPhone 15 128 GB', 'iphone 15 128g', 'iphone 15 128 gb'),
+    ('Apple iPhone 15 Pro Max 256GB', 'apple iphone 15 pro max 256 g', 'apple iphone 15 pro max 256gb'),
+])
+def test_prefix_finds_search(searched, typed, shown):
+    assert [text for text, _ in index(searched).suggest(typed)] == [shown]
+
+
+def test_variants_share_one_suggestion_shown_as_the_popular_spelling():
+    suggestions = index('running shoes black', 'Black Running Shoes', 'black running shoes')
+
+    assert suggestions.suggest('black') == [('black running shoes', 3.0)]
+    assert suggestions.suggest('running') == [('black running shoes', 3.0)]
+
+
+def test_unrelated_prefix_finds_nothing():
+    assert index('case for iphone 15').suggest('iphone 15 case') == []
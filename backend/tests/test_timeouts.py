@@ -0,0 +1,34 @@
+"""Adaptive timeouts"""
+from utils.timeouts import AdaptiveTimeouts, request_deadline
+
+
+def test_slowed_platform_is_not_cut_off():
+    timeouts = AdaptiveTimeouts(percentile=95, margin=1.5, maximum=30)
+    for _ in range(50):
+        timeouts.observe('Amazon', 'navigate', 2.0)
+
+    # The platform now takes 4.5s: waits widen after each timeout until a load fits
+    waits = []
+    for _ in range(10):
+        wait = timeouts.timeout('Amazon', 'navigate', 15)
+        waits.append(wait)
+        if wait >= 4.5:
+            timeouts.observe('Amazon', 'navigate', 4.5)
+            break
+        timeouts.observe('Amazon', 'navigate', wait, timed_out=True)
+
+    assert waits[0] == 3.5
+    assert waits == sorted(waits)
+    assert waits[-1] >= 4.5
+    assert len(waits) <= 3
+    assert timeouts.timeout('Amazon', 'navigate', 15) == 3.5  # A success ends the backoff
+
+
+def test_backoff_is_capped_by_maximum_and_deadline():
+    timeouts = AdaptiveTimeouts(maximum=30)
+    for _ in range(20):
+        timeouts.observe('eBay', 'wait', 5, timed_out=True)
+
+    assert timeouts.timeout('eBay', 'wait', 5) == 30
+    with request_deadline(10):
+        assert timeouts.timeout('eBay', 'wait', 5) <= 9
@@ -0,0 +1,93 @@
+"""
+Circuit breaker - Stop sending searches to a platform that keeps failing
+After `failure_threshold` consecutive errors or empty results the platform is skipped for
+`reset_timeout` seconds, then a few probe searches decide whether it has recovered
+"""
+from typing import Dict
+import threading
+import time
+
+CLOSED = 'closed'
+OPEN = 'open'
+HALF_OPEN = 'half_open'
+
+
+class CircuitOpenError(Exception):
+    """Raised instead of scraping a platform whose circuit is open"""
+
+    def __init__(self, platform: str, retry_in: float):
+        super().__init__(f"{platform} circuit open, retry in {retry_in:.0f}s")
+        self.platform = platform
+        self.retry_in = retry_in
+
+
+class CircuitBreaker:
+    """Closed -> open after repeated failures -> half-open probes -> closed (or open again)"""
+
+    def __init__(self, platform: str, failure_threshold: int = 5, reset_timeout: float = 60.0, probes: int = 1):
+        self.platform = platform
+        self.failure_threshold = max(1, failure_threshold)
+        self.reset_timeout = reset_timeout
+        self.probes = max(1, probes)
+
+        self.state = CLOSED
+        self.failures = 0  # Consecutive
+        self.last_failure = None  # Reason for the latest failure ('error', 'empty', ...)
+        self.opened_at = 0.0
+        self.probing = 0  # Probe searches in flight while half-open
+        self.times_opened = 0
+        self.rejected = 0
+        self.lock = threading.Lock()
+
+    def before_call(self):
+        """Admit a search or raise CircuitOpenError (a half-open circuit admits `probes` at a time)"""
+        with self.lock:
+            if self.state == OPEN:
+                retry_in = self.opened_at + self.reset_timeout - time.monotonic()
+                if retry_in > 0:
+                    self.rejected += 1
+                    raise CircuitOpenError(self.platform, retry_in)
+                self.state = HALF_OPEN
+                self.probing = 0
+
+            if self.state == HALF_OPEN:
+                if self.probing >= self.probes:
+                    self.rejected += 1
+                    raise CircuitOpenError(self.platform, 0)
+                self.probing += 1
+
+    def cancel(self):
+        """A search admitted by before_call never ran (e.g. no free browser): free its probe slot"""
+        with self.lock:
+            if self.state == HALF_OPEN and self.probing:
+                self.probing -= 1
+
+    def record_success(self):
+        with self.lock:
+            self.state = CLOSED
+            self.failures = 0
+            self.probing = 0
+
+    def record_failure(self, reason: str):
+        """Count an error, timeout or empty result"""
+        with self.lock:
+            self.failures += 1
+            self.last_failure = reason
+            if self.state == HALF_OPEN or self.failures >= self.failure_threshold:
+                if self.state != OPEN:
+                    self.times_opened += 1
+                self.state = OPEN
+                self.opened_at = time.monotonic()
+                self.probing = 0
+
+    def get_stats(self) -> Dict:
+        with self.lock:
+            retry_in = self.opened_at + self.reset_timeout - time.monotonic() if self.state == OPEN else 0
+            return {
+                'state': self.state,
+                'consecutive_failures': self.failures,
+                'last_failure': self.last_failure,
+                'retry_in_seconds': round(max(0.0, retry_in), 1),
+                'times_opened': self.times_opened,
+                'rejected': self.rejected
+            }
@@ -0,0 +1,181 @@
+"""
+Structured logging for the backend
+Records are enqueued on the calling thread and written by a background listener,
+as JSON lines or readable text, with request ID and platform fields attached
+"""
+from logging.handlers import QueueHandler, QueueListener
+import json
+import logging
+import os
+import queue
+import sys
+import threading
+import time
+
+from .tracing import current_request_id
+
+ROOT = 'jarvis'
+
+# Attributes every LogRecord has; anything else came in through `extra`
+_RESERVED = set(vars(logging.LogRecord('', 0, '', 0, '', (), None))) | {'message', 'asctime'}
+
+_listener = None
+_lock = threading.Lock()
+
+
+class ContextFilter(logging.Filter):
+    """Stamps the current request ID onto each record (runs on the calling thread, before queueing)"""
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        if not getattr(record, 'request_id', None):
+            record.request_id = current_request_id()
+        return True
+
+
+class SamplingFilter(logging.Filter):
+    """
+    Keeps 1 in `every` records marked `extra={'sample': key}` (per key), so
+    per-item messages stay cheap under load; unmarked records always pass
+    """
+
+    def __init__(self, every: int = 100):
+        super().__init__()
+        self.every = max(1, every)
+        self.counts = {}
+        self.lock = threading.Lock()  # Records are filtered on the logging threads, not the listener
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        key = getattr(record, 'sample', None)
+        if key is None:
+            return True
+
+        with self.lock:
+            count = self.counts.get(key, 0)
+            self.counts[key] = count + 1
+        if count % self.every:
+            return False
+
+        record.sampled = self.every
+        return True
+
+
+class ContextQueueHandler(QueueHandler):
+    """QueueHandler that keeps `extra` fields intact for the listener's formatter"""
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        record.message = record.getMessage()
+        record.msg = record.message
+        record.args = None
+        if record.exc_info:
+            record.exc_text = logging.Formatter().formatException(record.exc_info)
+            record.exc_info = None
+        return record
+
+
+class JsonFormatter(logging.Formatter):
+    """One JSON object per line"""
+
+    def format(self, record: logging.LogRecord) -> str:
+        entry = {
+            'ts': time.strftime('%Y-%m-%dT%H:%M:%S', time.localtime(record.created)) + f".{int(record.msecs):03d}",
+            'level': record.levelname.lower(),
+            'logger': record.name,
+            'msg': record.getMessage(),
+            'thread': record.threadName
+        }
+        for key, value in record.__dict__.items():
+            if key not in _RESERVED and key != 'sample' and value is not None:
+                entry[key] = value
+        if record.exc_text:
+            entry['exception'] = record.exc_text
+
+        return json.dumps(entry, ensure_ascii=False, default=str)
+
+
+class TextFormatter(logging.Formatter):
+    """Readable single-line format with structured fields appended as key=value"""
+
+    def __init__(self):
+        super().__init__('%(asctime)s %(levelname)-7s %(name)s: %(message)s', '%H:%M:%S')
+
+    def format(self, record: logging.LogRecord) -> str:
+        line = super().format(record)
+        fields = [
+            f"{key}={value}" for key, value in record.__dict__.items()
+            if key not in _RESERVED and key != 'sample' and value is not None
+        ]
+        return f"{line} [{' '.join(fields)}]" if fields else line
+
+
+class FieldsAdapter(logging.LoggerAdapter):
+    """Logger adapter that merges fixed fields (e.g. platform) with per-call `extra`"""
+
+    def process(self, msg, kwargs):
+        kwargs['extra'] = {**self.extra, **kwargs.get('extra', {})}
+        return msg, kwargs
+
+
+def get_logger(name: str, **fields):
+    """Logger under the `jarvis` namespace, optionally with fixed fields such as platform"""
+    if name == '__main__':
+        name = 'app'
+    logger = logging.getLogger(f"{ROOT}.{name}")
+    return FieldsAdapter(logger, fields) if fields else logger
+
+
+def configure_logging(level: str = 'INFO', fmt: str = 'text', sample_every: int = 100, stream=None):
+    """
+    Route `jarvis.*` loggers through a queue to a background writer (idempotent)
+
+    Args:
+        level: Minimum level (DEBUG, INFO, WARNING, ...)
+        fmt: 'json' for JSON lines, 'text' for readable output
+        sample_every: Keep 1 in N per-item records (those logged with extra={'sample': ...})
+        stream: Output stream (default stdout)
+    """
+    global _listener
+
+    with _lock:
+        if _listener is not None:
+            return _listener
+
+        output = logging.StreamHandler(stream or sys.stdout)
+        output.setFormatter(JsonFormatter() if fmt == 'json' else TextFormatter())
+
+        records = queue.SimpleQueue()
+        handler = ContextQueueHandler(records)
+        handler.addFilter(SamplingFilter(sample_every))
+        handler.addFilter(ContextFilter())
+
+        root = logging.getLogger(ROOT)
+        root.handlers = [handler]
+        root.setLevel(level.upper())
+        root.propagate = False
+
+        _listener = QueueListener(records, output, respect_handler_level=True)
+        _listener.start()
+        return _listener
+
+
+def _restart_after_fork():
+    """Threads don't survive fork: a pre-fork server's workers each need their own writer"""
+    global _listener
+
+    if _listener is not None:
+        _listener = QueueListener(_listener.queue, *_listener.handlers, respect_handler_level=True)
+        _listener.start()
+
+
+if hasattr(os, 'register_at_fork'):
+    os.register_at_fork(after_in_child=_restart_after_fork)
+
+
+def shutdown_logging():
+    """Flush queued records and stop the writer thread"""
+    global _listener
+
+    with _lock:
+        if _listener is not None:
+            _listener.stop()
+            _listener = None
+
@@ -0,0 +1,226 @@
+"""
+Metrics - In-process counters, gauges and histograms
+Rendered at /metrics in the Prometheus text exposition format (no client library needed)
+"""
+from contextlib import contextmanager
+from typing import Callable, Dict, List, Tuple
+import math
+import threading
+import time
+
+from .logger import get_logger
+
+log = get_logger('metrics')
+
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10)
+SCRAPE_BUCKETS = (0.05, 0.1, 0.25, 0.5, 1, 2, 3, 5, 8, 12, 20, 30)
+
+
+def _escape(value) -> str:
+    return str(value).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+
+
+def _format_labels(names: Tuple[str, ...], values: Tuple, extra: str = '') -> str:
+    pairs = [f'{name}="{_escape(value)}"' for name, value in zip(names, values)]
+    if extra:
+        pairs.append(extra)
+    return '{' + ','.join(pairs) + '}' if pairs else ''
+
+
+def _format_value(value: float) -> str:
+    if value == math.inf:
+        return '+Inf'
+    if isinstance(value, float) and value.is_integer():
+        return str(int(value))
+    return repr(value)
+
+
+class Metric:
+    """Base for labelled metrics"""
+
+    kind = 'untyped'
+
+    def __init__(self, name: str, documentation: str, labels: Tuple[str, ...] = ()):
+        self.name = name
+        self.documentation = documentation
+        self.label_names = tuple(labels)
+        self.values = {}  # label values tuple -> state
+        self.lock = threading.Lock()
+
+    def _key(self, labels: Dict) -> Tuple:
+        return tuple(labels.get(name, '') for name in self.label_names)
+
+    def render(self) -> List[str]:
+        lines = [f"# HELP {self.name} {self.documentation}", f"# TYPE {self.name} {self.kind}"]
+        with self.lock:
+            for key, state in sorted(self.values.items()):
+                lines.extend(self._samples(key, state))
+        return lines
+
+    def _samples(self, key: Tuple, state) -> List[str]:
+        return [f"{self.name}{_format_labels(self.label_names, key)} {_format_value(state)}"]
+
+
+class Counter(Metric):
+    """Monotonically increasing count"""
+
+    kind = 'counter'
+
+    def inc(self, amount: float = 1, **labels):
+        key = self._key(labels)
+        with self.lock:
+            self.values[key] = self.values.get(key, 0) + amount
+
+    def get(self, **labels) -> float:
+        return self.values.get(self._key(labels), 0)
+
+
+class Gauge(Metric):
+    """Value that can go up and down"""
+
+    kind = 'gauge'
+
+    def set(self, value: float, **labels):
+        with self.lock:
+            self.values[self._key(labels)] = value
+
+    def inc(self, amount: float = 1, **labels):
+        key = self._key(labels)
+        with self.lock:
+            self.values[key] = self.values.get(key, 0) + amount
+
+    def dec(self, amount: float = 1, **labels):
+        self.inc(-amount, **labels)
+
+
+class Histogram(Metric):
+    """Cumulative bucketed observations with sum and count"""
+
+    kind = 'histogram'
+
+    def __init__(self, name: str, documentation: str, labels: Tuple[str, ...] = (),
+                 buckets: Tuple[float, ...] = DEFAULT_BUCKETS):
+        super().__init__(name, documentation, labels)
+        self.buckets = tuple(sorted(buckets)) + (math.inf,)
+
+    def observe(self, value: float, **labels):
+        key = self._key(labels)
+        with self.lock:
+            state = self.values.get(key)
+            if state is None:
+                state = self.values[key] = [[0] * len(self.buckets), 0.0, 0]
+            for i, bound in enumerate(self.buckets):
+                if value <= bound:
+                    state[0][i] += 1
+                    break
+            state[1] += value
+            state[2] += 1
+
+    @contextmanager
+    def time(self, **labels):
+        """Observe the duration of a block"""
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(time.perf_counter() - start, **labels)
+
+    def _samples(self, key: Tuple, state) -> List[str]:
+        counts, total, count = state
+        lines = []
+        cumulative = 0
+        for bound, bucket_count in zip(self.buckets, counts):
+            cumulative += bucket_count
+            le = f'le="{_format_value(float(bound))}"'
+            lines.append(f"{self.name}_bucket{_format_labels(self.label_names, key, le)} {cumulative}")
+        labels = _format_labels(self.label_names, key)
+        lines.append(f"{self.name}_sum{labels} {_format_value(total)}")
+        lines.append(f"{self.name}_count{labels} {count}")
+        return lines
+
+
+class MetricsRegistry:
+    """Named metrics plus callbacks that refresh gauges right before rendering"""
+
+    def __init__(self):
+        self.metrics = {}
+        self.collectors = []
+
+    def _register(self, metric: Metric) -> Metric:
+        if metric.name in self.metrics:
+            return self.metrics[metric.name]
+        self.metrics[metric.name] = metric
+        return metric
+
+    def counter(self, name: str, documentation: str, labels: Tuple[str, ...] = ()) -> Counter:
+        return self._register(Counter(name, documentation, labels))
+
+    def gauge(self, name: str, documentation: str, labels: Tuple[str, ...] = ()) -> Gauge:
+        return self._register(Gauge(name, documentation, labels))
+
+    def histogram(self, name: str, documentation: str, labels: Tuple[str, ...] = (),
+                  buckets: Tuple[float, ...] = DEFAULT_BUCKETS) -> Histogram:
+        return self._register(Histogram(name, documentation, labels, buckets))
+
+    def on_collect(self, callback: Callable[[], None]):
+        """Run `callback` before every render (e.g. to sample pool and queue sizes)"""
+        self.collectors.append(callback)
+
+    def render(self) -> str:
+        """All metrics in the text exposition format"""
+        for callback in self.collectors:
+            try:
+                callback()
+            except Exception as e:
+                log.warning("Metrics collector failed: %s", e)
+
+        lines = []
+        for metric in self.metrics.values():
+            lines.extend(metric.render())
+        return '\n'.join(lines) + '\n'
+
+
+REGISTRY = MetricsRegistry()
+CONTENT_TYPE = 'text/plain; version=0.0.4; charset=utf-8'
+
+# Scraping
+SCRAPE_SECONDS = REGISTRY.histogram(
+    'jarvis_scrape_seconds', 'End-to-end platform scrape latency', ('platform',), SCRAPE_BUCKETS)
+SCRAPE_PHASE_SECONDS = REGISTRY.histogram(
+    'jarvis_scrape_phase_seconds',
+    'Platform scrape latency by phase (driver_acquire, driver_setup, navigate, wait, extract)',
+    ('platform', 'phase'), SCRAPE_BUCKETS)
+SCRAPE_ERRORS = REGISTRY.counter(
+    'jarvis_scrape_errors_total', 'Scrape errors by platform and exception type', ('platform', 'type'))
+SCRAPE_PRODUCTS = REGISTRY.counter(
+    'jarvis_scrape_products_total', 'Products extracted per platform', ('platform',))
+THROTTLES = REGISTRY.counter(
+    'jarvis_rate_limit_throttles_total', 'Requests delayed or deferred by rate limits', ('platform', 'source'))
+
+CIRCUIT_STATE = REGISTRY.gauge(
+    'jarvis_circuit_state', 'Platform circuit breaker state (0 closed, 1 half-open, 2 open)', ('platform',))
+CIRCUIT_REJECTIONS = REGISTRY.counter(
+    'jarvis_circuit_rejections_total', 'Platform searches skipped because the circuit was open', ('platform',))
+
+HEDGES = REGISTRY.counter(
+    'jarvis_hedged_scrapes_total',
+    'Hedged platform scrapes by outcome (launched, won, lost, over_budget, no_browser)', ('platform', 'outcome'))
+
+DRIVER_RECYCLES = REGISTRY.counter(
+    'jarvis_driver_recycles_total',
+    'Browser drivers replaced by reason (navigations, memory, crashed, unresponsive)', ('platform', 'reason'))
+
+# Cache
+CACHE_REQUESTS = REGISTRY.counter(
+    'jarvis_cache_requests_total', 'Search cache lookups by result (hit, miss, stale)', ('result',))
+
+# Capacity
+POOL_SIZE = REGISTRY.gauge('jarvis_browser_pool_size', 'Max browsers per platform pool', ('platform',))
+POOL_INSTANCES = REGISTRY.gauge('jarvis_browser_pool_instances', 'Scraper instances created per pool', ('platform',))
+POOL_IN_USE = REGISTRY.gauge('jarvis_browser_pool_in_use', 'Browsers currently borrowed per pool', ('platform',))
+ACTIVE_SCRAPES = REGISTRY.gauge('jarvis_active_scrapes', 'Searches currently scraping (cache misses)')
+QUEUE_DEPTH = REGISTRY.gauge('jarvis_queue_depth', 'Items waiting in background queues', ('queue',))
+
+# HTTP
+REQUEST_SECONDS = REGISTRY.histogram(
+    'jarvis_http_request_seconds', 'HTTP request latency by endpoint', ('endpoint', 'method', 'status'))
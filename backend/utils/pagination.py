@@ -0,0 +1,66 @@
+"""
+Pagination - Opaque cursors and field projection for search results
+A cursor pins a page request to one cached result snapshot, so later pages never re-scrape
+"""
+from typing import Dict, List, Optional
+import base64
+import json
+
+# Fields of Product.to_dict() clients may project
+PRODUCT_FIELDS = (
+    'title', 'price', 'price_numeric', 'rating', 'url', 'platform',
+    'image', 'availability', 'discount', 'listing_id', 'product_id'
+)
+
+MAX_PAGE_SIZE = 100
+
+
+def encode_cursor(state: Dict) -> str:
+    """URL-safe opaque token for the next page"""
+    raw = json.dumps(state, separators=(',', ':'), sort_keys=True).encode('utf-8')
+    return base64.urlsafe_b64encode(raw).decode('ascii').rstrip('=')
+
+
+def decode_cursor(cursor: str) -> Dict:
+    """Inverse of encode_cursor (ValueError if the token is malformed)"""
+    try:
+        raw = base64.urlsafe_b64decode(cursor + '=' * (-len(cursor) % 4))
+        state = json.loads(raw)
+    except (ValueError, TypeError) as e:
+        raise ValueError('Invalid cursor') from e
+
+    if not isinstance(state, dict) or not isinstance(state.get('offset'), int) or 'snapshot' not in state:
+        raise ValueError('Invalid cursor')
+    return state
+
+
+def parse_fields(fields) -> Optional[List[str]]:
+    """Projection list from a list or comma-separated string (None = all fields)"""
+    if not fields:
+        return None
+    if isinstance(fields, str):
+        fields = fields.split(',')
+
+    names = [str(name).strip() for name in fields if str(name).strip()]
+    unknown = [name for name in names if name not in PRODUCT_FIELDS]
+    if unknown:
+        raise ValueError(f"Unknown fields: {', '.join(unknown)} (allowed: {', '.join(PRODUCT_FIELDS)})")
+    return names
+
+
+def parse_page_size(page_size) -> Optional[int]:
+    """Validated page size (None = no paging)"""
+    if page_size is None:
+        return None
+    page_size = int(page_size)
+    if page_size < 1:
+        raise ValueError('page_size must be at least 1')
+    return min(page_size, MAX_PAGE_SIZE)
+
+
+def project(product, fields: Optional[List[str]]) -> Dict:
+    """Product as an API dict, restricted to `fields`"""
+    data = product.to_dict()
+    if fields is None:
+        return data
+    return {name: data[name] for name in fields if name in data}
@@ -0,0 +1,440 @@
+"""
+Price Alerts - Target-price alerts evaluated against every fresh scrape
+Alerts are indexed by canonical product and query token, so a scrape only touches candidate alerts
+"""
+from dataclasses import dataclass
+from typing import List, Dict, Optional, FrozenSet
+from datetime import datetime
+from itertools import islice
+import json
+import os
+import sqlite3
+import threading
+import time
+import uuid
+
+from . import shared_state
+from .product_matcher import ProductMatcher
+from .query_normalizer import search_tokens
+from .product import Product
+from .logger import get_logger
+
+log = get_logger('alerts')
+
+
+@dataclass(slots=True)
+class PriceAlert:
+    """A target price for a canonical product or a search query"""
+    alert_id: str
+    target_price: float
+    query: Optional[str] = None
+    product_id: Optional[str] = None
+    platforms: Optional[FrozenSet[str]] = None  # None = any platform
+    tokens: FrozenSet[str] = frozenset()  # Normalized query tokens, all must appear in the title
+    anchor: Optional[str] = None  # Token the alert is indexed under
+    created_at: str = ''
+
+    def to_dict(self) -> Dict:
+        return {
+            'alert_id': self.alert_id,
+            'target_price': self.target_price,
+            'query': self.query,
+            'product_id': self.product_id,
+            'platforms': sorted(self.platforms) if self.platforms else None,
+            'created_at': self.created_at
+        }
+
+
+class LogAlertSink:
+    """Prints notifications to the console"""
+
+    def send(self, notification: Dict):
+        log.info("Price alert %s: %s at %s", notification['alert_id'], notification['title'],
+                 notification['price'], extra={'platform': notification['platform']})
+
+
+class JsonlAlertSink:
+    """Appends notifications to a local JSONL file (one line per notification)"""
+
+    def __init__(self, path: str):
+        self.path = path
+        directory = os.path.dirname(self.path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
+    def send(self, notification: Dict):
+        with open(self.path, 'a', encoding='utf-8') as f:
+            f.write(json.dumps(notification, ensure_ascii=False) + '\n')
+
+
+class PriceAlertEngine:
+    """
+    Registry of price alerts with an inverted index for O(matches) evaluation
+
+    Alerts live in SQLite shared by every worker process: each process indexes them in memory
+    and pulls changes from the event log, and an alert fires in whichever process claims it
+    first (deleting its row), so it notifies once.
+    """
+
+    SYNC_INTERVAL = 1.0  # Seconds between event pulls on the scrape path
+
+    SCHEMA = """
+        CREATE TABLE IF NOT EXISTS alerts (
+            alert_id TEXT PRIMARY KEY,
+            record TEXT NOT NULL
+        );
+        -- Every add and removal, in order; processes replay what they haven't seen
+        CREATE TABLE IF NOT EXISTS alert_events (
+            seq INTEGER PRIMARY KEY AUTOINCREMENT,
+            type TEXT NOT NULL,
+            alert_id TEXT NOT NULL,
+            record TEXT
+        );
+        CREATE TABLE IF NOT EXISTS alert_notifications (
+            seq INTEGER PRIMARY KEY AUTOINCREMENT,
+            record TEXT NOT NULL
+        );
+    """
+
+    def __init__(self, catalog=None, matcher: ProductMatcher = None, sinks: List = None, path: str = None,
+                 recent_limit: int = 100, legacy_log: str = None):
+        """
+        Args:
+            path: SQLite database shared by the worker processes (None = in memory, this process only)
+            recent_limit: Notifications kept for get_recent
+            legacy_log: JSONL alert log from older versions, imported into an empty database
+        """
+        self.catalog = catalog
+        self.matcher = matcher or (catalog.matcher if catalog else ProductMatcher())
+        self.sinks = sinks if sinks is not None else [LogAlertSink()]
+        self.path = path
+        self.recent_limit = recent_limit
+        self.alerts = {}  # alert id -> PriceAlert
+        self.by_product = {}  # product id -> {alert ids}
+        self.by_token = {}  # anchor token -> {alert ids}
+        self.watches = {}  # query kept fresh for alerts -> number of alerts watching it
+        self.event_seq = 0  # Last alert_events row applied
+        self.next_sync = 0.0
+        self.lock = threading.Lock()
+
+        self.conn = shared_state.connect(path)
+        self.conn.executescript(self.SCHEMA)
+        if legacy_log:
+            self._import_log(legacy_log)
+        self._load()
+
+    def tokenize(self, text: str) -> FrozenSet[str]:
+        """Tokens without connective words, with units folded as in the search index ("128 GB" -> "128gb")"""
+        return frozenset(search_tokens(text))
+
+    def add_alert(self, target_price: float, query: str = None, product_id: str = None,
+                  platforms: List[str] = None) -> PriceAlert:
+        """
+        Register an alert
+
+        Args:
+            target_price: Notify when a listing is at or below this price
+            query: Search query whose tokens must all appear in the title, or
+            product_id: Canonical catalog product id
+            platforms: Restrict to these platforms (None = all)
+        """
+        if not query and not product_id:
+            raise ValueError('query or product_id is required')
+        # A bare string would become a set of its characters
+        if platforms is not None and (not isinstance(platforms, (list, tuple))
+                                      or not all(isinstance(platform, str) for platform in platforms)):
+            raise ValueError('platforms must be a list of platform names')
+
+        tokens = self.tokenize(query) if query and not product_id else frozenset()
+        if query and not product_id and not tokens:
+            raise ValueError('query has no searchable words')
+
+        alert = PriceAlert(
+            alert_id=uuid.uuid4().hex[:12],
+            target_price=float(target_price),
+            query=query,
+            product_id=product_id,
+            platforms=frozenset(platforms) if platforms else None,
+            tokens=tokens,
+            created_at=datetime.now().isoformat()
+        )
+
+        record = json.dumps(alert.to_dict(), ensure_ascii=False)
+        with self.lock:
+            with shared_state.transaction(self.conn, write=True):
+                self.conn.execute("INSERT INTO alerts (alert_id, record) VALUES (?, ?)", (alert.alert_id, record))
+                self.conn.execute("INSERT INTO alert_events (type, alert_id, record) VALUES ('alert', ?, ?)",
+                                  (alert.alert_id, record))
+                self._pull()
+
+        return self.alerts.get(alert.alert_id, alert)
+
+    def _index(self, alert: PriceAlert):
+        """Add to the product or token index (caller holds the lock)"""
+        self.alerts[alert.alert_id] = alert
+
+        watch = self._watch_query(alert)
+        if watch:
+            self.watches[watch] = self.watches.get(watch, 0) + 1
+
+        if alert.product_id:
+            self.by_product.setdefault(alert.product_id, set()).add(alert.alert_id)
+            return
+
+        # Index under the token shared by the fewest alerts (longest on ties) to keep candidate sets small
+        alert.anchor = min(alert.tokens, key=lambda token: (len(self.by_token.get(token, ())), -len(token)))
+        self.by_token.setdefault(alert.anchor, set()).add(alert.alert_id)
+
+    def remove_alert(self, alert_id: str, reason: str = 'removed') -> bool:
+        """Unregister an alert (in every worker process)"""
+        with self.lock:
+            with shared_state.transaction(self.conn, write=True):
+                removed = self._delete(alert_id, reason)
+                self._pull()
+            return removed
+
+    def _delete(self, alert_id: str, reason: str) -> bool:
+        """Delete an alert's row and log the removal; False if it was already gone (inside a write transaction)"""
+        if not self.conn.execute("DELETE FROM alerts WHERE alert_id = ?", (alert_id,)).rowcount:
+            return False
+        self.conn.execute("INSERT INTO alert_events (type, alert_id, record) VALUES ('removed', ?, ?)",
+                          (alert_id, json.dumps({'reason': reason})))
+        return True
+
+    def _unindex(self, alert_id: str):
+        """Drop an alert from the in-memory indexes (caller holds the lock)"""
+        alert = self.alerts.pop(alert_id, None)
+        if alert is None:
+            return
+
+        bucket = self.by_product.get(alert.product_id) if alert.product_id else self.by_token.get(alert.anchor)
+        bucket.discard(alert_id)
+        if not bucket:
+            if alert.product_id:
+                del self.by_product[alert.product_id]
+            else:
+                del self.by_token[alert.anchor]
+
+        watch = self._watch_query(alert)
+        if watch in self.watches:
+            self.watches[watch] -= 1
+            if not self.watches[watch]:
+                del self.watches[watch]
+
+    def _watch_query(self, alert: PriceAlert) -> Optional[str]:
+        """Search query that keeps an alert's listings fresh (product alerts use the canonical title)"""
+        if alert.query:
+            return alert.query.lower()
+        if self.catalog and alert.product_id:
+            product = self.catalog.get_product(alert.product_id)
+            if product:
+                return product['title'].lower()
+        return None
+
+    def sync(self, force: bool = True):
+        """Apply alerts added or removed by any worker process (force=False: at most every SYNC_INTERVAL)"""
+        if not force and time.monotonic() < self.next_sync:
+            return
+        with self.lock:
+            try:
+                with shared_state.transaction(self.conn):
+                    self._pull()
+            except sqlite3.Error as e:
+                log.warning("Alert sync failed: %s", e)
+
+    def _pull(self):
+        """Replay new alert events (caller holds the lock, inside a transaction)"""
+        rows = self.conn.execute(
+            "SELECT seq, type, alert_id, record FROM alert_events WHERE seq > ? ORDER BY seq", (self.event_seq,))
+        for seq, kind, alert_id, record in rows:
+            if kind == 'alert' and alert_id not in self.alerts:
+                self._index(self._from_record(json.loads(record)))
+            elif kind == 'removed':
+                self._unindex(alert_id)
+            self.event_seq = seq
+        self.next_sync = time.monotonic() + self.SYNC_INTERVAL
+
+    def _load(self):
+        """Index the active alerts and start following the event log from its end"""
+        with self.lock, shared_state.transaction(self.conn):
+            self.event_seq = self.conn.execute("SELECT COALESCE(MAX(seq), 0) FROM alert_events").fetchone()[0]
+            for (record,) in self.conn.execute("SELECT record FROM alerts"):
+                self._index(self._from_record(json.loads(record)))
+            self.next_sync = time.monotonic() + self.SYNC_INTERVAL
+
+        if self.path:
+            log.info("Alerts loaded: %d active", len(self.alerts))
+
+    def _from_record(self, record: Dict) -> PriceAlert:
+        query = record.get('query')
+        product_id = record.get('product_id')
+        return PriceAlert(
+            alert_id=record['alert_id'],
+            target_price=record['target_price'],
+            query=query,
+            product_id=product_id,
+            platforms=frozenset(record['platforms']) if record.get('platforms') else None,
+            tokens=self.tokenize(query) if query and not product_id else frozenset(),
+            created_at=record.get('created_at', '')
+        )
+
+    def watched_queries(self) -> Dict[str, int]:
+        """Queries with active alerts and how many alerts watch each"""
+        self.sync(force=False)
+        with self.lock:
+            return dict(self.watches)
+
+    def get_alert(self, alert_id: str) -> Optional[PriceAlert]:
+        self.sync()
+        return self.alerts.get(alert_id)
+
+    def list_alerts(self, product_id: str = None, limit: int = 100) -> List[Dict]:
+        """Registered alerts, optionally for one product"""
+        self.sync()
+        with self.lock:
+            if product_id:
+                alerts = (self.alerts[alert_id] for alert_id in self.by_product.get(product_id, ()))
+            else:
+                alerts = iter(self.alerts.values())
+            return [alert.to_dict() for alert in islice(alerts, limit)]
+
+    def evaluate(self, query: str, products: List[Product]) -> List[Dict]:
+        """
+        Match a scrape's results against registered alerts (ScraperManager listener)
+
+        Only alerts indexed under the products' canonical ids or title tokens are
+        examined. Alerts fire once and are then removed.
+        """
+        notifications = []
+        self.sync(force=False)
+
+        with self.lock:
+            if not self.alerts:
+                return notifications
+
+            for product in products:
+                price = product.price
+                if not price:
+                    continue
+
+                candidates = set()
+
+                product_id = product.product_id or (self.catalog.lookup(product) if self.catalog else None)
+                if product_id and product_id in self.by_product:
+                    candidates.update(self.by_product[product_id])
+
+                title_tokens = None
+                if self.by_token:
+                    title_tokens = self.tokenize(product.title)
+                    for token in title_tokens:
+                        if token in self.by_token:
+                            candidates.update(self.by_token[token])
+
+                for alert_id in candidates:
+                    alert = self.alerts.get(alert_id)
+                    if alert is None or price > alert.target_price:
+                        continue
+                    if alert.platforms and product.platform not in alert.platforms:
+                        continue
+                    if alert.tokens and not alert.tokens <= title_tokens:
+                        continue
+
+                    notification = self._fire(alert, product, product_id)
+                    if notification:
+                        notifications.append(notification)
+
+        for notification in notifications:
+            self._deliver(notification)
+
+        return notifications
+
+    def _fire(self, alert: PriceAlert, product: Product, product_id: Optional[str]) -> Optional[Dict]:
+        """
+        Claim and retire the alert and record the notification (caller holds the lock)
+        None if another worker process fired it first
+        """
+        notification = {
+            'alert_id': alert.alert_id,
+            'target_price': alert.target_price,
+            'query': alert.query,
+            'product_id': product_id,
+            'title': product.title,
+            'platform': product.platform,
+            'price': product.price_label,
+            'price_numeric': product.price,
+            'url': product.url,
+            'triggered_at': datetime.now().isoformat()
+        }
+
+        try:
+            with shared_state.transaction(self.conn, write=True):
+                if not self._delete(alert.alert_id, 'triggered'):
+                    notification = None
+                else:
+                    seq = self.conn.execute("INSERT INTO alert_notifications (record) VALUES (?)",
+                                            (json.dumps(notification, ensure_ascii=False),)).lastrowid
+                    self.conn.execute("DELETE FROM alert_notifications WHERE seq <= ?", (seq - self.recent_limit,))
+        except sqlite3.Error as e:
+            log.warning("Alert claim failed: %s", e)
+            return None
+
+        self._unindex(alert.alert_id)
+        return notification
+
+    def _deliver(self, notification: Dict):
+        for sink in self.sinks:
+            try:
+                sink.send(notification)
+            except Exception as e:
+                log.warning("Alert delivery failed (%s): %s", type(sink).__name__, e)
+
+    def get_recent(self, limit: int = 50) -> List[Dict]:
+        """Most recent notifications (from every worker process), newest first"""
+        with self.lock:
+            rows = self.conn.execute(
+                "SELECT record FROM alert_notifications ORDER BY seq DESC LIMIT ?", (limit,)).fetchall()
+        return [json.loads(record) for (record,) in rows]
+
+    def _import_log(self, path: str):
+        """Copy a JSONL alert log's active alerts into an empty database (renamed to *.imported afterwards)"""
+        if not os.path.exists(path):
+            return
+
+        with shared_state.transaction(self.conn, write=True):
+            if self.conn.execute("SELECT 1 FROM alert_events LIMIT 1").fetchone():
+                return
+
+            records = {}
+            with open(path, encoding='utf-8') as f:
+                for line in f:
+                    try:
+                        record = json.loads(line)
+                    except ValueError:
+                        continue  # Torn write at the end of the log
+
+                    if record.get('type') == 'alert':
+                        records[record['alert_id']] = {k: v for k, v in record.items() if k != 'type'}
+                    elif record.get('type') == 'removed':
+                        records.pop(record.get('alert_id'), None)
+
+            for alert_id, record in records.items():
+                record = json.dumps(record, ensure_ascii=False)
+                self.conn.execute("INSERT INTO alerts (alert_id, record) VALUES (?, ?)", (alert_id, record))
+                self.conn.execute("INSERT INTO alert_events (type, alert_id, record) VALUES ('alert', ?, ?)",
+                                  (alert_id, record))
+
+        os.replace(path, path + '.imported')
+        log.info("Imported alert log %s: %d active alerts", path, len(records))
+
+    def get_stats(self) -> Dict:
+        """Get alert engine statistics"""
+        self.sync(force=False)
+        with self.lock:
+            triggered = self.conn.execute("SELECT COALESCE(MAX(seq), 0) FROM alert_notifications").fetchone()[0]
+            return {
+                'active': len(self.alerts),
+                'by_product': sum(len(ids) for ids in self.by_product.values()),
+                'by_query': sum(len(ids) for ids in self.by_token.values()),
+                'triggered': triggered,
+                'sinks': [type(sink).__name__ for sink in self.sinks]
+            }
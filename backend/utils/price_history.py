@@ -0,0 +1,224 @@
+"""
+Price History - Append-only time series of every scraped price
+Observations are queued on the search path and written in batches by a background thread
+"""
+from typing import List, Dict, Optional
+import os
+import queue
+import sqlite3
+import threading
+import time
+
+from .product import Product
+from .logger import get_logger
+
+log = get_logger('history')
+
+
+class PriceHistoryStore:
+    """SQLite-backed price history with batched writes and downsampled range queries"""
+
+    SCHEMA = """
+        CREATE TABLE IF NOT EXISTS listings (
+            id INTEGER PRIMARY KEY,
+            key TEXT NOT NULL UNIQUE,
+            platform TEXT NOT NULL,
+            product_id TEXT
+        );
+        CREATE INDEX IF NOT EXISTS idx_listings_product ON listings (product_id);
+
+        -- Clustered by (listing, ts) so a range query is one index scan
+        CREATE TABLE IF NOT EXISTS observations (
+            listing_id INTEGER NOT NULL,
+            ts INTEGER NOT NULL,
+            price REAL NOT NULL,
+            PRIMARY KEY (listing_id, ts)
+        ) WITHOUT ROWID;
+    """
+
+    def __init__(self, path: str, catalog=None, batch_size: int = 500, flush_interval: float = 1.0,
+                 max_pending: int = 10000):
+        self.path = path
+        self.catalog = catalog
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.pending = queue.Queue(maxsize=max_pending)
+        self.listing_ids = {}  # listing key -> (row id, product id); writer thread only
+        self.written = 0
+        self.dropped = 0
+
+        directory = os.path.dirname(self.path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
+        self.writer_conn = self._connect()
+        self.writer_conn.executescript(self.SCHEMA)
+
+        self.writer = threading.Thread(target=self._writer_loop, name='price-history-writer', daemon=True)
+        self.writer.start()
+
+    def _connect(self) -> sqlite3.Connection:
+        conn = sqlite3.connect(self.path, check_same_thread=False)
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute("PRAGMA synchronous=NORMAL")
+        return conn
+
+    def record(self, query: str, products: List[Product]):
+        """Queue a scrape's observations (never blocks the caller)"""
+        if not products:
+            return
+
+        try:
+            self.pending.put_nowait((int(time.time()), products))
+        except queue.Full:
+            self.dropped += len(products)
+
+    def _writer_loop(self):
+        """Drain the queue and write batches until a None sentinel arrives"""
+        rows = []
+        deadline = time.monotonic() + self.flush_interval
+        running = True
+
+        while running:
+            try:
+                item = self.pending.get(timeout=max(0.0, deadline - time.monotonic()))
+                if item is None:
+                    running = False
+                else:
+                    rows.extend(self._to_rows(*item))
+            except queue.Empty:
+                pass
+
+            if rows and (len(rows) >= self.batch_size or time.monotonic() >= deadline or not running):
+                self._write(rows)
+                rows = []
+
+            if time.monotonic() >= deadline:
+                deadline = time.monotonic() + self.flush_interval
+
+    def _to_rows(self, ts: int, products: List[Product]) -> List[tuple]:
+        return [(product, ts) for product in products if product.price]
+
+    def _listing(self, product: Product) -> tuple:
+        """
+        (listing key, platform, product id) for a queued observation
+        Looked up when the batch is written: scrapes are recorded before the request assigns
+        their new listings to catalog products
+        """
+        if self.catalog:
+            product_id = product.product_id or self.catalog.lookup(product)
+            return self.catalog.listing_key(product), product.platform, product_id
+        return f"{product.platform}:{product.url}", product.platform, product.product_id
+
+    def _listing_id(self, key: str, platform: str, product_id: Optional[str]) -> int:
+        """Row id for a listing, creating it (or attaching a newly known product id)"""
+        cached = self.listing_ids.get(key)
+        if cached and (product_id is None or cached[1] == product_id):
+            return cached[0]
+
+        conn = self.writer_conn
+        conn.execute("INSERT OR IGNORE INTO listings (key, platform, product_id) VALUES (?, ?, ?)",
+                     (key, platform, product_id))
+        if product_id:
+            conn.execute("UPDATE listings SET product_id = ? WHERE key = ?", (product_id, key))
+        row_id = conn.execute("SELECT id FROM listings WHERE key = ?", (key,)).fetchone()[0]
+
+        self.listing_ids[key] = (row_id, product_id)
+        return row_id
+
+    def _write(self, rows: List[tuple]):
+        try:
+            with self.writer_conn:
+                self.writer_conn.executemany(
+                    "INSERT OR REPLACE INTO observations (listing_id, ts, price) VALUES (?, ?, ?)",
+                    [(self._listing_id(*self._listing(product)), ts, product.price) for product, ts in rows]
+                )
+            self.written += len(rows)
+        except sqlite3.Error as e:
+            # Listing rows created in the rolled-back transaction are gone; re-read ids as needed
+            self.listing_ids.clear()
+            log.warning("Price history write failed: %s", e)
+
+    def query_series(self, listing: str = None, product_id: str = None, platform: str = None,
+                     start: int = None, end: int = None, buckets: int = 60) -> Dict:
+        """
+        Downsampled price series for a listing key or canonical product
+
+        Args:
+            listing: Listing key (e.g. "Amazon:B0CHX1W1XY")
+            product_id: Canonical catalog product id (all its listings)
+            platform: Restrict to one platform
+            start, end: Unix timestamps (default: last 30 days)
+            buckets: Number of time buckets to downsample into
+
+        Returns:
+            Dict with bucket width and points of {ts, min, max, last, count}
+        """
+        end = int(end or time.time())
+        start = int(start or end - 30 * 86400)
+        width = max(1, (end - start) // max(1, buckets))
+
+        conditions = ["o.ts >= ?", "o.ts <= ?"]
+        params = [start, end]
+        if listing:
+            conditions.append("l.key = ?")
+            params.append(listing)
+        if product_id:
+            conditions.append("l.product_id = ?")
+            params.append(product_id)
+        if platform:
+            conditions.append("l.platform = ?")
+            params.append(platform)
+        where = " AND ".join(conditions)
+
+        source = f"FROM observations o JOIN listings l ON l.id = o.listing_id WHERE {where}"
+        bucket = "(o.ts - ?) / ?"
+
+        conn = self._connect()
+        try:
+            aggregates = conn.execute(
+                f"SELECT {bucket} AS b, MIN(o.price), MAX(o.price), COUNT(*) {source} GROUP BY b ORDER BY b",
+                [start, width] + params
+            ).fetchall()
+            # A lone MAX() makes SQLite return the bare column from the latest row
+            latest = dict(
+                (b, price) for b, _, price in conn.execute(
+                    f"SELECT {bucket} AS b, MAX(o.ts), o.price {source} GROUP BY b",
+                    [start, width] + params
+                )
+            )
+        finally:
+            conn.close()
+
+        return {
+            'start': start,
+            'end': end,
+            'bucket_seconds': width,
+            'points': [
+                {
+                    'ts': start + b * width,
+                    'min': low,
+                    'max': high,
+                    'last': latest.get(b),
+                    'count': count
+                }
+                for b, low, high, count in aggregates
+            ]
+        }
+
+    def close(self, timeout: float = 5.0):
+        """Flush pending observations and stop the writer"""
+        if self.writer.is_alive():
+            try:
+                self.pending.put(None, timeout=timeout)
+            except queue.Full:
+                return
+            self.writer.join(timeout)
+
+    def get_stats(self) -> Dict:
+        """Get history store statistics"""
+        return {
+            'pending_batches': self.pending.qsize(),
+            'observations_written': self.written,
+            'observations_dropped': self.dropped
+        }
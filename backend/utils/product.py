@@ -0,0 +1,141 @@
+"""
+Typed product record shared by scrapers, the manager, matching and analytics
+Fields are parsed once at scrape time and serialized to the API shapes at the edge
+"""
+from dataclasses import dataclass
+from enum import Enum
+from typing import Dict, Optional
+import re
+import sys
+
+
+class Availability(Enum):
+    """Stock status as reported by the platform"""
+    IN_STOCK = 'In Stock'
+    AVAILABLE = 'Available'
+    OUT_OF_STOCK = 'Out of Stock'
+
+
+def parse_price(price_str) -> Optional[float]:
+    """Extract numeric price from a string like '₹54,999.00' (None if missing)"""
+    if not price_str or price_str == "N/A":
+        return None
+
+    cleaned = re.sub(r'[^\d.]', '', str(price_str))
+    try:
+        return float(cleaned)
+    except ValueError:
+        return None
+
+
+def parse_rating(rating) -> Optional[float]:
+    """Extract numeric rating from '4.5⭐', '4.5/5' or '4.5 out of 5 stars' (None if unavailable)"""
+    if rating is None or rating in ('N/A', '—', ''):
+        return None
+    if isinstance(rating, (int, float)):
+        return float(rating)
+
+    match = re.search(r'\d+(?:\.\d+)?', str(rating))
+    if not match:
+        return None
+
+    value = float(match.group(0))
+    return value if 0 <= value <= 5 else None
+
+
+def format_price(value: Optional[float]) -> str:
+    """Format numeric price as a Rupee string"""
+    if value is None:
+        return 'N/A'
+
+    if value >= 100:
+        return f"₹{value:,.0f}"
+
+    return f"₹{value:,.2f}"
+
+
+@dataclass(slots=True)
+class Product:
+    """Compact product listing (numeric fields, interned platform, enum availability)"""
+    title: str
+    platform: str
+    price: Optional[float] = None
+    price_text: Optional[str] = None  # Display price as scraped
+    rating: Optional[float] = None
+    discount: Optional[int] = None
+    url: str = '#'
+    image: str = ''
+    availability: Availability = Availability.IN_STOCK
+    listing_id: Optional[str] = None
+    product_id: Optional[str] = None  # Canonical catalog id, attached after matching
+
+    def __post_init__(self):
+        self.platform = sys.intern(self.platform)
+
+    @property
+    def price_label(self) -> str:
+        return self.price_text or format_price(self.price)
+
+    @property
+    def rating_label(self) -> str:
+        return f"{self.rating:.1f}⭐" if self.rating is not None else 'N/A'
+
+    def to_dict(self) -> Dict:
+        """Serialize to the JARVIS API shape"""
+        data = {
+            'title': self.title,
+            'price': self.price_label,
+            'price_numeric': self.price,
+            'rating': self.rating_label,
+            'url': self.url,
+            'platform': self.platform,
+            'image': self.image,
+            'availability': self.availability.value,
+            'discount': self.discount,
+            'listing_id': self.listing_id
+        }
+        if self.product_id is not None:
+            data['product_id'] = self.product_id
+        return data
+
+    def to_pro_dict(self) -> Dict:
+        """Serialize to the app_pro API shape (priceValue, 'x/5' ratings)"""
+        return {
+            'title': self.title,
+            'price': format_price(self.price),
+            'priceValue': self.price,
+            'rating': f"{self.rating:g}/5" if self.rating is not None else '—',
+            'url': self.url,
+            'platform': self.platform,
+            'image': self.image
+        }
+
+    @classmethod
+    def from_dict(cls, data: Dict) -> 'Product':
+        """Parse either API shape (e.g. products posted back to /api/compare)"""
+        price = data.get('price_numeric')
+        if price is None:
+            price = data.get('priceValue')
+        if price is None:
+            price = parse_price(data.get('price'))
+
+        try:
+            availability = Availability(data.get('availability', 'In Stock'))
+        except ValueError:
+            availability = Availability.IN_STOCK
+
+        discount = data.get('discount')
+
+        return cls(
+            title=data.get('title', ''),
+            platform=data.get('platform', 'Unknown'),
+            price=float(price) if price is not None else None,
+            price_text=data.get('price') if isinstance(data.get('price'), str) and data.get('price') != 'N/A' else None,
+            rating=parse_rating(data.get('rating')),
+            discount=int(discount) if discount else None,
+            url=data.get('url') or '#',
+            image=data.get('image') or '',
+            availability=availability,
+            listing_id=data.get('listing_id'),
+            product_id=data.get('product_id')
+        )
@@ -0,0 +1,350 @@
+"""
+Product Catalog - Canonical product IDs for scraped listings
+Each listing is matched against known products once; repeat lookups are O(1)
+"""
+from typing import List, Dict, Optional
+from urllib.parse import unquote, urlsplit
+import json
+import os
+import re
+import sqlite3
+import threading
+import time
+import uuid
+
+from . import shared_state
+from .product_matcher import ProductMatcher
+from .product import Product
+from .logger import get_logger
+
+log = get_logger('catalog')
+
+
+class ProductCatalog:
+    """
+    Catalog mapping platform listings to canonical products, shared by every worker process
+
+    Products and listings are rows in SQLite; each process keeps them in memory and pulls rows
+    added by other processes. Assignment happens under the database's write lock, so one
+    listing never gets two product ids.
+    """
+
+    ASIN_PATTERN = re.compile(r'/(?:dp|gp/product)/([A-Z0-9]{10})')
+    PID_PATTERN = re.compile(r'[?&]pid=([A-Z0-9]+)')
+    SYNC_INTERVAL = 1.0  # Seconds between pulls triggered by lookup misses
+
+    SCHEMA = """
+        CREATE TABLE IF NOT EXISTS catalog_products (
+            seq INTEGER PRIMARY KEY AUTOINCREMENT,
+            product_id TEXT NOT NULL UNIQUE,
+            title TEXT NOT NULL,
+            brand TEXT NOT NULL
+        );
+        CREATE TABLE IF NOT EXISTS catalog_listings (
+            seq INTEGER PRIMARY KEY AUTOINCREMENT,
+            listing TEXT NOT NULL UNIQUE,
+            product_id TEXT NOT NULL
+        );
+    """
+
+    def __init__(self, matcher: ProductMatcher = None, path: str = None, threshold: float = 0.6,
+                 legacy_log: str = None):
+        """
+        Args:
+            path: SQLite database shared by the worker processes (None = in memory, this process only)
+            legacy_log: JSONL catalog log from older versions, imported into an empty database
+        """
+        self.matcher = matcher or ProductMatcher()
+        self.path = path
+        self.threshold = threshold
+        self.listings = {}  # listing key -> product id
+        self.products = {}  # product id -> canonical product record
+        self.by_brand = {}  # brand -> [product ids], narrows fuzzy matching
+        self.product_seq = 0  # Last catalog_products row pulled
+        self.listing_seq = 0  # Last catalog_listings row pulled
+        self.next_sync = 0.0
+        self.lock = threading.Lock()
+
+        self.conn = shared_state.connect(path)
+        self.conn.executescript(self.SCHEMA)
+        if legacy_log:
+            self._import_log(legacy_log)
+        self.sync()
+
+        if self.path:
+            log.info("Catalog loaded: %d products, %d listings", len(self.products), len(self.listings))
+
+    def listing_key(self, product: Product) -> str:
+        """Stable key for a listing: platform id (ASIN/data-id/pid), else URL, else title"""
+        platform = product.platform
+
+        if product.listing_id:
+            return f"{platform}:{product.listing_id}"
+
+        url = product.url or '#'
+        if url != '#':
+            decoded = unquote(url)
+            asin = self.ASIN_PATTERN.search(decoded)
+            if asin:
+                return f"{platform}:{asin.group(1)}"
+
+            pid = self.PID_PATTERN.search(decoded)
+            if pid:
+                return f"{platform}:{pid.group(1)}"
+
+            parts = urlsplit(url)
+            return f"{platform}:{parts.netloc}{parts.path}"
+
+        return f"{platform}:{self.matcher.normalize_title(product.title)}"
+
+    def lookup(self, product: Product) -> Optional[str]:
+        """Canonical product ID for an already-seen listing (None if unknown)"""
+        key = self.listing_key(product)
+        product_id = self.listings.get(key)
+        if product_id is None and self.path and time.monotonic() >= self.next_sync:
+            # Another worker may have assigned it since the last pull
+            self.sync()
+            product_id = self.listings.get(key)
+        return product_id
+
+    def assign(self, product: Product) -> str:
+        """Assign a listing to a canonical product, creating one if nothing matches"""
+        key = self.listing_key(product)
+
+        product_id = self.listings.get(key)
+        if product_id:
+            return product_id
+
+        with self.lock:
+            try:
+                with shared_state.transaction(self.conn, write=True):
+                    # Another thread or worker may have assigned it, or added a product it matches
+                    self._pull()
+                    product_id = self.listings.get(key)
+                    if product_id:
+                        return product_id
+
+                    brand = self.matcher.extract_brand(product.title)
+                    product_id = self._find_match(product, brand)
+                    if product_id is None:
+                        product_id = uuid.uuid4().hex[:12]
+                        self.conn.execute(
+                            "INSERT INTO catalog_products (product_id, title, brand) VALUES (?, ?, ?)",
+                            (product_id, product.title, brand))
+                        self._add_product(product_id, product.title, brand)
+                    self.conn.execute("INSERT INTO catalog_listings (listing, product_id) VALUES (?, ?)",
+                                      (key, product_id))
+            except sqlite3.Error as e:
+                # Keep serving from memory; this process's mapping just isn't shared until restart
+                log.warning("Catalog write failed: %s", e)
+                brand = self.matcher.extract_brand(product.title)
+                product_id = self._find_match(product, brand)
+                if product_id is None:
+                    product_id = uuid.uuid4().hex[:12]
+                    self._add_product(product_id, product.title, brand)
+
+            self._add_listing(key, product_id)
+
+        return product_id
+
+    def _find_match(self, product: Product, brand: str) -> Optional[str]:
+        """Find an existing product this listing belongs to"""
+        if brand == "Unknown":
+            candidates = list(self.products)
+        else:
+            candidates = self.by_brand.get(brand, []) + self.by_brand.get("Unknown", [])
+
+        for product_id in candidates:
+            if self.matcher.are_same_title(product.title, self.products[product_id]['title'], self.threshold):
+                return product_id
+
+        return None
+
+    def annotate(self, products: List[Product]) -> List[Product]:
+        """Attach known canonical IDs to products without running the matcher"""
+        for product in products:
+            product.product_id = self.lookup(product)
+        return products
+
+    def group_products(self, products: List[Product]) -> List[List[Product]]:
+        """Group products by canonical ID (same shape as ProductMatcher.group_similar_products)"""
+        groups = {}
+        for product in products:
+            product_id = self.assign(product)
+            product.product_id = product_id
+            groups.setdefault(product_id, []).append(product)
+
+        return list(groups.values())
+
+    def get_product(self, product_id: str) -> Optional[Dict]:
+        """Get canonical product record"""
+        product = self.products.get(product_id)
+        if product is None and self.path:
+            self.sync()
+            product = self.products.get(product_id)
+        return product
+
+    def sync(self):
+        """Pull products and listings added since the last pull (by any worker process)"""
+        with self.lock:
+            try:
+                with shared_state.transaction(self.conn):
+                    self._pull()
+            except sqlite3.Error as e:
+                log.warning("Catalog sync failed: %s", e)
+
+    def _pull(self):
+        """Apply new rows (caller holds the lock, inside a transaction)"""
+        rows = self.conn.execute(
+            "SELECT seq, product_id, title, brand FROM catalog_products WHERE seq > ? ORDER BY seq",
+            (self.product_seq,))
+        for seq, product_id, title, brand in rows:
+            if product_id not in self.products:
+                self._add_product(product_id, title, brand)
+            self.product_seq = seq
+
+        rows = self.conn.execute(
+            "SELECT seq, listing, product_id FROM catalog_listings WHERE seq > ? ORDER BY seq",
+            (self.listing_seq,))
+        for seq, listing, product_id in rows:
+            if product_id in self.products:
+                self._add_listing(listing, product_id)
+            self.listing_seq = seq
+
+        self.next_sync = time.monotonic() + self.SYNC_INTERVAL
+
+    def _add_product(self, product_id: str, title: str, brand: str):
+        self.products[product_id] = {'product_id': product_id, 'title': title, 'brand': brand, 'listings': []}
+        self.by_brand.setdefault(brand, []).append(product_id)
+
+    def _add_listing(self, listing: str, product_id: str):
+        if listing not in self.listings:
+            self.listings[listing] = product_id
+            self.products[product_id]['listings'].append(listing)
+
+    def _import_log(self, path: str):
+        """Copy a JSONL catalog log into an empty database (renamed to *.imported afterwards)"""
+        if not os.path.exists(path):
+            return
+
+        with shared_state.transaction(self.conn, write=True):
+            if self.conn.execute("SELECT 1 FROM catalog_products LIMIT 1").fetchone():
+                return
+
+            products = listings = 0
+            with open(path, encoding='utf-8') as f:
+                for line in f:
+                    try:
+                        record = json.loads(line)
+                    except ValueError:
+                        continue  # Torn write at the end of the log
+
+                    if record.get('type') == 'product':
+                        products += self.conn.execute(
+                            "INSERT OR IGNORE INTO catalog_products (product_id, title, brand) VALUES (?, ?, ?)",
+                            (record['product_id'], record['title'], record['brand'])).rowcount
+                    elif record.get('type') == 'listing':
+                        listings += self.conn.execute(
+                            "INSERT OR IGNORE INTO catalog_listings (listing, product_id) VALUES (?, ?)",
+                            (record['listing'], record['product_id'])).rowcount
+
+        os.replace(path, path + '.imported')
+        log.info("Imported catalog log %s: %d products, %d listings", path, products, listings)
+
+    def get_stats(self) -> Dict:
+        """Get catalog statistics"""
+        return {
+            'products': len(self.products),
+            'listings': len(self.listings),
+            'persistent': bool(self.path)
+        }
+
+
+class IncrementalGrouper:
+    """Builds cross-platform match groups as platform results arrive, within a latency budget"""
+
+    def __init__(self, catalog: ProductCatalog, budget_ms: float = 150):
+        self.catalog = catalog
+        self.budget = budget_ms / 1000
+        self.spent = 0.0
+        self.groups = {}  # product id -> [products]
+        self.unmatched = 0
+
+    def add(self, products: List[Product]):
+        """Assign a batch of products (typically one platform's results) to groups"""
+        for product in products:
+            product_id = self.catalog.lookup(product)
+
+            if product_id is None:
+                # New listings need fuzzy matching; stop once the budget is spent
+                if self.spent >= self.budget:
+                    self.unmatched += 1
+                    continue
+
+                start = time.perf_counter()
+                product_id = self.catalog.assign(product)
+                self.spent += time.perf_counter() - start
+
+            product.product_id = product_id
+            self.groups.setdefault(product_id, []).append(product)
+
+    def match_groups(self, products: List[Product] = None, min_platforms: int = 2) -> List[Dict]:
+        """
+        Cross-platform comparison groups, cheapest first
+
+        Args:
+            products: Restrict offers to these products (e.g. after filtering)
+            min_platforms: Minimum distinct platforms for a group to be reported
+        """
+        allowed = {id(p) for p in products} if products is not None else None
+        match_groups = []
+
+        for product_id, listings in self.groups.items():
+            if allowed is not None:
+                listings = [p for p in listings if id(p) in allowed]
+
+            offers = sorted((p for p in listings if p.price), key=lambda x: x.price)
+            platforms = sorted({p.platform for p in offers})
+            if len(platforms) < min_platforms:
+                continue
+
+            best = offers[0]
+            worst = offers[-1]
+            savings = worst.price - best.price
+
+            match_groups.append({
+                'product_id': product_id,
+                'title': self.catalog.get_product(product_id)['title'],
+                'platforms': platforms,
+                'best_offer': {
+                    'platform': best.platform,
+                    'price': best.price_label,
+                    'price_numeric': best.price,
+                    'url': best.url
+                },
+                'offers': [
+                    {
+                        'platform': p.platform,
+                        'title': p.title,
+                        'price': p.price_label,
+                        'price_numeric': p.price,
+                        'rating': p.rating_label,
+                        'url': p.url
+                    }
+                    for p in offers
+                ],
+                'savings': f"₹{savings:,.2f}",
+                'savings_percent': f"{(savings / worst.price * 100):.1f}%"
+            })
+
+        match_groups.sort(key=lambda g: g['best_offer']['price_numeric'])
+        return match_groups
+
+    def get_stats(self) -> Dict:
+        """Grouping cost report for response metadata"""
+        return {
+            'budget_ms': round(self.budget * 1000, 1),
+            'spent_ms': round(self.spent * 1000, 1),
+            'groups': len(self.groups),
+            'unmatched': self.unmatched
+        }
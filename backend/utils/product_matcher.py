@@ -23,6 +23,8 @@ class ProductMatcher:
             'puma', 'reebok', 'boat', 'jbl', 'bose', 'macbook', 'iphone', 'ipad'
         ]
 
+        self.colors = ['black', 'white', 'blue', 'red', 'green', 'silver', 'gold', 'grey', 'pink']
+
     def normalize_title(self, title: str) -> str:
         """Normalize product title for comparison"""
         if not title:
@@ -69,8 +71,7 @@ class ProductMatcher:
             specs['size'] = size_match.group(0)
 
         # Color
-        colors = ['black', 'white', 'blue', 'red', 'green', 'silver', 'gold', 'grey', 'pink']
-        for color in colors:
+        for color in self.colors:
             if color in title.lower():
                 specs['color'] = color.capitalize()
                 break
@@ -104,18 +105,22 @@ class ProductMatcher:
 
     def are_same_product(self, product1: Dict, product2: Dict, threshold: float = 0.6) -> bool:
         """Determine if two products are the same"""
-        similarity = self.calculate_similarity(product1['title'], product2['title'])
+        return self.are_same_title(product1['title'], product2['title'], threshold)
+
+    def are_same_title(self, title1: str, title2: str, threshold: float = 0.6) -> bool:
+        """Determine if two product titles describe the same product"""
+        similarity = self.calculate_similarity(title1, title2)
 
         # Check brand match
-        brand1 = self.extract_brand(product1['title'])
-        brand2 = self.extract_brand(product2['title'])
+        brand1 = self.extract_brand(title1)
+        brand2 = self.extract_brand(title2)
 
         if brand1 != brand2 and brand1 != "Unknown" and brand2 != "Unknown":
             return False
 
         # Check specs match
-        specs1 = self.extract_specs(product1['title'])
-        specs2 = self.extract_specs(product2['title'])
+        specs1 = self.extract_specs(title1)
+        specs2 = self.extract_specs(title2)
 
         # If both have storage specs, they must match
         if 'storage' in specs1 and 'storage' in specs2:
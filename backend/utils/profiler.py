@@ -0,0 +1,226 @@
+"""
+Profiler - Opt-in sampling profiler for individual requests
+Samples the stacks of the request thread and the scraper worker threads, so wall time
+spent waiting on browsers shows up as well as CPU time
+"""
+from typing import Dict, List, Optional
+import json
+import os
+import re
+import sys
+import threading
+import time
+import uuid
+
+from .logger import get_logger
+
+log = get_logger('profiler')
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Where wall time is attributed in the summary (first matching path wins)
+COMPONENTS = (
+    ('scraper_manager', os.path.join('utils', 'scraper_manager.py')),
+    ('scraper_pool', os.path.join('utils', 'scraper_pool.py')),
+    ('scrapers', 'scrapers' + os.sep),
+    ('product_matcher', os.path.join('utils', 'product_matcher.py')),
+    ('product_catalog', os.path.join('utils', 'product_catalog.py')),
+    ('analytics', 'analytics' + os.sep),
+)
+
+
+def _component(filename: str) -> Optional[str]:
+    for name, fragment in COMPONENTS:
+        if fragment in filename:
+            return name
+    return None
+
+
+class SamplingProfiler:
+    """
+    Background thread that snapshots stacks every `interval` seconds, for the thread that
+    started it plus threads whose name starts with one of `thread_prefixes` (scraper workers;
+    workers serving a concurrent request are sampled too)
+    """
+
+    def __init__(self, interval: float = 0.005, thread_prefixes: tuple = ('scrape',), max_depth: int = 80):
+        self.interval = max(0.001, interval)
+        self.thread_prefixes = thread_prefixes
+        self.max_depth = max_depth
+        self.owner = None
+        self.stacks = {}  # tuple of (file, line, function) root-first -> samples
+        self.ticks = 0
+        self.thread_names = set()
+        self.started = None
+        self.elapsed = 0.0
+        self.stop_event = threading.Event()
+        self.thread = None
+
+    def start(self) -> 'SamplingProfiler':
+        self.started = time.perf_counter()
+        self.owner = threading.get_ident()
+        self.thread = threading.Thread(target=self._run, name='profiler', daemon=True)
+        self.thread.start()
+        return self
+
+    def stop(self) -> 'SamplingProfiler':
+        self.stop_event.set()
+        if self.thread:
+            self.thread.join()
+        self.elapsed = time.perf_counter() - self.started
+        return self
+
+    def _run(self):
+        while not self.stop_event.wait(self.interval):
+            self.ticks += 1
+            names = {thread.ident: thread.name for thread in threading.enumerate()}
+            for ident, frame in sys._current_frames().items():
+                name = names.get(ident, '')
+                if ident == self.owner or name.startswith(self.thread_prefixes):
+                    self._sample(frame, name)
+
+    def _sample(self, frame, thread_name: str):
+        stack = []
+        ours = False
+        while frame is not None and len(stack) < self.max_depth:
+            code = frame.f_code
+            stack.append((code.co_filename, frame.f_lineno, code.co_name))
+            ours = ours or code.co_filename.startswith(BACKEND_DIR)
+            frame = frame.f_back
+
+        # Stacks entirely outside the backend (e.g. a worker between tasks) are noise
+        if not ours:
+            return
+
+        stack.reverse()
+        key = tuple(stack)
+        self.stacks[key] = self.stacks.get(key, 0) + 1
+        self.thread_names.add(thread_name)
+
+    def _label(self, filename: str, function: str) -> str:
+        if filename.startswith(BACKEND_DIR):
+            filename = os.path.relpath(filename, BACKEND_DIR)
+        else:
+            filename = os.path.basename(filename)
+        return f"{function} ({filename})"
+
+    def collapsed(self) -> Dict[str, int]:
+        """Folded stacks ("root;child;leaf" -> samples), as used by flamegraph tools and speedscope"""
+        folded = {}
+        for stack, count in self.stacks.items():
+            key = ';'.join(self._label(filename, function) for filename, _, function in stack)
+            folded[key] = folded.get(key, 0) + count
+        return folded
+
+    def summary(self, top: int = 30) -> Dict:
+        """Wall time by component and the hottest functions"""
+        sample_seconds = self.elapsed / self.ticks if self.ticks else self.interval
+        total = sum(self.stacks.values())
+        components = {}
+        functions = {}  # (file, function) -> [self samples, total samples]
+
+        for stack, count in self.stacks.items():
+            for name in {_component(filename) for filename, _, _ in stack} - {None}:
+                components[name] = components.get(name, 0) + count
+
+            for filename, function in {(filename, function) for filename, _, function in stack}:
+                functions.setdefault((filename, function), [0, 0])[1] += count
+            filename, _, function = stack[-1]
+            functions.setdefault((filename, function), [0, 0])[0] += count
+
+        hottest = sorted(functions.items(), key=lambda item: (item[1][0], item[1][1]), reverse=True)[:top]
+
+        return {
+            'duration_seconds': round(self.elapsed, 4),
+            'interval_ms': round(self.interval * 1000, 2),
+            'ticks': self.ticks,
+            'samples': total,
+            'threads': sorted(self.thread_names),
+            'components': {
+                name: {
+                    'samples': count,
+                    'seconds': round(count * sample_seconds, 4),
+                    'percent': round(100.0 * count / total, 1) if total else 0.0
+                }
+                for name, count in sorted(components.items(), key=lambda item: -item[1])
+            },
+            'top_functions': [
+                {
+                    'function': self._label(filename, function),
+                    'self_samples': own,
+                    'total_samples': inclusive,
+                    'self_seconds': round(own * sample_seconds, 4)
+                }
+                for (filename, function), (own, inclusive) in hottest
+            ]
+        }
+
+
+class ProfileStore:
+    """Keeps the most recent profile artifacts as JSON files in a directory"""
+
+    def __init__(self, directory: str, keep: int = 50):
+        self.directory = directory
+        self.keep = keep
+        os.makedirs(self.directory, exist_ok=True)
+
+    @staticmethod
+    def _safe_id(profile_id: str) -> str:
+        return re.sub(r'[^A-Za-z0-9_.-]', '_', profile_id)[:80]
+
+    def _path(self, profile_id: str) -> str:
+        return os.path.join(self.directory, f"{self._safe_id(profile_id)}.json")
+
+    def save(self, profiler: SamplingProfiler, **info) -> str:
+        """Write a finished profile and prune old ones; returns its new (server-generated) ID"""
+        profile_id = uuid.uuid4().hex
+        artifact = {
+            'id': profile_id,
+            'created': time.time(),
+            **info,
+            **profiler.summary(),
+            'stacks': profiler.collapsed()
+        }
+
+        try:
+            with open(self._path(profile_id), 'w', encoding='utf-8') as f:
+                json.dump(artifact, f, ensure_ascii=False)
+            self._prune()
+        except OSError as e:
+            log.warning("Could not save profile: %s", e)
+
+        return profile_id
+
+    def _prune(self):
+        entries = self._entries()
+        for path in entries[self.keep:]:
+            try:
+                os.remove(path)
+            except OSError:
+                pass
+
+    def _entries(self) -> List[str]:
+        """Artifact paths, newest first"""
+        paths = [
+            os.path.join(self.directory, name)
+            for name in os.listdir(self.directory) if name.endswith('.json')
+        ]
+        return sorted(paths, key=os.path.getmtime, reverse=True)
+
+    def list(self) -> List[Dict]:
+        """ID, time and size of stored profiles, newest first"""
+        return [
+            {
+                'id': os.path.basename(path)[:-len('.json')],
+                'created': os.path.getmtime(path),
+                'bytes': os.path.getsize(path)
+            }
+            for path in self._entries()
+        ]
+
+    def load(self, profile_id: str) -> Optional[Dict]:
+        try:
+            with open(self._path(profile_id), encoding='utf-8') as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return None
@@ -0,0 +1,78 @@
+"""
+Query normalization - One canonical form per search intent
+"iPhone 15 128GB", "iphone 15 128 gb" and "  iphone   15 128gb " share a cache entry, a batch slot
+and a popularity counter instead of being scraped three times
+"""
+from functools import lru_cache
+from typing import List
+import re
+
+from .product_matcher import ProductMatcher
+
+_matcher = ProductMatcher()
+
+# Unit spellings folded to one token ("gigabytes" -> "gb")
+UNIT_ALIASES = {
+    'gigabyte': 'gb', 'gigabytes': 'gb', 'terabyte': 'tb', 'terabytes': 'tb',
+    'megabyte': 'mb', 'megabytes': 'mb', 'inches': 'inch', 'megapixel': 'mp', 'megapixels': 'mp',
+    'watt': 'w', 'watts': 'w', 'litre': 'l', 'litres': 'l', 'liter': 'l', 'liters': 'l',
+}
+UNITS = {'gb', 'tb', 'mb', 'inch', 'cm', 'mm', 'mah', 'hz', 'w', 'mp', 'kg', 'g', 'ml', 'l'}
+
+# Connective words dropped from queries; single letters never are ("usb c", "samsung a 54")
+CONNECTIVES = frozenset({
+    'the', 'an', 'and', 'or', 'for', 'with', 'of', 'by', 'from', 'to', 'in', 'on', 'at', 'into', 'about'
+})
+
+_NUMBER = re.compile(r'^\d+(?:_\d+)?$')
+_MEASURE = re.compile(r'^\d+(?:_\d+)?(?:' + '|'.join(sorted(UNITS, key=len, reverse=True)) + r')$')
+_CAPACITY = re.compile(r'^\d+(?:_\d+)?(?:gb|tb|mb)$')
+
+
+def _tokens(query: str) -> List[str]:
+    """Lowercased word tokens with decimals, inch marks and unit spellings folded"""
+    text = re.sub(r'(\d)\.(\d)', r'\1_\2', query.lower())  # 6.1 survives punctuation folding as 6_1
+    text = re.sub(r'(\d)\s*(?:"|\'\')', r'\1 inch', text)
+    tokens = [UNIT_ALIASES.get(token, token) for token in _matcher.normalize_title(text).split()]
+
+    # "128 gb" -> "128gb"
+    joined = []
+    for token in tokens:
+        if token in UNITS and joined and _NUMBER.match(joined[-1]):
+            joined[-1] += token
+        else:
+            joined.append(token)
+    return joined
+
+
+def search_tokens(text: str) -> List[str]:
+    """Folded tokens without connective words, repeats kept (for full-text indexing)"""
+    return [token for token in _tokens(text or '') if token not in CONNECTIVES]
+
+
+@lru_cache(maxsize=4096)
+def canonical_query(query: str) -> str:
+    """
+    Canonical form of a search query (idempotent)
+
+    Folds case, punctuation, whitespace and unit spellings and drops connective words. Specs
+    (measurements such as "128gb" or "8gb ram", and colours) don't depend on where they
+    appear in a query, so they are moved to the end in sorted order; other words keep
+    their order, since "15 pro" and "pro 15" may be different products.
+    """
+    tokens = _tokens(query or '')
+    words = [token for token in tokens if token not in CONNECTIVES] or tokens
+
+    kept = []
+    specs = []
+    previous = None
+    for token in words:
+        if token == 'ram' and previous is not None and _CAPACITY.match(previous):
+            specs[-1] += ' ram'
+        elif _MEASURE.match(token) or token in _matcher.colors:
+            specs.append(token)
+        else:
+            kept.append(token)
+        previous = token
+
+    return ' '.join(kept + sorted(specs))
@@ -0,0 +1,282 @@
+"""
+Refresh Scheduler - Keeps popular and watched queries fresh in the cache
+Re-scrapes in the background during off-peak slots, within per-platform rate limits and a browser budget
+"""
+from typing import List, Dict, Optional, Callable, Tuple
+import heapq
+import threading
+import time
+from datetime import datetime
+
+from .metrics import THROTTLES
+from .logger import get_logger
+from .query_normalizer import canonical_query
+
+log = get_logger('scheduler')
+
+
+class TokenBucket:
+    """Per-platform request budget (requests per minute with a small burst)"""
+
+    def __init__(self, per_minute: float, burst: int = 1):
+        self.rate = per_minute / 60.0
+        self.capacity = max(1, burst)
+        self.tokens = float(self.capacity)
+        self.updated = time.monotonic()
+
+    def _refill(self):
+        now = time.monotonic()
+        self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+
+    def available(self) -> bool:
+        self._refill()
+        return self.tokens >= 1
+
+    def take(self):
+        self._refill()
+        self.tokens -= 1
+
+
+class RefreshScheduler:
+    """Background re-scraping of popular and alert-watched queries before their cache entries expire"""
+
+    def __init__(self, manager, watch_source: Callable[[], Dict[str, int]] = None, interval: float = 5.0,
+                 top_n: int = 50, min_score: float = 2.0, half_life: float = 3600.0, refresh_fraction: float = 0.8,
+                 browser_budget: int = 2, platform_rpm: float = 6.0, off_peak_hours: Optional[Tuple[int, int]] = None,
+                 max_active: int = 0, watch_weight: float = 5.0, max_tracked: int = 5000):
+        """
+        Args:
+            manager: ScraperManager whose cache is kept fresh
+            watch_source: Callable returning {query: watchers} (e.g. PriceAlertEngine.watched_queries)
+            interval: Seconds between planning rounds
+            top_n: Number of most popular queries considered each round
+            min_score: Minimum decayed popularity for a query to be refreshed
+            half_life: Popularity half-life in seconds
+            refresh_fraction: Refresh once a cache entry is this fraction of the TTL old
+            browser_budget: Max browsers the scheduler drives at once
+            platform_rpm: Background requests per minute allowed per platform
+            off_peak_hours: Optional (start, end) local hours; refresh only inside this window
+            max_active: Refresh only while at most this many user scrapes are running
+            watch_weight: Priority added per alert watching a query
+            max_tracked: Cap on tracked queries (least popular are evicted)
+        """
+        self.manager = manager
+        self.watch_source = watch_source
+        self.interval = interval
+        self.top_n = top_n
+        self.min_score = min_score
+        self.half_life = half_life
+        self.refresh_fraction = refresh_fraction
+        self.browser_budget = max(1, browser_budget)
+        self.platform_rpm = platform_rpm
+        self.off_peak_hours = off_peak_hours
+        self.max_active = max_active
+        self.watch_weight = watch_weight
+        self.max_tracked = max_tracked
+
+        self.popularity = {}  # (canonical query, platforms) -> (score, last update)
+        self.spellings = {}  # key -> latest user spelling (what a refresh actually searches for)
+        self.queue = []  # heap of (-priority, due, key)
+        self.queued = set()
+        self.buckets = {}  # platform -> TokenBucket
+        self.lock = threading.Lock()
+
+        self.refreshed = 0
+        self.failed = 0
+        self.throttled = 0
+        self.last_lag = 0.0
+        self.last_run = None
+
+        self.stop_event = threading.Event()
+        self.thread = None
+
+    @staticmethod
+    def _key(query: str, platforms: List[str] = None) -> Tuple[str, Optional[Tuple[str, ...]]]:
+        return canonical_query(query), tuple(sorted(platforms)) if platforms else None
+
+    def _decayed(self, score: float, updated: float, now: float) -> float:
+        return score * 0.5 ** ((now - updated) / self.half_life)
+
+    def record(self, query: str, platforms: List[str] = None):
+        """Count a user search (called from the search endpoint, cache hits included)"""
+        key = self._key(query, platforms)
+        now = time.time()
+
+        with self.lock:
+            score, updated = self.popularity.get(key, (0.0, now))
+            self.popularity[key] = (self._decayed(score, updated, now) + 1, now)
+            self.spellings[key] = query.strip()
+
+            if len(self.popularity) > self.max_tracked:
+                self._evict(now)
+
+    def _evict(self, now: float):
+        """Drop the least popular tenth of tracked queries (caller holds the lock)"""
+        ranked = sorted(self.popularity, key=lambda k: self._decayed(*self.popularity[k], now))
+        for key in ranked[:max(1, len(ranked) // 10)]:
+            del self.popularity[key]
+            if key not in self.queued:
+                self.spellings.pop(key, None)
+
+    def _candidates(self, now: float) -> List[Tuple[float, Tuple]]:
+        """(priority, key) for popular and watched queries"""
+        with self.lock:
+            scored = [(self._decayed(score, updated, now), key) for key, (score, updated) in self.popularity.items()]
+
+        priorities = {key: score for score, key in heapq.nlargest(self.top_n, scored) if score >= self.min_score}
+
+        if self.watch_source:
+            try:
+                for query, watchers in self.watch_source().items():
+                    key = self._key(query)
+                    with self.lock:
+                        self.spellings.setdefault(key, query)
+                    priorities[key] = priorities.get(key, 0.0) + self.watch_weight * watchers
+            except Exception as e:
+                log.warning("Watch source failed: %s", e)
+
+        return [(priority, key) for key, priority in priorities.items()]
+
+    def _plan(self, now: float):
+        """Queue queries whose cache entry is missing or close to expiry"""
+        refresh_after = self.manager.cache_ttl * self.refresh_fraction
+
+        for priority, key in self._candidates(now):
+            if key in self.queued:
+                continue
+
+            query, platforms = key
+            age = self.manager.get_cache_age(query, list(platforms) if platforms else None)
+            if age is not None and age < refresh_after:
+                continue
+
+            due = now if age is None else now - (age - refresh_after)
+            with self.lock:
+                heapq.heappush(self.queue, (-priority, due, key))
+                self.queued.add(key)
+
+    def _off_peak(self) -> bool:
+        """True when user traffic is low enough to spend browsers on refreshes"""
+        if self.manager.active_scrapes > self.max_active:
+            return False
+
+        if self.off_peak_hours:
+            start, end = self.off_peak_hours
+            hour = datetime.now().hour
+            in_window = start <= hour < end if start <= end else (hour >= start or hour < end)
+            if not in_window:
+                return False
+
+        return True
+
+    def _bucket(self, platform: str) -> TokenBucket:
+        if platform not in self.buckets:
+            self.buckets[platform] = TokenBucket(self.platform_rpm)
+        return self.buckets[platform]
+
+    def _next_job(self) -> Optional[Tuple[float, Tuple, List[str]]]:
+        """Highest-priority job whose platforms all have rate-limit budget"""
+        deferred = []
+        job = None
+
+        with self.lock:
+            while self.queue:
+                item = heapq.heappop(self.queue)
+                _, due, key = item
+                platforms = list(key[1]) if key[1] else self.manager.get_available_platforms()
+                blocked = [platform for platform in platforms if not self._bucket(platform).available()]
+                if not blocked:
+                    for platform in platforms:
+                        self._bucket(platform).take()
+                    self.queued.discard(key)
+                    job = (due, key, platforms)
+                    break
+                deferred.append(item)
+                self.throttled += 1
+                for platform in blocked:
+                    THROTTLES.inc(platform=platform, source='scheduler')
+
+            for item in deferred:
+                heapq.heappush(self.queue, item)
+
+        return job
+
+    def _dispatch(self):
+        """Run queued refreshes while the system stays off-peak"""
+        while not self.stop_event.is_set() and self._off_peak():
+            job = self._next_job()
+            if job is None:
+                return
+
+            due, key, platforms = job
+            with self.lock:
+                query = self.spellings.get(key, key[0])
+            self.last_lag = max(0.0, time.time() - due)
+
+            try:
+                result = self.manager.search_all(
+                    query=query,
+                    platforms=platforms,
+                    force_refresh=True,
+                    max_workers=min(self.browser_budget, len(platforms))
+                )
+                if result.get('success'):
+                    self.refreshed += 1
+                else:
+                    self.failed += 1
+            except Exception as e:
+                self.failed += 1
+                log.warning("Scheduled refresh failed: %s", e, extra={'query': query})
+
+            self.last_run = datetime.now().isoformat()
+
+    def run_once(self):
+        """One planning + dispatch round"""
+        self._plan(time.time())
+        self._dispatch()
+
+    def _loop(self):
+        while not self.stop_event.wait(self.interval):
+            try:
+                self.run_once()
+            except Exception as e:
+                log.exception("Refresh round failed")
+
+    def start(self):
+        """Start the background thread"""
+        if self.thread and self.thread.is_alive():
+            return
+        self.stop_event.clear()
+        self.thread = threading.Thread(target=self._loop, name='refresh-scheduler', daemon=True)
+        self.thread.start()
+        log.info("Refresh scheduler started (every %gs, browser budget %d)", self.interval, self.browser_budget)
+
+    def stop(self, timeout: float = 5.0):
+        """Stop after the current refresh finishes"""
+        self.stop_event.set()
+        if self.thread:
+            self.thread.join(timeout)
+
+    def get_stats(self) -> Dict:
+        """Queue length, lag and refresh counters"""
+        now = time.time()
+        with self.lock:
+            queue_length = len(self.queue)
+            oldest_due = min((due for _, due, _ in self.queue), default=None)
+            tracked = len(self.popularity)
+
+        return {
+            'running': bool(self.thread and self.thread.is_alive()),
+            'queue_length': queue_length,
+            'lag_seconds': round(max(0.0, now - oldest_due), 2) if oldest_due is not None else 0.0,
+            'last_dispatch_lag_seconds': round(self.last_lag, 2),
+            'tracked_queries': tracked,
+            'refreshed': self.refreshed,
+            'failed': self.failed,
+            'throttled': self.throttled,
+            'last_run': self.last_run,
+            'off_peak': self._off_peak(),
+            'browser_budget': self.browser_budget,
+            'platform_rpm': self.platform_rpm
+        }
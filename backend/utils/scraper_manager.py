@@ -2,32 +2,106 @@
 Scraper Manager - Orchestrates all platform scrapers with concurrent execution
 """
 from concurrent.futures import ThreadPoolExecutor, as_completed
-from typing import List, Dict
+from typing import List, Dict, Callable, Iterator, Tuple
+import queue
+import threading
 import time
 from datetime import datetime, timedelta
 
+from .product import Product
+from .scraper_pool import ScraperPool
+from .metrics import (SCRAPE_SECONDS, SCRAPE_PHASE_SECONDS, SCRAPE_ERRORS, SCRAPE_PRODUCTS, CACHE_REQUESTS,
+                      CIRCUIT_REJECTIONS, HEDGES)
+from .circuit_breaker import CircuitBreaker, CircuitOpenError
+from .timeouts import TIMEOUTS, request_deadline, remaining
+from .tracing import span, propagate
+from .logger import get_logger
+from .query_normalizer import canonical_query
+
+log = get_logger('manager')
+
 
 class ScraperManager:
     """Manages multiple platform scrapers with concurrent execution"""
 
-    def __init__(self):
+    def __init__(self, pool_size: int = 1, breaker_failures: int = 5, breaker_reset: float = 60.0,
+                 hedging: bool = False, hedge_percentile: float = 90, hedge_budget: float = 0.1):
         self.scrapers = {}
+        self.pools = {}  # platform -> ScraperPool (pool_size browsers per platform)
+        self.breakers = {}  # platform -> CircuitBreaker
+        self.pool_size = pool_size
+        self.breaker_failures = breaker_failures  # Consecutive failed/empty scrapes that open a circuit
+        self.breaker_reset = breaker_reset  # Seconds a platform is skipped before a probe search
+        self.hedging = hedging  # Race a second browser against scrapes slower than their percentile
+        self.hedge_percentile = hedge_percentile
+        self.hedge_budget = hedge_budget  # Max hedges as a fraction of scrapes
+        self.hedge_lock = threading.Lock()
+        self.hedge_counts = {'scrapes': 0, 'launched': 0, 'won': 0, 'lost': 0, 'over_budget': 0, 'no_browser': 0}
         self.cache = {}
         self.cache_ttl = 300  # ⚡ 5 minutes (was 10)
         self.max_workers = 8  # ⚡ 8 workers (was 5)
+        self.listeners = []  # Called with (query, products) after every fresh scrape
+        self.active_scrapes = 0  # Searches currently driving browsers (cache misses)
+        self.active_lock = threading.Lock()
+        self.idle = threading.Condition(self.active_lock)
+        self.draining = False  # Set on shutdown: cache hits are still served, new scrapes are refused
+        self.cache_lock = threading.Lock()  # Guards the hit-rate counters (bumped from worker threads)
+        self.cache_lookups = 0
+        self.cache_hits = 0
+        self.canonical_hits = 0  # Hits a case-only key (the old query.lower()) would have missed
+
+    def register_scraper(self, name: str, scraper=None, factory: Callable = None):
+        """
+        Register a platform scraper (factory builds extra pooled instances)
 
-    def register_scraper(self, name: str, scraper):
-        """Register a platform scraper"""
+        With only a factory the platform is lazy: nothing is imported or constructed
+        until the first search that needs it
+        """
         self.scrapers[name] = scraper
-        print(f"✅ Registered scraper: {name}")
+        self.pools[name] = ScraperPool(scraper, self.pool_size, factory, platform_name=name)
+        self.breakers[name] = CircuitBreaker(name, self.breaker_failures, self.breaker_reset)
+        log.info("Registered scraper", extra={'platform': name, 'lazy': scraper is None})
+
+    def add_listener(self, callback: Callable[[str, List[Product]], None]):
+        """Subscribe to fresh scrape results (history, alerts, indexing)"""
+        self.listeners.append(callback)
+
+    def _notify_listeners(self, query: str, products: List[Product]):
+        """Hand fresh results to listeners; they must not block"""
+        for callback in self.listeners:
+            try:
+                callback(query, products)
+            except Exception as e:
+                log.warning("Results listener failed: %s", e)
+
+    def _begin_scrape(self) -> bool:
+        """Count a scrape as in flight (False while draining)"""
+        with self.active_lock:
+            if self.draining:
+                return False
+            self.active_scrapes += 1
+            return True
+
+    def _end_scrape(self):
+        with self.active_lock:
+            self.active_scrapes -= 1
+            if not self.active_scrapes:
+                self.idle.notify_all()
+
+    def drain(self, timeout: float = 30.0) -> bool:
+        """Refuse new scrapes and wait for in-flight ones (True if all finished within `timeout`)"""
+        with self.active_lock:
+            self.draining = True
+            log.info("Draining %d in-flight scrapes", self.active_scrapes)
+            return self.idle.wait_for(lambda: self.active_scrapes == 0, timeout)
 
     def get_available_platforms(self) -> List[str]:
         """Get list of registered platforms"""
         return list(self.scrapers.keys())
 
     def _get_cache_key(self, query: str, platforms: List[str]) -> str:
-        """Generate cache key"""
-        return f"{query.lower()}:{'_'.join(sorted(platforms))}"
+        """Generate cache key (spellings of the same query share one key)"""
+        return f"{canonical_query(query)}:{'_'.join(sorted(platforms))}"
 
     def _is_cache_valid(self, cache_key: str) -> bool:
         """Check if cache is still valid"""
@@ -43,39 +117,230 @@ class ScraperManager:
         age = datetime.now() - cache_time
         return age.total_seconds() < self.cache_ttl
 
-    def _get_from_cache(self, cache_key: str) -> Dict:
-        """Retrieve from cache"""
+    def _get_from_cache(self, cache_key: str, query: str = None, count: bool = True) -> Dict:
+        """
+        Retrieve from cache (`query` is the caller's spelling, for the hit-rate stats)
+
+        Args:
+            count: Count this as one search's lookup; callers probing several keys for one
+                search pass False and call _count_lookup once themselves
+        """
         if self._is_cache_valid(cache_key):
-            print(f"✅ Cache hit for: {cache_key}")
-            return self.cache[cache_key]['data']
+            entry = self.cache[cache_key]
+            if count:
+                self._count_lookup(True, self._spelled_differently(entry, query))
+            CACHE_REQUESTS.inc(result='hit')
+            log.debug("Cache hit", extra={'cache_key': cache_key})
+            return entry['data']
+        if count:
+            self._count_lookup(False)
+        CACHE_REQUESTS.inc(result='stale' if cache_key in self.cache else 'miss')
         return None
 
-    def _save_to_cache(self, cache_key: str, data: Dict):
-        """Save to cache"""
+    @staticmethod
+    def _spelled_differently(entry: Dict, query: str) -> bool:
+        """A hit a case-only key (the old query.lower()) would have missed"""
+        return entry is not None and query is not None and query.lower() != entry.get('spelling', query.lower())
+
+    def _count_lookup(self, hit: bool, canonical: bool = False):
+        with self.cache_lock:
+            self.cache_lookups += 1
+            if hit:
+                self.cache_hits += 1
+                if canonical:
+                    self.canonical_hits += 1
+
+    def get_cache_age(self, query: str, platforms: List[str] = None) -> float:
+        """Seconds since the cached result for a query was scraped (None if not cached)"""
+        if platforms is None:
+            platforms = self.get_available_platforms()
+        cached = self.cache.get(self._get_cache_key(query, [p for p in platforms if p in self.scrapers]))
+        if not cached or not cached.get('timestamp'):
+            return None
+        return (datetime.now() - cached['timestamp']).total_seconds()
+
+    def get_snapshot(self, query: str, platforms: List[str], timestamp: str) -> Dict:
+        """
+        The cached result scraped at `timestamp`, even past its TTL (None once it has been replaced)
+        Lets paged reads stay on one consistent result set without re-scraping
+        """
+        if platforms is None:
+            platforms = self.get_available_platforms()
+        cached = self.cache.get(self._get_cache_key(query, [p for p in platforms if p in self.scrapers]))
+        if not cached or cached['data'].get('timestamp') != timestamp:
+            return None
+        return dict(cached['data'], from_cache=True)
+
+    def _save_to_cache(self, cache_key: str, data: Dict, scraped_at: datetime = None):
+        """Save to cache (`scraped_at`: when the oldest data in it was scraped, default now)"""
         self.cache[cache_key] = {
             'data': data,
-            'timestamp': datetime.now()
+            'timestamp': scraped_at or datetime.now(),
+            'spelling': data.get('query', '').lower()
+        }
+
+    def get_cache_stats(self) -> Dict:
+        """Hit rate, and the part of it owed to query canonicalization"""
+        with self.cache_lock:
+            lookups, hits, canonical = self.cache_lookups, self.cache_hits, self.canonical_hits
+        return {
+            'lookups': lookups,
+            'hits': hits,
+            'canonical_hits': canonical,
+            'hit_rate': round(hits / lookups, 4) if lookups else None,
+            'hit_rate_case_only': round((hits - canonical) / lookups, 4) if lookups else None
         }
 
     def clear_cache(self):
         """Clear all cached results"""
         self.cache = {}
-        print("✅ Cache cleared")
+        log.info("Cache cleared")
+
+    def search_platform(self, platform_name: str, query: str, max_results: int = 10,
+                        cancel: threading.Event = None, acquire_timeout: float = 20) -> List[Product]:
+        """
+        Search a single platform
+
+        Raises CircuitOpenError without scraping while the platform's circuit is open
 
-    def search_platform(self, platform_name: str, query: str, max_results: int = 10) -> List[Dict]:
-        """Search a single platform"""
+        Args:
+            cancel: Set to abandon the scrape at its next phase (the result is then ignored)
+            acquire_timeout: Seconds to wait for a free browser
+        """
         if platform_name not in self.scrapers:
-            print(f"⚠️ Platform not found: {platform_name}")
+            log.warning("Platform not found", extra={'platform': platform_name})
             return []
 
+        left = remaining()
+        if left is not None and left <= 0:
+            raise TimeoutError('Request deadline exceeded before the scrape started')
+
+        breaker = self.breakers[platform_name]
         try:
-            scraper = self.scrapers[platform_name]
-            return scraper.search(query, max_results)
+            breaker.before_call()
+        except CircuitOpenError:
+            CIRCUIT_REJECTIONS.inc(platform=platform_name)
+            raise
+
+        start = time.perf_counter()
+        pool = self.pools[platform_name]
+        with SCRAPE_PHASE_SECONDS.time(platform=platform_name, phase='driver_acquire'), \
+                span(f"{platform_name}.driver_acquire"):
+            scraper = pool.acquire(timeout=acquire_timeout if left is None else min(acquire_timeout, left))
+        if scraper is None:
+            breaker.cancel()  # Our capacity, not the platform's health
+            SCRAPE_ERRORS.inc(platform=platform_name, type='PoolExhausted')
+            log.warning("No free browser", extra={'platform': platform_name})
+            return []
+
+        scraper.cancel_event = cancel
+        try:
+            with span(f"{platform_name}.search", query=query):
+                products = scraper.search(query, max_results)
+            if cancel is not None and cancel.is_set():
+                breaker.cancel()  # Abandoned, says nothing about the platform
+                return []
+            SCRAPE_PRODUCTS.inc(len(products), platform=platform_name)
+            # Scrapers swallow their own errors, so a broken page usually shows up as no results
+            if products:
+                breaker.record_success()
+                TIMEOUTS.observe(platform_name, 'scrape', time.perf_counter() - start)
+            else:
+                breaker.record_failure('empty')
+            return products
         except Exception as e:
-            print(f"❌ Error scraping {platform_name}: {e}")
+            if cancel is not None and cancel.is_set():
+                breaker.cancel()  # Cancelled mid-scrape (ScrapeCancelled), not a platform error
+                return []
+            breaker.record_failure(type(e).__name__)
+            SCRAPE_ERRORS.inc(platform=platform_name, type=type(e).__name__)
+            log.error("Scrape failed: %s", e, extra={'platform': platform_name})
             return []
+        finally:
+            scraper.cancel_event = None
+            pool.release(scraper)
+            SCRAPE_SECONDS.observe(time.perf_counter() - start, platform=platform_name)
 
-    def search_all(self, query: str, platforms: List[str] = None, max_results: int = 10, use_cache: bool = True) -> Dict:
+    def _search_hedged(self, platform_name: str, query: str, max_results: int) -> List[Product]:
+        """
+        search_platform, plus a second attempt on another pooled browser (its own user agent and
+        session) if the first hasn't finished by the platform's hedge percentile; the first attempt
+        to return products wins and the other is cancelled
+        """
+        delay = TIMEOUTS.quantile(platform_name, 'scrape', self.hedge_percentile)
+        if delay is None or self.pools[platform_name].size < 2:
+            return self.search_platform(platform_name, query, max_results)
+
+        finished = queue.Queue()
+        cancels = []
+
+        def launch(hedge: bool):
+            cancel = threading.Event()
+            cancels.append(cancel)
+
+            def run():
+                try:
+                    products = self.search_platform(platform_name, query, max_results, cancel=cancel,
+                                                    acquire_timeout=0 if hedge else 20)
+                    finished.put((hedge, products, None))
+                except Exception as e:
+                    finished.put((hedge, [], e))
+
+            name = f"scrape-{platform_name}-{'hedge' if hedge else 'primary'}"
+            threading.Thread(target=propagate(run), name=name, daemon=True).start()
+
+        with self.hedge_lock:
+            self.hedge_counts['scrapes'] += 1
+        launch(False)
+
+        try:
+            _, products, error = finished.get(timeout=delay)
+        except queue.Empty:
+            outcome = self._admit_hedge(platform_name)
+            HEDGES.inc(platform=platform_name, outcome=outcome)
+            if outcome != 'launched':
+                _, products, error = finished.get()
+            else:
+                launch(True)
+                log.debug("Hedging after %.2fs", delay, extra={'platform': platform_name})
+                products, error = self._first_products(platform_name, finished, cancels)
+
+        if error is not None:
+            raise error
+        return products
+
+    def _admit_hedge(self, platform_name: str) -> str:
+        """'launched' if the hedge budget and a browser allow a second attempt, else why not"""
+        pool = self.pools[platform_name]
+        with self.hedge_lock:
+            counts = self.hedge_counts
+            if counts['launched'] + 1 > self.hedge_budget * counts['scrapes']:
+                outcome = 'over_budget'
+            elif not pool.idle and len(pool.instances) >= pool.size:
+                outcome = 'no_browser'
+            else:
+                outcome = 'launched'
+            counts[outcome] += 1
+        return outcome
+
+    def _first_products(self, platform_name: str, finished: queue.Queue, cancels: List[threading.Event]):
+        """Wait for both attempts; return the first non-empty result and cancel the other"""
+        products, error = [], None
+        for _ in range(2):
+            hedge, products, error = finished.get()
+            if products:
+                for cancel in cancels:
+                    cancel.set()
+                outcome = 'won' if hedge else 'lost'
+                with self.hedge_lock:
+                    self.hedge_counts[outcome] += 1
+                HEDGES.inc(platform=platform_name, outcome=outcome)
+                return products, None
+        return products, error
+
+    def search_all(self, query: str, platforms: List[str] = None, max_results: int = 10, use_cache: bool = True,
+                   on_results: Callable[[str, List[Product]], None] = None, force_refresh: bool = False,
+                   max_workers: int = None, deadline: float = None) -> Dict:
         """
         Search all platforms concurrently
 
@@ -84,9 +349,13 @@ class ScraperManager:
             platforms: List of platform names (None = all platforms)
             max_results: Max results per platform
             use_cache: Whether to use caching
+            on_results: Optional callback(platform, products) invoked as each platform completes
+            force_refresh: Scrape even if cached (the fresh result still replaces the cache entry)
+            max_workers: Cap on concurrent platform scrapes for this call (default self.max_workers)
+            deadline: Seconds the caller can wait; every page load and wait is cut to fit
 
         Returns:
-            Dict with results, metadata, and performance stats
+            Dict with results (Product records), metadata, and performance stats
         """
         start_time = time.time()
 
@@ -107,23 +376,204 @@ class ScraperManager:
 
         # Check cache
         cache_key = self._get_cache_key(query, platforms)
-        if use_cache:
-            cached = self._get_from_cache(cache_key)
+        if use_cache and not force_refresh:
+            with span('cache_lookup'):
+                cached = self._get_from_cache(cache_key, query)
             if cached:
                 cached['from_cache'] = True
+                if on_results:
+                    self._replay_results(cached['products'], on_results)
                 return cached
 
-        print(f"🔍 Searching {len(platforms)} platforms concurrently for: {query}")
+        if not self._begin_scrape():
+            return {'success': False, 'error': 'Server is shutting down', 'products': [], 'total': 0}
+
+        log.info("Searching %d platforms", len(platforms), extra={'query': query})
+
+        try:
+            with span('scrape_platforms', platforms=len(platforms)), request_deadline(deadline):
+                all_products, platform_stats, errors = self._scrape_platforms(
+                    query, platforms, max_results, on_results, max_workers or self.max_workers
+                )
+        finally:
+            self._end_scrape()
+
+        elapsed = time.time() - start_time
+        result = self._build_result(query, platforms, all_products, platform_stats, errors, elapsed)
+
+        # Save to cache
+        if use_cache and all_products:
+            self._save_to_cache(cache_key, result)
+            self._save_slices(query, platforms, all_products, platform_stats)
 
+        with span('listeners'):
+            self._notify_listeners(query, all_products)
+
+        log.info("Search completed in %.2fs: %d products", elapsed, len(all_products), extra={'query': query})
+
+        return result
+
+    def _build_result(self, query: str, platforms: List[str], products: List[Product], platform_stats: Dict,
+                      errors: Dict, elapsed: float, from_cache: bool = False) -> Dict:
+        """Search result document with products sorted by price"""
+        # Sort by price (numeric)
+        products.sort(key=lambda x: x.price or float('inf'))
+
+        return {
+            'success': True,
+            'query': query,
+            'products': products,
+            'total': len(products),
+            'platforms_searched': len(platforms),
+            'platforms_succeeded': sum(1 for s in platform_stats.values() if s['status'] == 'success'),
+            'platform_stats': platform_stats,
+            'errors': errors if errors else None,
+            'elapsed_time': round(elapsed, 2),
+            'from_cache': from_cache,
+            'timestamp': datetime.now().isoformat()
+        }
+
+    def _save_slices(self, query: str, platforms: List[str], products: List[Product], platform_stats: Dict):
+        """Cache each platform's results separately so other platform sets can reuse them"""
+        if len(platforms) < 2:
+            return
+
+        by_platform = {platform: [] for platform in platforms}
+        for product in products:
+            if product.platform in by_platform:
+                by_platform[product.platform].append(product)
+
+        for platform, platform_products in by_platform.items():
+            stats = platform_stats.get(platform, {})
+            # Slices served from the cache keep their own entries (and scrape times)
+            if stats.get('status') == 'success' and not stats.get('cached') and platform_products:
+                stats = {platform: platform_stats[platform]}
+                self._save_to_cache(
+                    self._get_cache_key(query, [platform]),
+                    self._build_result(query, [platform], platform_products, stats, {}, 0)
+                )
+
+    def search_batch(self, queries: List[str], platforms: List[str] = None, max_results: int = 10,
+                     use_cache: bool = True) -> Iterator[Tuple[str, Dict]]:
+        """
+        Search many queries through one shared worker pool
+
+        Equivalent queries (same canonical form) are scraped once, and full or per-platform
+        cache slices are reused so only missing (query, platform) pairs are scraped.
+
+        Yields:
+            (query, result) as each unique query completes
+        """
+        if platforms is None:
+            platforms = self.get_available_platforms()
+        platforms = [p for p in platforms if p in self.scrapers]
+
+        unique = {}
+        for query in queries:
+            unique.setdefault(canonical_query(query), query)
+
+        if not platforms:
+            for query in unique.values():
+                yield query, {'success': False, 'error': 'No valid platforms specified', 'products': [], 'total': 0}
+            return
+
+        pending = {}  # query -> {'products', 'stats', 'errors', 'missing', 'start'}
+        for query in unique.values():
+            # One hit-rate lookup per query, however many cache slices answer it
+            cache_key = self._get_cache_key(query, platforms)
+            cached = self._get_from_cache(cache_key, query, count=False) if use_cache else None
+            if cached:
+                self._count_lookup(True, self._spelled_differently(self.cache.get(cache_key), query))
+                cached['from_cache'] = True
+                yield query, cached
+                continue
+
+            state = {'products': [], 'stats': {}, 'errors': {}, 'missing': set(platforms), 'start': time.time(),
+                     'scraped_at': None}
+            if use_cache:
+                canonical = False
+                for platform in platforms:
+                    slice_key = self._get_cache_key(query, [platform])
+                    piece = self._get_from_cache(slice_key, query, count=False)
+                    if piece:
+                        entry = self.cache.get(slice_key)
+                        canonical = canonical or self._spelled_differently(entry, query)
+                        # The assembled entry expires with its oldest slice, not a TTL after assembly
+                        if entry and (state['scraped_at'] is None or entry['timestamp'] < state['scraped_at']):
+                            state['scraped_at'] = entry['timestamp']
+                        state['products'].extend(piece['products'])
+                        state['stats'][platform] = dict(piece['platform_stats'][platform], cached=True)
+                        state['missing'].discard(platform)
+                self._count_lookup(not state['missing'], canonical)
+
+            if not state['missing']:
+                result = self._build_result(query, platforms, list(state['products']), state['stats'], {},
+                                            0, from_cache=True)
+                self._save_to_cache(self._get_cache_key(query, platforms), result, state['scraped_at'])
+                yield query, result
+                continue
+
+            pending[query] = state
+
+        if not pending:
+            return
+
+        if not self._begin_scrape():
+            for query in pending:
+                yield query, {'success': False, 'error': 'Server is shutting down', 'products': [], 'total': 0}
+            return
+
+        log.info("Batch: scraping %d query/platform pairs for %d queries",
+                 sum(len(s['missing']) for s in pending.values()), len(pending))
+
+        try:
+            with ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix='scrape') as executor:
+                future_to_job = {
+                    executor.submit(propagate(self.search_platform), platform, query, max_results): (query, platform)
+                    for query, state in pending.items()
+                    for platform in state['missing']
+                }
+
+                for future in as_completed(future_to_job):
+                    query, platform = future_to_job[future]
+                    state = pending[query]
+                    try:
+                        products = future.result(timeout=20)
+                        state['products'].extend(products)
+                        state['stats'][platform] = {'count': len(products), 'status': 'success'}
+                    except CircuitOpenError as e:
+                        state['stats'][platform] = self._circuit_open_stats(e)
+                    except Exception as e:
+                        state['errors'][platform] = str(e)
+                        state['stats'][platform] = {'count': 0, 'status': 'failed', 'error': str(e)}
+
+                    state['missing'].discard(platform)
+                    if state['missing']:
+                        continue
+
+                    result = self._build_result(query, platforms, state['products'], state['stats'],
+                                                state['errors'], time.time() - state['start'])
+                    if use_cache and result['products']:
+                        self._save_to_cache(self._get_cache_key(query, platforms), result, state['scraped_at'])
+                        self._save_slices(query, platforms, result['products'], state['stats'])
+                    self._notify_listeners(query, result['products'])
+                    yield query, result
+        finally:
+            self._end_scrape()
+
+    def _scrape_platforms(self, query: str, platforms: List[str], max_results: int,
+                          on_results: Callable[[str, List[Product]], None], max_workers: int):
+        """Run the platform scrapers concurrently; returns (products, platform_stats, errors)"""
         all_products = []
         platform_stats = {}
         errors = {}
 
         # Execute scrapers concurrently
-        with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
-            # Submit all scraper tasks
+        with ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix='scrape') as executor:
+            # Submit all scraper tasks (each carries the caller's trace context)
+            search = self._search_hedged if self.hedging else self.search_platform
             future_to_platform = {
-                executor.submit(self.search_platform, platform, query, max_results): platform
+                executor.submit(propagate(search), platform, query, max_results): platform
                 for platform in platforms
             }
 
@@ -137,7 +587,11 @@ class ScraperManager:
                         'count': len(products),
                         'status': 'success'
                     }
-                    print(f"⚡ {platform}: {len(products)} products")
+                    log.debug("%d products", len(products), extra={'platform': platform})
+                except CircuitOpenError as e:
+                    platform_stats[platform] = self._circuit_open_stats(e)
+                    log.debug("Skipped: circuit open", extra={'platform': platform})
+                    continue
                 except Exception as e:
                     errors[platform] = str(e)
                     platform_stats[platform] = {
@@ -145,45 +599,50 @@ class ScraperManager:
                         'status': 'failed',
                         'error': str(e)
                     }
-                    print(f"❌ {platform}: Failed - {e}")
+                    log.error("Platform failed: %s", e, extra={'platform': platform})
+                    continue
 
-        end_time = time.time()
-        elapsed = end_time - start_time
+                if on_results and products:
+                    try:
+                        on_results(platform, products)
+                    except Exception as e:
+                        log.warning("Results callback failed: %s", e, extra={'platform': platform})
 
-        # Sort by price (numeric)
-        all_products.sort(key=lambda x: x.get('price_numeric') or float('inf'))
-
-        result = {
-            'success': True,
-            'query': query,
-            'products': all_products,
-            'total': len(all_products),
-            'platforms_searched': len(platforms),
-            'platforms_succeeded': sum(1 for s in platform_stats.values() if s['status'] == 'success'),
-            'platform_stats': platform_stats,
-            'errors': errors if errors else None,
-            'elapsed_time': round(elapsed, 2),
-            'from_cache': False,
-            'timestamp': datetime.now().isoformat()
-        }
+        return all_products, platform_stats, errors
 
-        # Save to cache
-        if use_cache and all_products:
-            self._save_to_cache(cache_key, result)
+    @staticmethod
+    def _circuit_open_stats(error: CircuitOpenError) -> Dict:
+        return {'count': 0, 'status': 'circuit_open', 'retry_in': round(error.retry_in, 1)}
 
-        print(f"✅ Search completed in {elapsed:.2f}s - {len(all_products)} total products")
+    def _replay_results(self, products: List[Product], on_results: Callable[[str, List[Product]], None]):
+        """Feed cached products to a results callback, one call per platform"""
+        by_platform = {}
+        for product in products:
+            by_platform.setdefault(product.platform, []).append(product)
 
-        return result
+        for platform, platform_products in by_platform.items():
+            on_results(platform, platform_products)
 
     def cleanup(self):
         """Cleanup all scrapers"""
-        print("🧹 Cleaning up scrapers...")
-        for name, scraper in self.scrapers.items():
-            try:
-                scraper.close_driver()
-            except:
-                pass
-        print("✅ Cleanup complete")
+        log.info("Cleaning up scrapers")
+        for name, pool in self.pools.items():
+            pool.close()
+        log.info("Cleanup complete")
+
+    def get_hedge_stats(self) -> Dict:
+        """Hedge volume against its budget, and how often the hedge beat the original attempt"""
+        with self.hedge_lock:
+            counts = dict(self.hedge_counts)
+        decided = counts['won'] + counts['lost']
+        return {
+            'enabled': self.hedging,
+            'percentile': self.hedge_percentile,
+            'budget': self.hedge_budget,
+            **counts,
+            'extra_load': round(counts['launched'] / counts['scrapes'], 4) if counts['scrapes'] else 0.0,
+            'win_rate': round(counts['won'] / decided, 4) if decided else None
+        }
 
     def get_stats(self) -> Dict:
         """Get scraper manager statistics"""
@@ -192,5 +651,11 @@ class ScraperManager:
             'platforms': self.get_available_platforms(),
             'cache_entries': len(self.cache),
             'cache_ttl_seconds': self.cache_ttl,
-            'max_workers': self.max_workers
+            'cache': self.get_cache_stats(),
+            'max_workers': self.max_workers,
+            'active_scrapes': self.active_scrapes,
+            'draining': self.draining,
+            'pools': {name: pool.get_stats() for name, pool in self.pools.items()},
+            'circuits': {name: breaker.get_stats() for name, breaker in self.breakers.items()},
+            'hedging': self.get_hedge_stats()
         }
@@ -0,0 +1,97 @@
+"""
+Scraper Pool - A bounded set of scraper instances (one browser each) per platform
+Concurrent searches borrow an instance instead of sharing a single driver
+"""
+from typing import Callable, Dict
+import threading
+
+from .logger import get_logger
+
+log = get_logger('pool')
+
+
+class ScraperPool:
+    """Lends out scraper instances for one platform, creating them lazily up to `size`"""
+
+    def __init__(self, scraper=None, size: int = 1, factory: Callable = None, platform_name: str = None):
+        """
+        Args:
+            scraper: First instance (None = build every instance with `factory` on demand)
+            size: Max instances, i.e. max browsers for this platform
+            factory: Creates another instance (default: the scraper's class with no arguments)
+            platform_name: Platform label when no instance is given
+        """
+        self.platform_name = platform_name or getattr(scraper, 'platform_name', type(scraper).__name__)
+        self.size = max(1, size)
+        self.factory = factory or type(scraper)
+        self.instances = [scraper] if scraper is not None else []
+        self.idle = list(self.instances)
+        self.creating = 0  # Slots reserved by instances being built outside the lock
+        self.condition = threading.Condition()
+        self.waits = 0
+
+    def acquire(self, timeout: float = None):
+        """Borrow an instance, waiting up to `timeout` seconds (None if none became free)"""
+        with self.condition:
+            reserved = not self.idle and len(self.instances) + self.creating < self.size
+            if reserved:
+                self.creating += 1
+
+        # Browsers take seconds to start; build outside the lock so releases and other borrowers aren't held up
+        if reserved:
+            scraper = self._create()
+            if scraper is not None:
+                return scraper
+
+        with self.condition:
+            if not self.idle:
+                self.waits += 1
+                # Until an instance is returned, or nothing is left that could produce one
+                if not self.condition.wait_for(lambda: self.idle or not (self.instances or self.creating), timeout):
+                    return None
+                if not self.idle:
+                    return None  # The factory can't build this platform at all
+
+            return self.idle.pop()
+
+    def _create(self):
+        """Build an instance in a slot reserved by acquire(), then register it (or give the slot up)"""
+        try:
+            scraper = self.factory()
+        except Exception as e:
+            log.warning("Could not create pooled scraper: %s", e, extra={'platform': self.platform_name})
+            with self.condition:
+                self.creating -= 1
+                self.size = len(self.instances) + self.creating  # Don't retry a factory that can't build instances
+                self.condition.notify_all()
+            return None
+
+        with self.condition:
+            self.creating -= 1
+            self.instances.append(scraper)
+        return scraper
+
+    def release(self, scraper):
+        """Return a borrowed instance"""
+        with self.condition:
+            self.idle.append(scraper)
+            self.condition.notify()
+
+    def close(self):
+        """Close every instance's browser"""
+        with self.condition:
+            for scraper in self.instances:
+                try:
+                    scraper.close_driver()
+                except Exception:
+                    pass
+
+    def get_stats(self) -> Dict:
+        """Pool utilization"""
+        with self.condition:
+            return {
+                'size': self.size,
+                'instances': len(self.instances),
+                'in_use': len(self.instances) - len(self.idle),
+                'waits': self.waits
+            }
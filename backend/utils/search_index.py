@@ -0,0 +1,204 @@
+"""
+Search index - BM25 full-text index over every listing we have scraped
+Cached results expire after a few minutes; the index keeps the latest copy of each listing so
+long-tail queries can be answered instantly (with its age) while a live scrape runs
+"""
+from collections import OrderedDict
+from typing import Callable, Dict, List, Optional, Tuple
+import hashlib
+import heapq
+import math
+import threading
+import time
+from datetime import datetime
+
+from .product import Product
+from .query_normalizer import search_tokens
+
+
+class ProductIndex:
+    """Inverted index with incremental updates (a re-scraped listing replaces its old copy)"""
+
+    K1 = 1.2
+    B = 0.75
+    MIN_MATCH = 0.5  # Fraction of query terms a listing must contain
+
+    def __init__(self, key: Callable[[Product], str], max_docs: int = 50000, snapshot_ttl: float = 300,
+                 max_snapshots: int = 1000):
+        """
+        Args:
+            key: Stable listing key (e.g. ProductCatalog.listing_key)
+            max_docs: Listings kept; the least recently seen are evicted first
+            snapshot_ttl: Seconds a search's hit list stays available to page through
+            max_snapshots: Hit lists kept; the least recently used are dropped first
+        """
+        self.key = key
+        self.max_docs = max_docs
+        self.snapshot_ttl = snapshot_ttl
+        self.max_snapshots = max_snapshots
+        self.snapshots = OrderedDict()  # snapshot id -> (expires at, [(product, score, seen at)])
+        self.docs = OrderedDict()  # listing key -> (product, seen at, length), oldest first
+        self.postings = {}  # term -> {listing key: term frequency}
+        self.total_length = 0
+        self.version = 0  # Bumped on every update, identifies an index snapshot
+        self.updated_at = None
+        self.lock = threading.Lock()
+
+    def add(self, query: str, products: List[Product]):
+        """Index a scrape's listings (ScraperManager listener)"""
+        if not products:
+            return
+
+        now = time.time()
+        entries = []
+        for product in products:
+            entries.append((self.key(product), product, search_tokens(product.title)))
+
+        with self.lock:
+            for doc_id, product, tokens in entries:
+                self._remove(doc_id)
+                self.docs[doc_id] = (product, now, len(tokens))
+                self.total_length += len(tokens)
+                for token in tokens:
+                    postings = self.postings.setdefault(token, {})
+                    postings[doc_id] = postings.get(doc_id, 0) + 1
+
+            while len(self.docs) > self.max_docs:
+                self._remove(next(iter(self.docs)))
+
+            self.version += 1
+            self.updated_at = now
+
+    def _remove(self, doc_id: str):
+        """Drop a listing and its postings (caller holds the lock)"""
+        entry = self.docs.pop(doc_id, None)
+        if entry is None:
+            return
+
+        product, _, length = entry
+        self.total_length -= length
+        for token in set(search_tokens(product.title)):
+            postings = self.postings.get(token)
+            if postings is not None:
+                postings.pop(doc_id, None)
+                if not postings:
+                    del self.postings[token]
+
+    def search(self, query: str, platforms: List[str] = None,
+               limit: int = 50) -> Tuple[List[Tuple[Product, float, float]], int]:
+        """
+        Best listings for a query by BM25
+
+        Returns:
+            ([(product, score, seen at)] best first, index version searched)
+        """
+        terms = set(search_tokens(query))
+        allowed = set(platforms) if platforms else None
+
+        with self.lock:
+            count = len(self.docs)
+            if not terms or not count:
+                return [], self.version
+
+            average = self.total_length / count
+            scores = {}
+            matched = {}
+            for term in terms:
+                postings = self.postings.get(term)
+                if not postings:
+                    continue
+                idf = math.log(1 + (count - len(postings) + 0.5) / (len(postings) + 0.5))
+                for doc_id, tf in postings.items():
+                    length = self.docs[doc_id][2]
+                    norm = tf * (self.K1 + 1) / (tf + self.K1 * (1 - self.B + self.B * length / average))
+                    scores[doc_id] = scores.get(doc_id, 0.0) + idf * norm
+                    matched[doc_id] = matched.get(doc_id, 0) + 1
+
+            required = max(1, math.ceil(len(terms) * self.MIN_MATCH))
+            candidates = (
+                (score, doc_id) for doc_id, score in scores.items()
+                if matched[doc_id] >= required and (allowed is None or self.docs[doc_id][0].platform in allowed)
+            )
+            best = heapq.nlargest(limit, candidates)
+            return [(self.docs[doc_id][0], score, self.docs[doc_id][1]) for score, doc_id in best], self.version
+
+    def search_result(self, query: str, platforms: List[str], limit: int) -> Dict:
+        """Index hits shaped like a ScraperManager result (relevance order), plus staleness"""
+        start = time.time()
+        hits, version = self.search(query, platforms, limit)
+        return self._result(query, platforms, hits, self._save_snapshot(hits), version, start)
+
+    def snapshot_result(self, snapshot: str, query: str, platforms: List[str]) -> Optional[Dict]:
+        """The hit list a search_result was built from, unchanged by later updates (None once expired)"""
+        start = time.time()
+        with self.lock:
+            entry = self.snapshots.get(snapshot)
+            if entry is None or entry[0] < start:
+                return None
+            self.snapshots.move_to_end(snapshot)
+            hits = entry[1]
+            version = self.version
+        return self._result(query, platforms, hits, snapshot, version, start)
+
+    def _save_snapshot(self, hits: List[Tuple[Product, float, float]]) -> str:
+        """
+        Keep a hit list for paging under an id derived from its listings and their scrape times,
+        so an unchanged answer keeps its id (and ETag) across index updates
+        """
+        digest = hashlib.blake2b(digest_size=8)
+        for product, _, seen in hits:
+            digest.update(f"{self.key(product)}\0{seen}\0".encode('utf-8'))
+        snapshot = f"index:{digest.hexdigest()}"
+
+        now = time.time()
+        with self.lock:
+            self.snapshots[snapshot] = (now + self.snapshot_ttl, hits)
+            self.snapshots.move_to_end(snapshot)
+            while len(self.snapshots) > self.max_snapshots:
+                self.snapshots.popitem(last=False)
+            while self.snapshots:
+                oldest = next(iter(self.snapshots))
+                if self.snapshots[oldest][0] >= now:
+                    break
+                del self.snapshots[oldest]
+        return snapshot
+
+    def _result(self, query: str, platforms: List[str], hits: List[Tuple[Product, float, float]],
+                snapshot: str, version: int, start: float) -> Dict:
+        products = [product for product, _, _ in hits]
+        platform_stats = {platform: {'count': 0, 'status': 'indexed'} for platform in platforms}
+        for product in products:
+            if product.platform in platform_stats:
+                platform_stats[product.platform]['count'] += 1
+
+        ages = [start - seen for _, _, seen in hits]
+        return {
+            'success': True,
+            'query': query,
+            'products': products,
+            'total': len(products),
+            'platforms_searched': len(platforms),
+            'platforms_succeeded': sum(1 for s in platform_stats.values() if s['count']),
+            'platform_stats': platform_stats,
+            'errors': None,
+            'elapsed_time': round(time.time() - start, 4),
+            'from_cache': True,
+            'timestamp': snapshot,
+            'source': 'index',
+            'staleness': {
+                'oldest_seconds': round(max(ages), 1) if ages else None,
+                'newest_seconds': round(min(ages), 1) if ages else None,
+                'index_version': version
+            }
+        }
+
+    def get_stats(self) -> Dict:
+        with self.lock:
+            return {
+                'documents': len(self.docs),
+                'terms': len(self.postings),
+                'max_docs': self.max_docs,
+                'version': self.version,
+                'snapshots': len(self.snapshots),
+                'updated_at': datetime.fromtimestamp(self.updated_at).isoformat() if self.updated_at else None
+            }
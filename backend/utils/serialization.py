@@ -0,0 +1,83 @@
+"""
+Serialization - Fast JSON encoding, response compression and ETags
+Uses orjson and brotli when installed, falling back to the standard library
+"""
+from typing import Optional
+import gzip
+import hashlib
+import json
+
+try:
+    import orjson
+except ImportError:  # Optional: pip install orjson
+    orjson = None
+
+try:
+    import brotli
+except ImportError:  # Optional: pip install brotli
+    brotli = None
+
+# Bodies smaller than this aren't worth compressing
+MIN_COMPRESS_BYTES = 1024
+
+# Fast settings: responses are compressed per request, so CPU matters more than the last few percent
+GZIP_LEVEL = 5
+BROTLI_QUALITY = 4
+
+
+def _default(value):
+    """Fallback for types neither encoder handles natively (NumPy scalars, enums, sets)"""
+    if hasattr(value, 'item'):
+        return value.item()
+    if hasattr(value, 'value'):
+        return value.value
+    if isinstance(value, (set, frozenset)):
+        return list(value)
+    return str(value)
+
+
+def dumps(obj) -> bytes:
+    """Compact UTF-8 JSON"""
+    if orjson is not None:
+        return orjson.dumps(obj, default=_default, option=orjson.OPT_SERIALIZE_NUMPY | orjson.OPT_NON_STR_KEYS)
+    return json.dumps(obj, ensure_ascii=False, separators=(',', ':'), default=_default).encode('utf-8')
+
+
+def negotiate_encoding(accept_encoding: str) -> Optional[str]:
+    """Best content coding the client accepts: 'br' (if brotli is installed), 'gzip' or None"""
+    accepted = {}
+    for item in (accept_encoding or '').lower().split(','):
+        name, _, params = item.strip().partition(';')
+        quality = 1.0
+        if params.strip().startswith('q='):
+            try:
+                quality = float(params.strip()[2:])
+            except ValueError:
+                quality = 0.0
+        accepted[name.strip()] = quality
+
+    for encoding in (('br',) if brotli is not None else ()) + ('gzip',):
+        if accepted.get(encoding, accepted.get('*', 0.0)) > 0:
+            return encoding
+    return None
+
+
+def compress(body: bytes, encoding: str) -> bytes:
+    if encoding == 'br':
+        return brotli.compress(body, quality=BROTLI_QUALITY)
+    return gzip.compress(body, compresslevel=GZIP_LEVEL)
+
+
+def make_etag(*parts) -> str:
+    """Weak ETag over the inputs that determine a response (not the response bytes)"""
+    digest = hashlib.blake2b(repr(parts).encode('utf-8'), digest_size=12).hexdigest()
+    return f'W/"{digest}"'
+
+
+def etag_matches(if_none_match: str, etag: str) -> bool:
+    """If-None-Match check (weak comparison, '*' matches anything)"""
+    if not if_none_match:
+        return False
+    tags = [tag.strip() for tag in if_none_match.split(',')]
+    opaque = etag[2:] if etag.startswith('W/') else etag
+    return '*' in tags or any((tag[2:] if tag.startswith('W/') else tag) == opaque for tag in tags)
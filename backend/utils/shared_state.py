@@ -0,0 +1,43 @@
+"""
+Shared state - SQLite helpers for state every server worker process reads and writes
+WAL lets readers carry on while one process writes; BEGIN IMMEDIATE serializes the writers
+"""
+from contextlib import contextmanager
+import os
+import sqlite3
+
+MEMORY = ':memory:'
+
+
+def connect(path: str = None) -> sqlite3.Connection:
+    """
+    Connection in autocommit mode (transactions are explicit, see transaction())
+    None = a private in-memory database, for single-process use without persistence
+    """
+    path = path or MEMORY
+    if path != MEMORY:
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
+    conn = sqlite3.connect(path, timeout=10, check_same_thread=False, isolation_level=None)
+    conn.execute("PRAGMA journal_mode=WAL")
+    conn.execute("PRAGMA synchronous=NORMAL")
+    return conn
+
+
+@contextmanager
+def transaction(conn: sqlite3.Connection, write: bool = False):
+    """
+    One consistent snapshot for reads, or (write=True) the database's write lock up front,
+    so a read-check-insert sequence can't interleave with another process's
+    """
+    conn.execute("BEGIN IMMEDIATE" if write else "BEGIN")
+    try:
+        yield conn
+    except BaseException:
+        if conn.in_transaction:
+            conn.execute("ROLLBACK")
+        raise
+    else:
+        conn.execute("COMMIT")
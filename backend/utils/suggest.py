@@ -0,0 +1,139 @@
+"""
+Query suggestions - Prefix index over past searches and catalog titles
+Prefixes up to TOP_DEPTH characters keep a precomputed top-K; longer ones binary-search a
+sorted term array, where few terms are left to rank
+"""
+from bisect import bisect_left, insort
+from typing import Dict, List, Tuple
+import heapq
+import threading
+
+from .product_matcher import ProductMatcher
+from .query_normalizer import UNIT_ALIASES, UNITS, _NUMBER, _tokens, canonical_query
+
+_matcher = ProductMatcher()
+
+_UNIT_SPELLINGS = sorted(UNITS | set(UNIT_ALIASES))
+
+
+def _form(text: str, partial: bool = False) -> str:
+    """
+    Indexed form of a spelling: words with unit spellings folded ("128 GB" -> "128gb")
+    With partial=True, a unit still being typed is folded too ("128 g" -> "128g", a prefix of "128gb")
+    """
+    tokens = _tokens(text)
+    if (partial and len(tokens) > 1 and tokens[-1].isalpha() and _NUMBER.match(tokens[-2])
+            and any(unit.startswith(tokens[-1]) for unit in _UNIT_SPELLINGS)):
+        tokens[-2:] = [tokens[-2] + tokens[-1]]
+    return ' '.join(tokens)
+
+
+class SuggestionIndex:
+    """
+    Popularity-weighted prefix index (scores only grow, so the per-prefix top-K stays exact)
+
+    Spellings of one intent are grouped under their canonical_query form, which only keys the
+    group: every spelling is matched by prefix, and the group is shown as its most popular one.
+    """
+
+    TITLE_WEIGHT = 0.25  # A scraped title counts for a quarter of a user search
+    TITLE_WORDS = 8
+    TOP_DEPTH = 24  # Prefixes up to this length have a precomputed top-K
+    MAX_SPELLINGS = 4  # Spellings indexed per group
+
+    def __init__(self, top_k: int = 10, max_terms: int = 20000, max_length: int = 48):
+        self.top_k = top_k
+        self.max_terms = max_terms  # Per source, so scraped titles can't crowd out past searches
+        self.max_length = max_length
+        self.terms = []  # Indexed forms of every spelling, sorted
+        self.forms = {}  # indexed form -> group
+        self.scores = {}  # group (canonical query) -> score
+        self.spellings = {}  # group -> {spelling: weight}
+        self.display = {}  # group -> its most popular spelling
+        self.tops = {}  # prefix -> groups, best first, at most top_k
+        self.counts = {'query': 0, 'title': 0}
+        self.dropped = 0
+        self.lock = threading.Lock()
+
+    def add_query(self, query: str):
+        """Count a user search under its canonical form, so variants share one suggestion"""
+        self._add(_matcher.normalize_title(query), 1.0, 'query')
+
+    def add_title(self, title: str):
+        """Index a product title (its first few words, as someone would type them)"""
+        words = _matcher.normalize_title(title).split()[:self.TITLE_WORDS]
+        self._add(' '.join(words), self.TITLE_WEIGHT, 'title')
+
+    def add_products(self, query: str, products: List):
+        """ScraperManager listener: index the titles of freshly scraped products"""
+        for product in products:
+            self.add_title(product.title)
+
+    def _add(self, spelling: str, weight: float, source: str):
+        spelling = spelling[:self.max_length].rstrip()
+        if not spelling:
+            return
+        group = canonical_query(spelling)
+        form = _form(spelling)
+
+        with self.lock:
+            if group not in self.scores:
+                if self.counts[source] >= self.max_terms:
+                    self.dropped += 1
+                    return
+                self.counts[source] += 1
+                self.spellings[group] = {}
+
+            spellings = self.spellings[group]
+            if spelling in spellings or len(spellings) < self.MAX_SPELLINGS:
+                spellings[spelling] = spellings.get(spelling, 0.0) + weight
+                if form not in self.forms:
+                    self.forms[form] = group
+                    insort(self.terms, form)
+            self.display[group] = max(spellings, key=lambda s: (spellings[s], s == self.display.get(group)))
+
+            score = self.scores[group] = self.scores.get(group, 0.0) + weight
+            for indexed in {_form(s) for s in spellings}:
+                for length in range(1, min(len(indexed), self.TOP_DEPTH) + 1):
+                    self._offer(self.tops.setdefault(indexed[:length], []), group, score)
+
+    def _offer(self, top: List[str], group: str, score: float):
+        """Place `group` in a prefix's top-K (caller holds the lock)"""
+        if group in top:
+            top.remove(group)
+        elif len(top) >= self.top_k and score <= self.scores[top[-1]]:
+            return
+        top.append(group)
+        top.sort(key=self._rank)
+        del top[self.top_k:]
+
+    def _rank(self, group: str):
+        return -self.scores[group], group
+
+    def suggest(self, prefix: str, limit: int = None) -> List[Tuple[str, float]]:
+        """Best (spelling, score) pairs for groups with a spelling starting with `prefix`"""
+        prefix = _form(prefix, partial=True)
+        if not prefix:
+            return []
+        limit = min(limit or self.top_k, self.top_k)
+
+        with self.lock:
+            if len(prefix) <= self.TOP_DEPTH:
+                best = self.tops.get(prefix, ())[:limit]
+            else:
+                lo = bisect_left(self.terms, prefix)
+                hi = bisect_left(self.terms, prefix + '\U0010ffff', lo)
+                groups = {self.forms[form] for form in self.terms[lo:hi]}
+                best = heapq.nsmallest(limit, groups, key=self._rank)
+            return [(self.display[group], self.scores[group]) for group in best]
+
+    def get_stats(self) -> Dict:
+        with self.lock:
+            return {
+                'terms': len(self.scores),
+                'spellings': len(self.terms),
+                'queries': self.counts['query'],
+                'titles': self.counts['title'],
+                'max_terms': self.max_terms,
+                'dropped': self.dropped
+            }
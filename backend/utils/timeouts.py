@@ -0,0 +1,136 @@
+"""
+Adaptive timeouts - Per-platform, per-phase waits derived from observed latency
+Each wait is a high percentile of recent successful phases plus a margin, widened after
+timeouts (up to `maximum`) and never longer than what is left of the request's deadline;
+cutting off platforms that are down is left to the circuit breaker
+"""
+from collections import deque
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Dict, Optional
+import threading
+import time
+
+# Absolute time.monotonic() by which the current request must answer (None = no deadline)
+_deadline = ContextVar('jarvis_deadline', default=None)
+
+
+@contextmanager
+def request_deadline(seconds: Optional[float]):
+    """Bound every phase timeout inside the block (carried into worker threads by tracing.propagate)"""
+    if seconds is None:
+        yield
+        return
+
+    token = _deadline.set(time.monotonic() + seconds)
+    try:
+        yield
+    finally:
+        _deadline.reset(token)
+
+
+def remaining() -> Optional[float]:
+    """Seconds left before the current request's deadline (None = no deadline)"""
+    deadline = _deadline.get()
+    return None if deadline is None else deadline - time.monotonic()
+
+
+class AdaptiveTimeouts:
+    """Rolling latency windows per (platform, phase) that turn into timeouts"""
+
+    WINDOW = 200  # Recent samples kept per platform and phase
+    MIN_SAMPLES = 10  # Below this the caller's default applies
+    PAD = 0.5  # Seconds added on top of percentile * margin
+    BACKOFF = 1.5  # Widening per consecutive timeout
+    MIN_TIMEOUT = 1.0
+    DEADLINE_RESERVE = 1.0  # Left for extraction after the last wait
+
+    def __init__(self, percentile: float = 95, margin: float = 1.5, maximum: float = 30.0):
+        self.percentile = percentile
+        self.margin = margin
+        self.maximum = maximum
+        self.samples = {}  # (platform, phase) -> deque of seconds
+        self.timeouts = {}  # (platform, phase) -> consecutive timeouts
+        self.lock = threading.Lock()
+
+    def configure(self, percentile: float = None, margin: float = None, maximum: float = None):
+        if percentile is not None:
+            self.percentile = percentile
+        if margin is not None:
+            self.margin = margin
+        if maximum is not None:
+            self.maximum = maximum
+
+    def observe(self, platform: str, phase: str, seconds: float, timed_out: bool = False):
+        """Record a finished phase (a timed-out one widens the next timeout instead of adding a sample)"""
+        key = (platform, phase)
+        with self.lock:
+            if timed_out:
+                self.timeouts[key] = self.timeouts.get(key, 0) + 1
+                return
+
+            self.timeouts.pop(key, None)
+            window = self.samples.get(key)
+            if window is None:
+                window = self.samples[key] = deque(maxlen=self.WINDOW)
+            window.append(seconds)
+
+    @staticmethod
+    def _quantile(window, percentile: float) -> float:
+        ordered = sorted(window)
+        return ordered[min(len(ordered) - 1, int(len(ordered) * percentile / 100))]
+
+    def quantile(self, platform: str, phase: str, percentile: float) -> Optional[float]:
+        """Recent latency percentile for a phase (None until MIN_SAMPLES are in)"""
+        with self.lock:
+            window = self.samples.get((platform, phase))
+            if window is None or len(window) < self.MIN_SAMPLES:
+                return None
+            return self._quantile(window, percentile)
+
+    def timeout(self, platform: str, phase: str, default: float) -> float:
+        """
+        Seconds to wait for a phase: learned (or `default`), clamped to the request deadline
+
+        Only successful phases add samples, so a platform that has slowed down past its learned
+        wait recovers through the backoff: each consecutive timeout widens the wait until one
+        succeeds (never beyond `maximum`).
+        """
+        key = (platform, phase)
+        with self.lock:
+            window = self.samples.get(key)
+            if window is not None and len(window) >= self.MIN_SAMPLES:
+                seconds = self._quantile(window, self.percentile) * self.margin + self.PAD
+            else:
+                seconds = default
+            seconds *= self.BACKOFF ** self.timeouts.get(key, 0)
+
+        seconds = min(max(seconds, self.MIN_TIMEOUT), self.maximum)
+
+        left = remaining()
+        if left is not None:
+            seconds = min(seconds, max(0.1, left - self.DEADLINE_RESERVE))
+        return seconds
+
+    def get_stats(self) -> Dict:
+        """Current learned timeouts (before the deadline clamp) and sample counts"""
+        with self.lock:
+            keys = sorted(set(self.samples) | set(self.timeouts))
+            windows = {key: list(self.samples.get(key, ())) for key in keys}
+            streaks = dict(self.timeouts)
+
+        stats = {}
+        for platform, phase in keys:
+            window = windows[(platform, phase)]
+            stats.setdefault(platform, {})[phase] = {
+                'samples': len(window),
+                f'p{self.percentile:g}': round(self._quantile(window, self.percentile), 3) if window else None,
+                'timeout': round(self.timeout(platform, phase, self.maximum), 2)
+                if len(window) >= self.MIN_SAMPLES else None,
+                'consecutive_timeouts': streaks.get((platform, phase), 0)
+            }
+        return stats
+
+
+# Shared by every scraper instance in the process
+TIMEOUTS = AdaptiveTimeouts()
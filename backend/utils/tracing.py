@@ -0,0 +1,182 @@
+"""
+Tracing - Lightweight in-process spans keyed by request ID
+The active trace lives in a context variable and is carried into scraper worker threads;
+finished traces can be exported as Chrome trace events (chrome://tracing, Perfetto)
+"""
+from contextlib import contextmanager
+from contextvars import ContextVar, copy_context
+from typing import Callable, Dict, List, Optional
+import json
+import logging
+import os
+import queue
+import threading
+import time
+import uuid
+
+_current_trace = ContextVar('jarvis_trace', default=None)
+
+# utils.logger depends on this module, so use the stdlib logger directly
+log = logging.getLogger('jarvis.tracing')
+
+
+class Trace:
+    """Spans recorded for one request"""
+
+    def __init__(self, request_id: str = None):
+        self.request_id = request_id or uuid.uuid4().hex[:16]
+        self.wall_start = time.time()
+        self.origin = time.perf_counter()
+        self.spans = []  # (name, start, end, thread id, thread name, attrs)
+        self.lock = threading.Lock()
+
+    def add(self, name: str, start: float, end: float, attrs: Dict):
+        thread = threading.current_thread()
+        with self.lock:
+            self.spans.append((name, start, end, thread.ident, thread.name, attrs))
+
+    def to_dict(self) -> Dict:
+        """Spans relative to the trace start, in milliseconds (for response metadata)"""
+        with self.lock:
+            spans = sorted(self.spans, key=lambda span: span[1])
+
+        return {
+            'request_id': self.request_id,
+            'spans': [
+                {
+                    'name': name,
+                    'start_ms': round((start - self.origin) * 1000, 2),
+                    'duration_ms': round((end - start) * 1000, 2),
+                    'thread': thread_name,
+                    **({'attrs': attrs} if attrs else {})
+                }
+                for name, start, end, _, thread_name, attrs in spans
+            ]
+        }
+
+    def to_chrome_events(self) -> List[Dict]:
+        """Complete ('X') events in the Chrome trace event format, microsecond timestamps"""
+        pid = os.getpid()
+        base = self.wall_start * 1e6
+
+        with self.lock:
+            spans = list(self.spans)
+
+        return [
+            {
+                'name': name,
+                'cat': 'jarvis',
+                'ph': 'X',
+                'ts': round(base + (start - self.origin) * 1e6, 1),
+                'dur': round((end - start) * 1e6, 1),
+                'pid': pid,
+                'tid': thread_id,
+                'args': {'request_id': self.request_id, 'thread': thread_name, **attrs}
+            }
+            for name, start, end, thread_id, thread_name, attrs in spans
+        ]
+
+
+def start_trace(request_id: str = None):
+    """Make a new trace current; returns (trace, token for end_trace)"""
+    trace = Trace(request_id)
+    return trace, _current_trace.set(trace)
+
+
+def end_trace(token):
+    _current_trace.reset(token)
+
+
+def current_trace() -> Optional[Trace]:
+    return _current_trace.get()
+
+
+def current_request_id() -> Optional[str]:
+    trace = _current_trace.get()
+    return trace.request_id if trace else None
+
+
+@contextmanager
+def span(name: str, **attrs):
+    """Record a span on the current trace (no-op outside a traced request)"""
+    trace = _current_trace.get()
+    if trace is None:
+        yield
+        return
+
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        trace.add(name, start, time.perf_counter(), attrs)
+
+
+def propagate(fn: Callable) -> Callable:
+    """Bind `fn` to the caller's context so a worker thread records into the same trace"""
+    context = copy_context()
+
+    def run(*args, **kwargs):
+        return context.run(fn, *args, **kwargs)
+
+    return run
+
+
+class TraceExporter:
+    """
+    Appends finished traces to a local collector file in the Chrome trace event
+    JSON array format (the closing bracket is optional, so the file stays appendable)
+    """
+
+    def __init__(self, path: str, max_pending: int = 1000):
+        self.path = path
+        self.pending = queue.Queue(maxsize=max_pending)
+        self.exported = 0
+        self.dropped = 0
+
+        directory = os.path.dirname(self.path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
+        self.writer = threading.Thread(target=self._writer_loop, name='trace-exporter', daemon=True)
+        self.writer.start()
+
+    def export(self, trace: Trace):
+        """Queue a finished trace (never blocks the request)"""
+        try:
+            self.pending.put_nowait(trace)
+        except queue.Full:
+            self.dropped += 1
+
+    def _writer_loop(self):
+        while True:
+            trace = self.pending.get()
+            if trace is None:
+                return
+
+            try:
+                new_file = not os.path.exists(self.path) or os.path.getsize(self.path) == 0
+                with open(self.path, 'a', encoding='utf-8') as f:
+                    if new_file:
+                        f.write('[\n')
+                    for event in trace.to_chrome_events():
+                        f.write(json.dumps(event, ensure_ascii=False) + ',\n')
+                self.exported += 1
+            except OSError as e:
+                log.warning("Trace export failed: %s", e)
+
+    def close(self, timeout: float = 2.0):
+        """Flush queued traces and stop the writer"""
+        if self.writer.is_alive():
+            try:
+                self.pending.put(None, timeout=timeout)
+            except queue.Full:
+                return
+            self.writer.join(timeout)
+
+    def get_stats(self) -> Dict:
+        return {
+            'path': self.path,
+            'exported': self.exported,
+            'dropped': self.dropped,
+            'pending': self.pending.qsize()
+        }